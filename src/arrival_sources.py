@@ -0,0 +1,182 @@
+import copy
+import csv
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.intersection import DIRECTIONS
+
+
+class ArrivalSource(ABC):
+    """
+    Sumber kedatangan mobil per detik untuk Simulation.
+
+    Subclass cukup mengimplementasikan chunks(), yang menghasilkan array int
+    berbentuk (k, 4) dengan kolom urut DIRECTIONS (N, S, E, W); satu baris
+    = satu detik simulasi. Iterasi source menghasilkan baris per baris.
+    Setiap iterasi ulang harus menghasilkan data yang sama (replay
+    deterministik), sehingga run bisa dilanjutkan dari checkpoint.
+    """
+
+    @abstractmethod
+    def chunks(self):
+        """Yield array int (k, 4) kedatangan per detik, urut waktu."""
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def iter_from(self, offset: int):
+        """Iterasi baris mulai dari detik ke-offset (untuk resume checkpoint)."""
+        for chunk in self.chunks():
+            if offset >= len(chunk):
+                offset -= len(chunk)
+                continue
+            yield from chunk[offset:]
+            offset = 0
+
+
+class ArrayArrivals(ArrivalSource):
+    """Kedatangan dari array (T, 4) yang sudah ada di memori."""
+
+    def __init__(self, counts, chunk_rows: int = 65536):
+        counts = np.asarray(counts)
+        if counts.ndim != 2 or counts.shape[1] != 4:
+            raise ValueError("counts must have shape (T, 4) in N, S, E, W order.")
+        if (counts < 0).any():
+            raise ValueError("Arrival counts must be non-negative.")
+        self.counts = counts.astype(np.int64, copy=False)
+        self.chunk_rows = chunk_rows
+
+    def chunks(self):
+        for start in range(0, len(self.counts), self.chunk_rows):
+            yield self.counts[start:start + self.chunk_rows]
+
+    def iter_from(self, offset: int):
+        return iter(self.counts[offset:])
+
+
+class TraceArrivals(ArrivalSource):
+    """
+    Replay data hitungan loop detector dari file, dibaca per chunk berukuran
+    terbatas sehingga trace berukuran gigabyte tidak perlu dimuat sekaligus.
+
+    Format yang didukung (dari ekstensi file):
+        .csv     : header berisi kolom N, S, E, W (kolom lain diabaikan)
+        .npy     : array (rows, 4) urutan N, S, E, W, dibaca via memory map
+        .parquet : kolom N, S, E, W (butuh pyarrow)
+
+    Args:
+        path: lokasi file trace.
+        interval: lama (detik) yang diwakili satu baris data. Jika > 1, hitungan
+            disebar ke tiap detik; jika < 1 (mis. 0.5), baris dijumlahkan per
+            detik (1 / interval harus bilangan bulat).
+        resample: cara menyebar hitungan saat interval > 1:
+            "even"   - sebar rata secara deterministik,
+            "random" - tiap mobil ditempatkan di detik acak dalam intervalnya.
+        chunk_rows: jumlah baris file yang dibaca per chunk.
+        rng: numpy Generator untuk resample="random".
+    """
+
+    def __init__(self, path: str, interval: float = 1, resample: str = "even",
+                 chunk_rows: int = 65536, rng=None):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        if interval <= 0:
+            raise ValueError("interval must be positive.")
+        if resample not in ("even", "random"):
+            raise ValueError("resample must be 'even' or 'random'.")
+        if interval < 1 and not float(1 / interval).is_integer():
+            raise ValueError("1 / interval must be an integer when interval < 1.")
+        if interval > 1 and not float(interval).is_integer():
+            raise ValueError("interval must be an integer number of seconds when > 1.")
+        self.path = path
+        self.interval = interval
+        self.resample = resample
+        self.chunk_rows = chunk_rows
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    # --- RAW READERS (baris file apa adanya) ---
+
+    def _read_csv(self):
+        with open(self.path, newline="") as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader)]
+            try:
+                cols = [header.index(d) for d in DIRECTIONS]
+            except ValueError:
+                raise ValueError(f"CSV trace must have columns {DIRECTIONS}, got {header}")
+            rows = []
+            for row in reader:
+                if not row:
+                    continue
+                rows.append([int(float(row[c])) for c in cols])
+                if len(rows) == self.chunk_rows:
+                    yield np.array(rows, dtype=np.int64)
+                    rows = []
+            if rows:
+                yield np.array(rows, dtype=np.int64)
+
+    def _read_npy(self):
+        data = np.load(self.path, mmap_mode="r")
+        if data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError("npy trace must have shape (rows, 4) in N, S, E, W order.")
+        for start in range(0, len(data), self.chunk_rows):
+            yield np.array(data[start:start + self.chunk_rows], dtype=np.int64)
+
+    def _read_parquet(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading .parquet traces requires pyarrow (pip install pyarrow).")
+        pf = pq.ParquetFile(self.path)
+        for batch in pf.iter_batches(batch_size=self.chunk_rows, columns=DIRECTIONS):
+            yield np.column_stack([batch.column(d).to_numpy() for d in DIRECTIONS]).astype(np.int64)
+
+    def raw_chunks(self):
+        ext = os.path.splitext(self.path)[1].lower()
+        readers = {".csv": self._read_csv, ".npy": self._read_npy, ".parquet": self._read_parquet}
+        if ext not in readers:
+            raise ValueError(f"Unsupported trace format: {ext}")
+        for chunk in readers[ext]():
+            if (chunk < 0).any():
+                raise ValueError("Arrival counts must be non-negative.")
+            yield chunk
+
+    # --- RESAMPLING KE TICK SIMULASI (1 detik) ---
+
+    def _spread(self, chunk, rng):
+        """Interval > 1: pecah setiap baris menjadi `interval` baris per detik."""
+        k = int(self.interval)
+        if self.resample == "random":
+            out = np.empty((len(chunk), k, 4), dtype=np.int64)
+            for d in range(4):
+                out[:, :, d] = rng.multinomial(chunk[:, d], np.full(k, 1 / k))
+            return out.reshape(-1, 4)
+        # Pembulatan kumulatif: sum per interval selalu sama dengan data asli
+        j = np.arange(k + 1)[None, :, None]
+        cum = (chunk[:, None, :] * j) // k
+        return np.diff(cum, axis=1).reshape(-1, 4)
+
+    def chunks(self):
+        if self.interval == 1:
+            yield from self.raw_chunks()
+            return
+        if self.interval > 1:
+            rng = copy.deepcopy(self.rng)  # Salinan: replay selalu identik
+            for chunk in self.raw_chunks():
+                yield self._spread(chunk, rng)
+            return
+
+        # Interval < 1: jumlahkan per grup, sisa baris dibawa ke chunk berikut
+        group = int(round(1 / self.interval))
+        carry = np.empty((0, 4), dtype=np.int64)
+        for chunk in self.raw_chunks():
+            chunk = np.concatenate([carry, chunk]) if len(carry) else chunk
+            usable = len(chunk) - len(chunk) % group
+            carry = chunk[usable:]
+            if usable:
+                yield chunk[:usable].reshape(-1, group, 4).sum(axis=1)
+        if len(carry):
+            yield carry.sum(axis=0, keepdims=True)
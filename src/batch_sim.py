@@ -0,0 +1,145 @@
+"""
+State simulasi ringkas berbentuk array untuk fork dan rollout batch.
+
+BatchState menyimpan hanya yang menentukan dinamika antrian: panjang
+antrian per arah, timer hijau, posisi fase di PHASE_ORDER dan laju
+kedatangan per baris. Identitas mobil tidak diperlukan karena total delay
+(mobil-detik) sama dengan jumlah antrian per detik. Satu Simulation bisa
+di-snapshot ke satu baris lalu di-fork menjadi ribuan baris (np.repeat),
+dan semua baris dimajukan bersama oleh kernel tervektorisasi.
+"""
+import numpy as np
+
+from src.controllers import FuzzyController, PhaseBatch
+from src.intersection import DIRECTION_INDEX
+from src.simulation import DEPARTURE_RATE, PHASE_ORDER
+
+# Posisi fase (indeks PHASE_ORDER) -> kode arah (indeks DIRECTIONS), dan sebaliknya
+_PHASE_CODES = np.array([DIRECTION_INDEX[p] for p in PHASE_ORDER], dtype=np.int64)
+_PHASE_POSITION = np.argsort(_PHASE_CODES)
+
+
+class BatchState:
+    """
+    n salinan state persimpangan sebagai array.
+
+    Args:
+        counts: (n, 4) antrian per arah (urutan DIRECTIONS).
+        green_timer: (n,) sisa detik hijau.
+        phase_idx: (n,) posisi fase aktif di PHASE_ORDER.
+        arrival_rates: (n, 4) laju kedatangan per arah (input controller
+            dan laju Poisson saat rollout).
+    """
+
+    __slots__ = ('counts', 'green_timer', 'phase_idx', 'arrival_rates')
+
+    def __init__(self, counts, green_timer, phase_idx, arrival_rates):
+        self.counts = np.array(counts, dtype=np.int64).reshape(-1, 4)
+        n = len(self.counts)
+        self.green_timer = np.array(np.broadcast_to(green_timer, n), dtype=np.int64)
+        self.phase_idx = np.array(np.broadcast_to(phase_idx, n), dtype=np.int64)
+        self.arrival_rates = np.array(np.broadcast_to(arrival_rates, (n, 4)), dtype=float)
+
+    @classmethod
+    def from_simulation(cls, sim) -> "BatchState":
+        """Snapshot satu baris dari Simulation yang sedang berjalan."""
+        inter = sim.intersection
+        return cls(np.frombuffer(inter.counts, dtype=np.int64), inter.green_timer,
+                   sim.current_phase_idx, sim.arrival_rates())
+
+    def __len__(self):
+        return len(self.counts)
+
+    def fork(self, k: int) -> "BatchState":
+        """Setiap baris diulang k kali (baris i -> baris i*k ... i*k + k - 1)."""
+        return BatchState(np.repeat(self.counts, k, axis=0), np.repeat(self.green_timer, k),
+                          np.repeat(self.phase_idx, k), np.repeat(self.arrival_rates, k, axis=0))
+
+    def copy(self) -> "BatchState":
+        return self.fork(1)
+
+    @property
+    def phase_codes(self) -> np.ndarray:
+        """Kode arah fase aktif (indeks DIRECTIONS) per baris."""
+        return _PHASE_CODES[self.phase_idx]
+
+    def step(self, arrivals, controller, departure_rate: int = DEPARTURE_RATE) -> np.ndarray:
+        """
+        Majukan semua baris 1 detik, urutan sama dengan Simulation.step():
+        kedatangan, keberangkatan fase hijau, lalu pergantian fase (controller
+        dipanggil sekali untuk semua baris yang berganti fase).
+        Returns jumlah mobil berangkat per baris.
+        """
+        counts = self.counts
+        counts += arrivals
+        rows = np.arange(len(counts))
+        active = self.phase_codes
+        green = self.green_timer > 0
+        departed = np.where(green, np.minimum(counts[rows, active], departure_rate), 0)
+        counts[rows, active] -= departed
+        self.green_timer -= green
+
+        switch = np.flatnonzero(self.green_timer <= 0)
+        if len(switch):
+            self.phase_idx[switch] = (self.phase_idx[switch] + 1) % len(PHASE_ORDER)
+            batch = PhaseBatch(counts[switch], self.arrival_rates[switch],
+                               _PHASE_CODES[self.phase_idx[switch]])
+            self.green_timer[switch] = controller.decide(batch)
+        return departed
+
+
+def rollout(state: BatchState, controller, horizon: int, rng=None, arrivals=None) -> dict:
+    """
+    Simulasikan state (in place) selama horizon detik.
+
+    Args:
+        arrivals: opsional array (horizon, n, 4); default Poisson dari
+            state.arrival_rates memakai rng.
+
+    Returns dict: delay (n,) total mobil-detik antre, served (n,).
+    """
+    if arrivals is None:
+        rng = rng if rng is not None else np.random.default_rng()
+        arrivals = rng.poisson(state.arrival_rates, size=(horizon,) + state.counts.shape)
+    delay = np.zeros(len(state), dtype=np.int64)
+    served = np.zeros(len(state), dtype=np.int64)
+    for t in range(horizon):
+        served += state.step(arrivals[t], controller)
+        delay += state.counts.sum(axis=1)
+    return {"delay": delay, "served": served}
+
+
+class LookaheadController:
+    """
+    Controller rollout: untuk setiap kandidat durasi hijau, fork state
+    sebanyak `rollouts` kali, simulasikan `horizon` detik ke depan (fase
+    berikutnya diputuskan oleh `policy`), lalu pilih kandidat dengan rata-rata
+    delay terkecil. Kandidat memakai kedatangan acak yang sama per rollout
+    (common random numbers), dan semua persimpangan x kandidat x rollout
+    dijalankan sebagai satu batch.
+    """
+
+    def __init__(self, candidates=(10, 20, 30, 40, 50, 60), horizon: int = 120,
+                 rollouts: int = 16, policy=None, seed=None):
+        self.candidates = np.asarray(candidates, dtype=np.int64)
+        self.horizon = horizon
+        self.rollouts = rollouts
+        self.seed = seed
+        self.policy = policy if policy is not None else FuzzyController()
+        self.rng = np.random.default_rng(seed)
+
+    def decide(self, batch):
+        n, c, r = len(batch.phase), len(self.candidates), self.rollouts
+        rates = np.asarray(batch.arrival_rates, dtype=float)
+        state = BatchState(batch.queues, 0, _PHASE_POSITION[batch.phase], rates).fork(c * r)
+        state.green_timer[:] = np.tile(np.repeat(self.candidates, r), n)
+
+        # Kedatangan (horizon, n, r, 4) dipakai bersama oleh semua kandidat
+        draws = self.rng.poisson(rates[None, :, None, :], size=(self.horizon, n, r, 4))
+        arrivals = np.broadcast_to(draws[:, :, None], (self.horizon, n, c, r, 4))
+        arrivals = arrivals.reshape(self.horizon, n * c * r, 4)
+
+        delay = rollout(state, self.policy, self.horizon, arrivals=arrivals)["delay"]
+        best = delay.reshape(n, c, r).mean(axis=2).argmin(axis=1)
+        return self.candidates[best]
+
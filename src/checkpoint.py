@@ -0,0 +1,106 @@
+import os
+import pickle
+import zlib
+
+from src.simulation import SIMULATION_DURATION, Simulation
+from src.trace_io import TraceWriter
+
+CHECKPOINT_VERSION = 2
+# Versi 1 menyimpan deret wait lengkap; masih bisa di-resume
+_READABLE_VERSIONS = (1, 2)
+
+
+def save_checkpoint(path: str, sim: Simulation, run_config: dict, trace_offset: int,
+                    encoder=None, series: bool = False):
+    """
+    Simpan snapshot terkompresi (pickle + zlib) secara atomik: ditulis ke file
+    sementara lalu os.replace, jadi crash saat menulis tidak merusak
+    checkpoint sebelumnya. Default state_dict(series=False): ukuran snapshot
+    tidak bertambah seiring waktu simulasi; series=True ikut menyimpan deret
+    warm-up (stats(warmup=...) tetap bisa dipakai setelah resume). encoder:
+    DeltaEncoder trace (frame terakhir), supaya trace delta hasil resume identik.
+    """
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "run": run_config,
+        "trace_offset": trace_offset,
+        "simulation": sim.state_dict(series=series),
+        "encoder": encoder,
+    }
+    blob = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 6)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    with open(path, "rb") as f:
+        payload = pickle.loads(zlib.decompress(f.read()))
+    if payload.get("version") not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported checkpoint version: {payload.get('version')}")
+    return payload
+
+
+def _drive(sim, writer, run_config, checkpoint_path, checkpoint_every):
+    """Loop utama bersama untuk run baru dan resume."""
+    duration = run_config["duration"]
+    if duration is None and sim.arrivals is None:
+        duration = SIMULATION_DURATION
+    while duration is None or sim.t < duration:
+        frame = sim.step()
+        if frame is None:
+            break
+        writer.write_frame(frame)
+        if sim.t % checkpoint_every == 0:
+            save_checkpoint(checkpoint_path, sim, run_config, writer.tell(), writer.encoder)
+
+    stats = sim.stats()
+    writer.close(summary=stats)
+    return stats
+
+
+def run_checkpointed(mode="FUZZY", fixed_duration=30, duration=None, trace_path="docs/trace.jsonl",
+                     checkpoint_path="docs/trace.ckpt", checkpoint_every=3600, seed=None,
+                     arrivals=None, rate_estimate="window", encoding="full", keyframe_every=60):
+    """
+    Seperti run_simulation, tetapi frame ditulis langsung ke trace JSONL dan
+    snapshot lengkap (state Simulation, state RNG, posisi byte trace)
+    disimpan setiap checkpoint_every detik simulasi. Jika proses mati,
+    resume(checkpoint_path) melanjutkan dan menghasilkan trace yang identik
+    byte-per-byte dengan run tanpa gangguan. rate_estimate, encoding dan
+    keyframe_every sama seperti di run_simulation.
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be at least 1.")
+    run_config = {
+        "mode": mode,
+        "fixed_duration": fixed_duration,
+        "duration": duration,
+        "trace_path": trace_path,
+        "checkpoint_every": checkpoint_every,
+        "encoding": encoding,
+        "keyframe_every": keyframe_every,
+    }
+    sim = Simulation(mode, fixed_duration, arrivals=arrivals, seed=seed,
+                     rate_estimate=rate_estimate)
+    metadata = {"mode": mode, "fixed_duration": fixed_duration, "duration": duration, "seed": seed,
+                "rate_estimate": rate_estimate}
+    writer = TraceWriter(trace_path, metadata=metadata, encoding=encoding,
+                         keyframe_every=keyframe_every)
+    return _drive(sim, writer, run_config, checkpoint_path, checkpoint_every)
+
+
+def resume(checkpoint_path: str):
+    """Lanjutkan run dari checkpoint terakhir; trace dipotong ke posisi snapshot."""
+    payload = load_checkpoint(checkpoint_path)
+    run_config = payload["run"]
+    sim = Simulation.from_state(payload["simulation"])
+    writer = TraceWriter(run_config["trace_path"], offset=payload["trace_offset"],
+                         encoding=run_config.get("encoding", "full"),
+                         keyframe_every=run_config.get("keyframe_every", 60))
+    if payload.get("encoder") is not None:
+        writer.encoder = payload["encoder"]
+    return _drive(sim, writer, run_config, checkpoint_path, run_config["checkpoint_every"])
@@ -0,0 +1,67 @@
+import numpy as np
+
+from src.simulation import simulate_stats
+from src.stats import mean_confidence_interval
+
+KPIS = ("avg_wait", "p95_wait", "max_wait", "served", "leftover")
+
+
+def replication_seeds(n_replications: int, base_seed: int = 0) -> list[int]:
+    """Seed independen per replikasi, diturunkan dari satu base_seed."""
+    return [int(s) for s in np.random.SeedSequence(base_seed).generate_state(n_replications)]
+
+
+def paired_comparison(n_replications: int = 10, base_seed: int = 0, mode_a: str = "FIXED",
+                      mode_b: str = "FUZZY", fixed_duration: int = 30, duration=None,
+                      confidence: float = 0.95, kpis=KPIS, **sim_kwargs) -> dict:
+    """
+    Perbandingan A/B berpasangan dengan common random numbers.
+
+    Pada setiap replikasi kedua controller dijalankan dengan seed yang sama,
+    jadi substream kedatangan dan intent-nya identik. Selisih (B - A) per
+    replikasi hanya mengandung efek controller, sehingga interval kepercayaan
+    selisihnya jauh lebih sempit daripada membandingkan dua run independen.
+
+    Returns dict per KPI berisi mean_a, mean_b, mean_diff, ci (low, high),
+    half_width, dan independent_half_width (half-width jika kedua sampel
+    diperlakukan independen, sebagai pembanding reduksi variansi).
+    """
+    seeds = replication_seeds(n_replications, base_seed)
+    runs_a, runs_b = [], []
+    for seed in seeds:
+        runs_a.append(simulate_stats(mode_a, fixed_duration, duration, seed=seed, **sim_kwargs))
+        runs_b.append(simulate_stats(mode_b, fixed_duration, duration, seed=seed, **sim_kwargs))
+
+    result = {"n_replications": n_replications, "modes": (mode_a, mode_b), "seeds": seeds}
+    for kpi in kpis:
+        a = np.array([float(r[kpi]) for r in runs_a])
+        b = np.array([float(r[kpi]) for r in runs_b])
+        mean_diff, half_width = mean_confidence_interval(b - a, confidence)
+        # Half-width Welch-style jika A dan B dianggap sampel independen
+        if n_replications > 1:
+            _, hw_a = mean_confidence_interval(a, confidence)
+            _, hw_b = mean_confidence_interval(b, confidence)
+            independent_hw = float(np.hypot(hw_a, hw_b))
+        else:
+            independent_hw = float("inf")
+        result[kpi] = {
+            "mean_a": float(a.mean()),
+            "mean_b": float(b.mean()),
+            "mean_diff": mean_diff,
+            "half_width": half_width,
+            "ci": (mean_diff - half_width, mean_diff + half_width),
+            "independent_half_width": independent_hw,
+        }
+    return result
+
+
+if __name__ == "__main__":
+    report = paired_comparison(n_replications=10)
+    mode_a, mode_b = report["modes"]
+    print(f"=== PAIRED A/B ({mode_b} - {mode_a}), {report['n_replications']} replikasi ===")
+    print(f"{'KPI':<10} | {'Selisih':>9} | {'CI 95%':>20} | {'HW paired':>9} | {'HW indep.':>9}")
+    for kpi in KPIS:
+        r = report[kpi]
+        ci = f"[{r['ci'][0]:.2f}, {r['ci'][1]:.2f}]"
+        print(f"{kpi:<10} | {r['mean_diff']:>9.2f} | {ci:>20} | {r['half_width']:>9.2f} | "
+              f"{r['independent_half_width']:>9.2f}")
@@ -0,0 +1,295 @@
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from src.fuzzy_module import get_green_durations
+
+FALLBACK_DURATION = 15  # Sama dengan fallback get_green_duration
+
+
+class ControllerService:
+    """
+    Layanan asyncio lokal untuk keputusan durasi lampu hijau banyak persimpangan.
+
+    Request (queue, arrival) yang datang dalam satu jendela waktu kecil
+    digabung menjadi satu panggilan inferensi batch; setiap pemanggil tetap
+    menerima jawabannya sendiri. Bisa dipakai in-process (request()), lewat
+    TCP (serve_tcp()) atau Unix socket (serve_unix()).
+
+    Args:
+        infer: fungsi batch (queues, arrivals) -> durations.
+        batch_window: lama (detik) menunggu request lain setelah request pertama.
+        max_batch: ukuran batch maksimum sebelum langsung di-flush.
+        latency_budget: target latensi per request (detik); batch di-flush
+            lebih awal agar request tertua tidak melewati budget ini.
+    """
+
+    def __init__(self, infer=get_green_durations, batch_window: float = 0.002,
+                 max_batch: int = 4096, latency_budget: float = 0.05,
+                 latency_history: int = 10000):
+        if batch_window < 0 or latency_budget <= 0:
+            raise ValueError("batch_window must be >= 0 and latency_budget > 0.")
+        self.infer = infer
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.latency_budget = latency_budget
+
+        self._pending = None
+        self._batcher = None
+        self._servers = []
+
+        # --- METRICS ---
+        self.started_at = None
+        self.requests_served = 0
+        self.batches_run = 0
+        self.budget_misses = 0
+        self.latencies = deque(maxlen=latency_history)
+
+    async def start(self):
+        if self._batcher is not None:
+            return
+        self._pending = asyncio.Queue()
+        self.started_at = time.perf_counter()
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def request(self, queue: int, arrival_rate: float) -> int:
+        """Minta durasi lampu hijau untuk satu persimpangan (in-process)."""
+        if self._batcher is None:
+            raise RuntimeError("Service belum dijalankan (panggil start()).")
+        # Validasi di sini supaya request rusak tidak pernah sampai ke batcher
+        try:
+            queue, arrival_rate = float(queue), float(arrival_rate)
+        except (TypeError, ValueError):
+            raise ValueError(f"queue and arrival must be numbers, got {queue!r}, "
+                             f"{arrival_rate!r}.") from None
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((queue, arrival_rate, future, time.perf_counter()))
+        return await future
+
+    async def _collect_batch(self):
+        """Ambil request pertama lalu kumpulkan sisanya sampai jendela/budget habis."""
+        batch = [await self._pending.get()]
+        oldest = batch[0][3]
+        deadline = min(time.perf_counter() + self.batch_window,
+                       oldest + self.latency_budget / 2)
+        while len(batch) < self.max_batch:
+            while not self._pending.empty() and len(batch) < self.max_batch:
+                batch.append(self._pending.get_nowait())
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or len(batch) >= self.max_batch:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._pending.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            try:
+                queues = np.array([item[0] for item in batch], dtype=float)
+                arrivals = np.array([item[1] for item in batch], dtype=float)
+            except (TypeError, ValueError) as exc:
+                # Batch gagal, tetapi batcher tetap hidup untuk request berikutnya
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            try:
+                # Inferensi di executor supaya event loop tetap menerima request
+                durations = await loop.run_in_executor(None, self.infer, queues, arrivals)
+            except Exception:
+                durations = np.full(len(batch), FALLBACK_DURATION)
+
+            now = time.perf_counter()
+            for (_, _, future, enqueued), duration in zip(batch, durations):
+                latency = now - enqueued
+                self.latencies.append(latency)
+                if latency > self.latency_budget:
+                    self.budget_misses += 1
+                if not future.done():
+                    future.set_result(int(duration))
+            self.requests_served += len(batch)
+            self.batches_run += 1
+
+    def metrics(self) -> dict:
+        """Throughput dan latensi (detik) sejak service dijalankan."""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        lat = np.array(self.latencies) if self.latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+        return {
+            "requests": self.requests_served,
+            "batches": self.batches_run,
+            "avg_batch_size": self.requests_served / self.batches_run if self.batches_run else 0.0,
+            "throughput_rps": self.requests_served / elapsed if elapsed > 0 else 0.0,
+            "latency_p50": float(p50),
+            "latency_p95": float(p95),
+            "latency_p99": float(p99),
+            "budget_misses": self.budget_misses,
+        }
+
+    # --- SOCKET TRANSPORT (JSON per baris) ---
+    # Request : {"id": 7, "queue": 12, "arrival": 0.4}
+    # Response: {"id": 7, "duration": 18}   atau {"id": 7, "error": "..."}
+
+    async def _handle_client(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line):
+            msg_id = None
+            try:
+                msg = json.loads(line)
+                msg_id = msg.get("id")
+                duration = await self.request(msg["queue"], msg["arrival"])
+                reply = {"id": msg_id, "duration": duration}
+            except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                reply = {"id": msg_id, "error": f"bad request: {exc}"}
+            async with write_lock:
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765):
+        await self.start()
+        server = await asyncio.start_server(self._handle_client, host, port)
+        self._servers.append(server)
+        return server
+
+    async def serve_unix(self, path: str):
+        await self.start()
+        server = await asyncio.start_unix_server(self._handle_client, path)
+        self._servers.append(server)
+        return server
+
+
+class ControllerClient:
+    """Client socket sederhana; beberapa request boleh in-flight sekaligus."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def connect_tcp(cls, host: str = "127.0.0.1", port: int = 8765):
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path: str):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def _read_loop(self):
+        error = ConnectionError("Connection closed by server.")
+        try:
+            while line := await self.reader.readline():
+                reply = json.loads(line)
+                future = self._waiting.pop(reply["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in reply:
+                    future.set_exception(ValueError(reply["error"]))
+                else:
+                    future.set_result(reply["duration"])
+        except (ValueError, KeyError, TypeError) as exc:
+            error = ConnectionError(f"Invalid reply from server: {exc}")
+        except OSError as exc:
+            error = ConnectionError(f"Connection lost: {exc}")
+        finally:
+            # Apa pun sebab loop berhenti, jangan biarkan pemanggil menunggu selamanya
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._waiting.clear()
+
+    async def request(self, queue: int, arrival_rate: float) -> int:
+        if self._reader_task.done():
+            raise ConnectionError("Connection closed.")
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._next_id] = future
+        msg = {"id": self._next_id, "queue": int(queue), "arrival": float(arrival_rate)}
+        self.writer.write((json.dumps(msg) + "\n").encode())
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._reader_task.cancel()
+
+
+async def simulate_intersections(request_fn, n_intersections: int = 2000,
+                                 switches_each: int = 5, seed: int = 0,
+                                 max_think: float = 0.005):
+    """
+    Client uji: n_intersections persimpangan yang masing-masing meminta durasi
+    pada setiap pergantian fase, dengan jeda acak kecil di antara permintaan.
+    request_fn: coroutine (queue, arrival) -> duration (service.request atau client.request).
+    Returns list (queue, arrival, duration) dari semua keputusan.
+    """
+    rng = np.random.default_rng(seed)
+
+    async def intersection(i):
+        local = np.random.default_rng(rng.integers(1 << 32))
+        decisions = []
+        for _ in range(switches_each):
+            await asyncio.sleep(local.uniform(0, max_think))
+            queue = int(local.integers(0, 60))
+            arrival = round(float(local.uniform(0.1, 0.9)), 1)
+            decisions.append((queue, arrival, await request_fn(queue, arrival)))
+        return decisions
+
+    results = await asyncio.gather(*(intersection(i) for i in range(n_intersections)))
+    return [d for decisions in results for d in decisions]
+
+
+async def _demo(n_intersections: int):
+    async with ControllerService() as service:
+        start = time.perf_counter()
+        decisions = await simulate_intersections(service.request, n_intersections)
+        elapsed = time.perf_counter() - start
+        print(f"{len(decisions)} keputusan dalam {elapsed:.2f}s")
+        for key, value in service.metrics().items():
+            print(f"  {key:<16}: {value:.4f}" if isinstance(value, float) else f"  {key:<16}: {value}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
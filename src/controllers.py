@@ -0,0 +1,186 @@
+"""
+Controller lampu hijau dengan antarmuka batch.
+
+Setiap controller punya decide(batch) -> durasi hijau (detik, int) untuk
+banyak persimpangan/replikasi sekaligus. Batch berisi state saat fase
+berganti: panjang antrian dan laju kedatangan per arah (kolom sesuai
+DIRECTIONS) serta kode fase yang akan hijau. Controller dibuat lewat
+registry: make_controller("FUZZY"), register_controller("NAMA", factory).
+"""
+from typing import NamedTuple, Protocol
+
+import numpy as np
+
+from src import fuzzy_module, sugeno_module
+from src.fuzzy_sparse import SparseFuzzyController
+from src.intersection import DIRECTIONS
+
+
+class PhaseBatch(NamedTuple):
+    """State n persimpangan saat pergantian fase."""
+    queues: np.ndarray         # (n, 4) antrian per arah
+    arrival_rates: np.ndarray  # (n, 4) laju kedatangan per arah (mobil/detik)
+    phase: np.ndarray          # (n,) kode fase berikutnya (indeks DIRECTIONS)
+
+    @classmethod
+    def single(cls, queues, arrival_rates, phase: int) -> "PhaseBatch":
+        """Batch berisi satu persimpangan."""
+        return cls(np.asarray(queues, dtype=np.int64).reshape(1, len(DIRECTIONS)),
+                   np.asarray(arrival_rates, dtype=float).reshape(1, len(DIRECTIONS)),
+                   np.array([phase], dtype=np.int64))
+
+    def phase_values(self, values: np.ndarray) -> np.ndarray:
+        """Ambil kolom fase aktif dari array (n, 4)."""
+        return values[np.arange(len(self.phase)), self.phase]
+
+
+class Controller(Protocol):
+    def decide(self, batch: PhaseBatch) -> np.ndarray:
+        """Durasi hijau (n,) int untuk fase batch.phase."""
+        ...
+
+
+class FixedController:
+    """Timer konvensional: durasi sama untuk setiap fase."""
+
+    def __init__(self, duration: int = 30):
+        self.duration = duration
+
+    def decide(self, batch):
+        return np.full(len(batch.phase), self.duration, dtype=np.int64)
+
+
+class FuzzyController:
+    """Controller Mamdani (fuzzy_module) dengan clamp durasi minimum."""
+
+    def __init__(self, min_green: int = 5):
+        self.min_green = min_green
+
+    def decide(self, batch):
+        durations = fuzzy_module.get_green_durations(batch.phase_values(batch.queues),
+                                                     batch.phase_values(batch.arrival_rates))
+        return np.maximum(durations, self.min_green)
+
+
+class SugenoPhaseController(FuzzyController):
+    """
+    Controller Takagi-Sugeno (sugeno_module) dengan clamp durasi minimum.
+
+    Args:
+        min_green: clamp durasi minimum.
+        order: orde konsekuen Sugeno, 0 (konstanta) atau 1 (linear).
+    """
+
+    def __init__(self, min_green: int = 5, order: int = 1):
+        super().__init__(min_green)
+        self.order = order
+        self.sugeno = sugeno_module.get_controller(order)
+
+    def decide(self, batch):
+        durations = self.sugeno.green_durations(batch.phase_values(batch.queues),
+                                                batch.phase_values(batch.arrival_rates))
+        return np.maximum(durations, self.min_green)
+
+
+class ActuatedController:
+    """
+    Queue-actuated: hijau cukup lama untuk menghabiskan antrian fase ini,
+    termasuk mobil yang datang selama hijau (q / (s - lambda)), ditambah
+    gap, lalu dibatasi ke [min_green, max_green].
+    """
+
+    def __init__(self, min_green: int = 5, max_green: int = 60, gap: int = 2,
+                 saturation_flow: float = 1.0):
+        self.min_green = min_green
+        self.max_green = max_green
+        self.gap = gap
+        self.saturation_flow = saturation_flow
+
+    def decide(self, batch):
+        queue = batch.phase_values(batch.queues).astype(float)
+        spare = self.saturation_flow - batch.phase_values(batch.arrival_rates)
+        with np.errstate(divide="ignore"):
+            clear = np.where(spare > 0, queue / spare, np.inf)
+        durations = np.ceil(np.minimum(clear + self.gap, self.max_green))
+        return np.clip(durations, self.min_green, self.max_green).astype(np.int64)
+
+
+class WebsterController:
+    """
+    Split hijau ala Webster dari laju kedatangan semua arah.
+
+    Siklus optimum C0 = (1.5 L + 5) / (1 - Y) dengan Y = jumlah rasio arus
+    (laju / saturation flow) dan L total lost time; hijau efektif C0 - L
+    dibagi proporsional terhadap rasio arus tiap fase. Jika Y mendekati 1
+    (jenuh), siklus dibatasi max_cycle.
+    """
+
+    def __init__(self, lost_time: float = 2.0, saturation_flow: float = 1.0,
+                 min_cycle: float = 40, max_cycle: float = 120, min_green: int = 5):
+        self.lost_time = lost_time  # Per fase
+        self.saturation_flow = saturation_flow
+        self.min_cycle = min_cycle
+        self.max_cycle = max_cycle
+        self.min_green = min_green
+
+    def decide(self, batch):
+        ratios = np.asarray(batch.arrival_rates, dtype=float) / self.saturation_flow
+        total = ratios.sum(axis=1)
+        lost = self.lost_time * ratios.shape[1]
+        with np.errstate(divide="ignore"):
+            cycle = np.where(total < 0.95, (1.5 * lost + 5) / (1 - total), self.max_cycle)
+        cycle = np.clip(cycle, self.min_cycle, self.max_cycle)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(total > 0, batch.phase_values(ratios) / total, 1 / ratios.shape[1])
+        durations = np.round((cycle - lost) * share)
+        return np.maximum(durations, self.min_green).astype(np.int64)
+
+
+class MaxPressureController:
+    """
+    Max-pressure untuk persimpangan terisolasi (arus keluar tidak antre,
+    jadi pressure fase = antriannya). Fase dengan pressure tertinggi
+    mendapat `interval` detik; fase lain dilewati (min_green, default 0;
+    setiap fase yang dilewati tetap memakan 1 detik transisi di simulasi).
+    """
+
+    def __init__(self, interval: int = 10, min_green: int = 0):
+        self.interval = interval
+        self.min_green = min_green
+
+    def decide(self, batch):
+        pressure = np.asarray(batch.queues)
+        is_max = batch.phase_values(pressure) >= pressure.max(axis=1)
+        return np.where(is_max, self.interval, self.min_green).astype(np.int64)
+
+
+def _lookahead(**options):
+    # Import lokal: batch_sim bergantung pada simulation, yang memakai modul ini
+    from src.batch_sim import LookaheadController
+    return LookaheadController(**options)
+
+
+CONTROLLERS = {
+    "FIXED": FixedController,
+    "FUZZY": FuzzyController,
+    "SUGENO": SugenoPhaseController,
+    "FUZZY_MULTI": SparseFuzzyController,
+    "ACTUATED": ActuatedController,
+    "WEBSTER": WebsterController,
+    "MAX_PRESSURE": MaxPressureController,
+    "LOOKAHEAD": _lookahead,
+}
+
+
+def register_controller(name: str, factory):
+    """Daftarkan controller baru (factory dipanggil dengan opsi make_controller)."""
+    CONTROLLERS[name.upper()] = factory
+
+
+def make_controller(name: str, **options) -> Controller:
+    """Buat controller dari registry berdasarkan nama mode."""
+    try:
+        factory = CONTROLLERS[name.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown controller: {name}. Available: {sorted(CONTROLLERS)}") from None
+    return factory(**options)
@@ -0,0 +1,188 @@
+import copy
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.arrival_sources import ArrivalSource
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+def _per_direction(values, n_points=None):
+    """Ubah nilai laju menjadi array (n_points, 4); laju skalar berlaku untuk semua arah."""
+    values = np.asarray(values, dtype=float)
+    if n_points is None:
+        return np.broadcast_to(values, (4,)).copy()
+    if values.ndim == 1:
+        values = values[:, None]
+    return np.broadcast_to(values, (n_points, 4)).copy()
+
+
+class DemandProfile(ABC):
+    """
+    Laju kedatangan yang berubah terhadap waktu, lambda(t) per arah (mobil/detik).
+
+    Subclass mengimplementasikan rates(t) untuk array waktu t (detik) dan
+    mengembalikan array (len(t), 4) berurutan N, S, E, W. Jika period diisi,
+    profil berulang (mis. DAY untuk pola harian, WEEK untuk pola mingguan).
+    """
+
+    period = None
+
+    @abstractmethod
+    def rates(self, t):
+        """Laju (len(t), 4) pada waktu t (detik)."""
+
+    def _wrap(self, t):
+        t = np.asarray(t, dtype=float)
+        return np.mod(t, self.period) if self.period else t
+
+    def tick_rates(self, start: int, n: int) -> np.ndarray:
+        """
+        Rata-rata lambda pada setiap detik [t, t+1) untuk t = start .. start+n-1
+        (aturan Simpson; eksak untuk profil linear per bagian).
+        """
+        t = np.arange(start, start + n, dtype=float)
+        return (self.rates(t) + 4 * self.rates(t + 0.5) + self.rates(t + 1)) / 6
+
+
+class PiecewiseProfile(DemandProfile):
+    """
+    Profil dari titik-titik (waktu, laju).
+
+    Args:
+        times: waktu breakpoint (detik), naik, di dalam [0, period).
+        rates: laju per breakpoint, bentuk (k,) untuk semua arah atau (k, 4).
+        period: panjang siklus profil (default DAY); None = tidak berulang.
+        kind: "linear" (interpolasi antar titik) atau "step" (konstan sampai
+            breakpoint berikutnya).
+    """
+
+    def __init__(self, times, rates, period=DAY, kind: str = "linear"):
+        times = np.asarray(times, dtype=float)
+        if times.ndim != 1 or len(times) < 1 or np.any(np.diff(times) <= 0):
+            raise ValueError("times must be a strictly increasing 1-D sequence.")
+        if kind not in ("linear", "step"):
+            raise ValueError("kind must be 'linear' or 'step'.")
+        self.times = times
+        self.values = _per_direction(rates, len(times))
+        if np.any(self.values < 0):
+            raise ValueError("Arrival rates must be non-negative.")
+        self.period = period
+        self.kind = kind
+
+    def rates(self, t):
+        t = self._wrap(t)
+        if self.kind == "step":
+            idx = np.searchsorted(self.times, t, side="right") - 1
+            if self.period:
+                # Sebelum breakpoint pertama: laju terakhir dari siklus sebelumnya
+                idx = np.where(idx < 0, len(self.times) - 1, idx)
+            return self.values[np.maximum(idx, 0)]
+        times, values = self.times, self.values
+        if self.period:
+            # Tutup siklus: titik terakhir menyambung ke titik pertama periode berikutnya
+            times = np.concatenate([[times[-1] - self.period], times, [times[0] + self.period]])
+            values = np.vstack([values[-1:], values, values[:1]])
+        return np.column_stack([np.interp(t, times, values[:, d]) for d in range(4)])
+
+    def tick_rates(self, start: int, n: int) -> np.ndarray:
+        if self.kind == "step":
+            # Titik tengah detik eksak selama breakpoint berada di detik bulat
+            return self.rates(np.arange(start, start + n, dtype=float) + 0.5)
+        return super().tick_rates(start, n)
+
+
+class SmoothProfile(DemandProfile):
+    """
+    Profil halus: laju dasar + puncak-puncak Gaussian (mis. jam sibuk pagi/sore).
+
+    Args:
+        base: laju dasar, skalar atau per arah (4,).
+        peaks: list (center_detik, lebar_detik, tinggi) dengan tinggi skalar
+            atau per arah (4,). Puncak dibungkus melingkar terhadap period.
+        period: panjang siklus (default DAY).
+    """
+
+    def __init__(self, base, peaks=(), period=DAY):
+        self.base = _per_direction(base)
+        self.peaks = [(float(c), float(w), _per_direction(h)) for c, w, h in peaks]
+        if np.any(self.base < 0) or any(np.any(h < 0) for _, _, h in self.peaks):
+            raise ValueError("Arrival rates must be non-negative.")
+        if any(w <= 0 for _, w, _ in self.peaks):
+            raise ValueError("Peak widths must be positive.")
+        self.period = period
+
+    def rates(self, t):
+        t = self._wrap(t)
+        out = np.broadcast_to(self.base, (len(t), 4)).copy()
+        for center, width, height in self.peaks:
+            dt = t - center
+            if self.period:
+                dt = (dt + self.period / 2) % self.period - self.period / 2
+            out += np.exp(-0.5 * (dt / width) ** 2)[:, None] * height
+        return out
+
+    def tick_rates(self, start: int, n: int) -> np.ndarray:
+        # Lebar puncak dalam skala jam: nilai titik tengah detik sudah cukup akurat
+        return self.rates(np.arange(start, start + n, dtype=float) + 0.5)
+
+
+def rush_hour_profile(base=0.15, morning=0.45, evening=0.5, period=DAY) -> SmoothProfile:
+    """Pola harian contoh: jam sibuk pagi (07:30) dan sore (17:30)."""
+    return SmoothProfile(
+        base=base,
+        peaks=[(7.5 * HOUR, 1.0 * HOUR, morning), (17.5 * HOUR, 1.25 * HOUR, evening)],
+        period=period,
+    )
+
+
+class ProfileArrivals(ArrivalSource):
+    """
+    Sampling proses Poisson non-homogen dari DemandProfile, per chunk secara
+    vektor: satu panggilan rng.poisson per chunk, bukan per detik.
+
+    Args:
+        profile: DemandProfile.
+        duration: jumlah detik yang dihasilkan (default satu periode profil).
+        start: detik awal (untuk mulai di tengah hari, mis. 6 * HOUR).
+        chunk_rows: jumlah detik per chunk.
+        rng: numpy Generator (default np.random.default_rng()).
+    """
+
+    def __init__(self, profile: DemandProfile, duration: int | None = None, start: int = 0,
+                 chunk_rows: int = DAY, rng=None):
+        if duration is None:
+            if not profile.period:
+                raise ValueError("duration is required for non-periodic profiles.")
+            duration = int(profile.period)
+        self.profile = profile
+        self.duration = int(duration)
+        self.start = int(start)
+        self.chunk_rows = chunk_rows
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._period_rates = None
+
+    def __getstate__(self):
+        # Cache lambda satu periode tidak ikut di-pickle (checkpoint); dibangun ulang saat dipakai
+        state = self.__dict__.copy()
+        state["_period_rates"] = None
+        return state
+
+    def _rates_for(self, t0: int, n: int) -> np.ndarray:
+        period = self.profile.period
+        if not period or float(period) != int(period) or self.duration <= period:
+            return self.profile.tick_rates(t0, n)
+        # Profil periodik: hitung lambda satu periode sekali, lalu cukup diindeks
+        if self._period_rates is None:
+            self._period_rates = self.profile.tick_rates(0, int(period))
+        return self._period_rates[np.arange(t0, t0 + n) % int(period)]
+
+    def chunks(self):
+        rng = copy.deepcopy(self.rng)  # Salinan: replay selalu identik
+        end = self.start + self.duration
+        for t0 in range(self.start, end, self.chunk_rows):
+            n = min(self.chunk_rows, end - t0)
+            yield rng.poisson(self._rates_for(t0, n))
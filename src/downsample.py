@@ -0,0 +1,86 @@
+"""
+Downsampling deret waktu panjang untuk grafik.
+
+Trace seminggu berisi ~600 ribu titik per deret, jauh lebih banyak dari
+jumlah piksel sumbu x. Dua metode yang menjaga bentuk grafik:
+
+- minmax: per bucket (kira-kira satu piksel) simpan titik minimum dan
+  maksimum, urut waktu. Puncak dan lembah tidak hilang, dan garis yang
+  digambar identik secara visual dengan deret penuh. Sepenuhnya vektor.
+- lttb: Largest-Triangle-Three-Buckets (Steinarsson 2013). Satu titik per
+  bucket, yaitu yang membentuk segitiga terbesar dengan titik terpilih
+  sebelumnya dan rata-rata bucket berikutnya. Lebih halus untuk n kecil.
+
+Titik pertama dan terakhir selalu dipertahankan.
+"""
+import numpy as np
+
+# Default titik per deret: ~lebar sumbu dalam piksel pada figur 12-14 inci, dpi 150-300
+MAX_POINTS = 2000
+
+
+def _bucket_edges(n, n_buckets):
+    """Batas bucket untuk titik 1..n-2 (titik pertama/terakhir terpisah)."""
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+
+
+def minmax_indices(y, max_points=MAX_POINTS) -> np.ndarray:
+    """Indeks terurut titik min dan max tiap bucket (paling banyak max_points)."""
+    y = np.asarray(y)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    edges = _bucket_edges(n, max(max_points // 2 - 1, 1))
+    starts = edges[:-1]
+    # Bucket kosong tidak mungkin karena n > max_points
+    order = np.arange(n)
+    inner = y[1:n - 1]
+    lo = np.minimum.reduceat(inner, starts - 1)
+    hi = np.maximum.reduceat(inner, starts - 1)
+    bucket = np.repeat(np.arange(len(starts)), np.diff(edges))
+    # Indeks pertama dalam bucket yang mencapai min / max
+    is_lo = inner == lo[bucket]
+    is_hi = inner == hi[bucket]
+    first_lo = np.full(len(starts), n)
+    first_hi = np.full(len(starts), n)
+    np.minimum.at(first_lo, bucket[is_lo], order[1:n - 1][is_lo])
+    np.minimum.at(first_hi, bucket[is_hi], order[1:n - 1][is_hi])
+    return np.unique(np.concatenate([[0, n - 1], first_lo, first_hi]))
+
+
+def lttb_indices(x, y, max_points=MAX_POINTS) -> np.ndarray:
+    """Indeks terurut titik terpilih LTTB (tepat max_points jika deret lebih panjang)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+    edges = _bucket_edges(n, max_points - 2)
+    # Rata-rata setiap bucket sekaligus; bucket setelah yang terakhir = titik terakhir
+    sizes = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes, y[-1])
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(max_points - 2):
+        start, stop = edges[b], edges[b + 1]
+        # Luas segitiga (x2 bertanda diabaikan) terhadap titik sebelumnya dan rata-rata bucket berikut
+        area = np.abs((x[prev] - mean_x[b + 1]) * (y[start:stop] - y[prev])
+                      - (x[prev] - x[start:stop]) * (mean_y[b + 1] - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[b + 1] = prev
+    return selected
+
+
+def downsample(x, y, max_points=MAX_POINTS, method="minmax"):
+    """Returns (x, y) ter-downsample sebagai array; deret pendek dikembalikan utuh."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method == "minmax":
+        index = minmax_indices(y, max_points)
+    elif method == "lttb":
+        index = lttb_indices(x, y, max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[index], y[index]
@@ -0,0 +1,105 @@
+"""
+Inferensi Mamdani analitik untuk membership function segitiga (trimf).
+
+Karena semua term memakai trimf, hasil clipping (min) dan agregasi (max)
+selalu berupa fungsi linear per bagian. Centroid-nya dihitung eksak dari
+breakpoint-breakpoint tersebut (luas dan momen tiap segmen linear), tanpa
+sampling universe, dan tervektorisasi untuk banyak input sekaligus.
+"""
+import numpy as np
+
+
+def trimf(x, abc):
+    """Membership segitiga [a, b, c] (sama dengan skfuzzy.trimf, termasuk bahu a == b / b == c)."""
+    a, b, c = abc
+    x = np.asarray(x, dtype=float)
+    left = (x - a) / (b - a) if b > a else np.where(x >= a, 1.0, 0.0)
+    right = (c - x) / (c - b) if c > b else np.where(x <= c, 1.0, 0.0)
+    return np.clip(np.minimum(left, right), 0.0, 1.0)
+
+
+def rule_strengths(inputs, input_terms, rules, n_outputs):
+    """
+    Derajat aktivasi tiap term output (AND = min, agregasi antar rule = max).
+
+    Args:
+        inputs: list array input crisp, satu per variabel, bentuk (n,).
+        input_terms: list (per variabel) berisi list parameter trimf per term.
+        rules: list (indeks_term_per_input, indeks_term_output).
+        n_outputs: jumlah term output.
+
+    Returns array (n, n_outputs).
+    """
+    memberships = [
+        np.stack([trimf(x, abc) for abc in terms], axis=-1)
+        for x, terms in zip(inputs, input_terms)
+    ]
+    n = len(np.atleast_1d(inputs[0]))
+    strengths = np.zeros((n, n_outputs))
+    for antecedent, out in rules:
+        fire = memberships[0][..., antecedent[0]]
+        for mu, term in zip(memberships[1:], antecedent[1:]):
+            fire = np.minimum(fire, mu[..., term])
+        strengths[:, out] = np.maximum(strengths[:, out], fire)
+    return strengths
+
+
+def _aggregate(x, strengths, out_terms):
+    """mu(x) = max_k min(s_k, T_k(x)) untuk x (n, m) dan strengths (n, k)."""
+    clipped = [np.minimum(strengths[:, k:k + 1], trimf(x, abc)) for k, abc in enumerate(out_terms)]
+    return np.stack(clipped, axis=-1)
+
+
+def centroid(strengths, out_terms, universe):
+    """
+    Centroid eksak dari agregasi term output trimf yang di-clip.
+
+    Args:
+        strengths: array (n, k) derajat aktivasi tiap term output.
+        out_terms: list k parameter trimf [a, b, c].
+        universe: (lo, hi) batas universe output.
+
+    Returns (centroid, area), masing-masing (n,); centroid NaN jika area 0
+    (tidak ada rule yang aktif).
+    """
+    strengths = np.atleast_2d(np.asarray(strengths, dtype=float))
+    n = len(strengths)
+    lo, hi = universe
+    terms = np.asarray(out_terms, dtype=float)
+
+    # 1. Kink tiap fungsi min(s_k, T_k): verteks segitiga + titik potong level clip
+    a, b, c = terms[:, 0], terms[:, 1], terms[:, 2]
+    rise = a + strengths * (b - a)
+    fall = c - strengths * (c - b)
+    base = np.concatenate([
+        np.broadcast_to(np.concatenate([a, b, c, [lo, hi]]), (n, 3 * len(terms) + 2)),
+        rise, fall,
+    ], axis=1)
+    base = np.sort(np.clip(base, lo, hi), axis=1)
+
+    # 2. Di antara dua kink semua fungsi linear; tambahkan titik potong antar
+    #    pasangan fungsi (tempat max berpindah dari satu term ke term lain)
+    vals = _aggregate(base, strengths, out_terms)            # (n, m, k)
+    x0, x1 = base[:, :-1], base[:, 1:]
+    crossings = []
+    k = len(terms)
+    for i in range(k):
+        for j in range(i + 1, k):
+            d = vals[..., i] - vals[..., j]
+            d0, d1 = d[:, :-1], d[:, 1:]
+            sign_change = (d0 * d1 < 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                xc = x0 + (x1 - x0) * d0 / (d0 - d1)
+            crossings.append(np.where(sign_change, xc, hi))
+    points = np.sort(np.concatenate([base] + crossings, axis=1), axis=1)
+
+    # 3. mu linear di setiap segmen -> integrasi trapesium eksak
+    mu = _aggregate(points, strengths, out_terms).max(axis=-1)
+    xa, xb = points[:, :-1], points[:, 1:]
+    ya, yb = mu[:, :-1], mu[:, 1:]
+    width = xb - xa
+    area = (0.5 * width * (ya + yb)).sum(axis=1)
+    moment = (width / 6.0 * (ya * (2 * xa + xb) + yb * (xa + 2 * xb))).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(area > 0, moment / area, np.nan)
+    return result, area
@@ -2,42 +2,55 @@ import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
 
+from src.fuzzy_analytic import centroid, rule_strengths
+
+# --- BAGIAN 0: DEFINISI TERM & RULE (dipakai skfuzzy dan jalur analitik) ---
+QUEUE_UNIVERSE = (0, 80)
+ARRIVAL_UNIVERSE = (0, 10)
+EXTENSION_UNIVERSE = (0, 60)
+
+QUEUE_TERMS = {'short': [0, 0, 20], 'medium': [15, 30, 45], 'long': [40, 80, 80]}
+ARRIVAL_TERMS = {'low': [0, 0, 4], 'medium': [2, 5, 8], 'high': [6, 10, 10]}
+EXTENSION_TERMS = {'short': [0, 0, 20], 'medium': [15, 30, 45], 'long': [35, 60, 60]}
+
+# (queue, arrival) -> extension
+RULES = [
+    ('short', 'low', 'short'),
+    ('short', 'medium', 'short'),
+    ('short', 'high', 'medium'),
+
+    ('medium', 'low', 'medium'),
+    ('medium', 'medium', 'medium'),
+    ('medium', 'high', 'medium'),
+
+    ('long', 'low', 'medium'),
+    ('long', 'medium', 'long'),
+    ('long', 'high', 'long'),
+]
+
+FALLBACK_DURATION = 15  # Dipakai jika tidak ada rule yang aktif
+
 # --- BAGIAN 1: LOGIKA FUZZY MEMBER B ---
 def create_fuzzy_system():
     """Membangun sistem fuzzy logic (Otak)."""
     # 1. INPUT
-    queue = ctrl.Antecedent(np.arange(0, 81, 1), 'queue') 
-    arrival = ctrl.Antecedent(np.arange(0, 11, 1), 'arrival')
-    
+    queue = ctrl.Antecedent(np.arange(QUEUE_UNIVERSE[0], QUEUE_UNIVERSE[1] + 1, 1), 'queue')
+    arrival = ctrl.Antecedent(np.arange(ARRIVAL_UNIVERSE[0], ARRIVAL_UNIVERSE[1] + 1, 1), 'arrival')
+
     # 2. OUTPUT
-    extension = ctrl.Consequent(np.arange(0, 61, 1), 'extension')
+    extension = ctrl.Consequent(np.arange(EXTENSION_UNIVERSE[0], EXTENSION_UNIVERSE[1] + 1, 1), 'extension')
 
     # 3. MEMBERSHIP FUNCTIONS
-    queue['short']  = fuzz.trimf(queue.universe, [0, 0, 20])
-    queue['medium'] = fuzz.trimf(queue.universe, [15, 30, 45])
-    queue['long']   = fuzz.trimf(queue.universe, [40, 80, 80])
-
-    arrival['low']    = fuzz.trimf(arrival.universe, [0, 0, 4])
-    arrival['medium'] = fuzz.trimf(arrival.universe, [2, 5, 8])
-    arrival['high']   = fuzz.trimf(arrival.universe, [6, 10, 10])
-
-    extension['short']  = fuzz.trimf(extension.universe, [0, 0, 20])
-    extension['medium'] = fuzz.trimf(extension.universe, [15, 30, 45])
-    extension['long']   = fuzz.trimf(extension.universe, [35, 60, 60])
-    
+    for name, abc in QUEUE_TERMS.items():
+        queue[name] = fuzz.trimf(queue.universe, abc)
+    for name, abc in ARRIVAL_TERMS.items():
+        arrival[name] = fuzz.trimf(arrival.universe, abc)
+    for name, abc in EXTENSION_TERMS.items():
+        extension[name] = fuzz.trimf(extension.universe, abc)
+
     # 4. RULES
     rules = [
-        ctrl.Rule(queue['short'] & arrival['low'], extension['short']),
-        ctrl.Rule(queue['short'] & arrival['medium'], extension['short']),
-        ctrl.Rule(queue['short'] & arrival['high'], extension['medium']),
-        
-        ctrl.Rule(queue['medium'] & arrival['low'], extension['medium']),
-        ctrl.Rule(queue['medium'] & arrival['medium'], extension['medium']),
-        ctrl.Rule(queue['medium'] & arrival['high'], extension['medium']),
-        
-        ctrl.Rule(queue['long'] & arrival['low'], extension['medium']),
-        ctrl.Rule(queue['long'] & arrival['medium'], extension['long']),
-        ctrl.Rule(queue['long'] & arrival['high'], extension['long']),
+        ctrl.Rule(queue[q] & arrival[a], extension[e]) for q, a, e in RULES
     ]
 
     # 5. CONTROL SYSTEM
@@ -45,24 +58,39 @@ def create_fuzzy_system():
     traffic_sim = ctrl.ControlSystemSimulation(traffic_ctrl)
     return traffic_sim
 
-# --- BAGIAN 2: JEMBATAN KE SIMULATION.PY ---
-_FUZZY_SYSTEM = None
+# --- BAGIAN 2: INFERENSI ANALITIK (tanpa sampling universe) ---
+_INPUT_TERMS = [list(QUEUE_TERMS.values()), list(ARRIVAL_TERMS.values())]
+_OUTPUT_TERMS = list(EXTENSION_TERMS.values())
+_RULE_INDEX = [
+    ((list(QUEUE_TERMS).index(q), list(ARRIVAL_TERMS).index(a)), list(EXTENSION_TERMS).index(e))
+    for q, a, e in RULES
+]
+
+def fuzzy_extension(queue_inputs, arrival_inputs) -> np.ndarray:
+    """
+    Output crisp sistem fuzzy (centroid eksak) untuk input yang sudah dalam
+    skala universe (queue 0-80, arrival 0-10). Tervektorisasi; NaN jika
+    tidak ada rule yang aktif.
+    """
+    queue_inputs = np.atleast_1d(np.asarray(queue_inputs, dtype=float))
+    arrival_inputs = np.broadcast_to(np.asarray(arrival_inputs, dtype=float), queue_inputs.shape)
+    strengths = rule_strengths([queue_inputs, arrival_inputs], _INPUT_TERMS, _RULE_INDEX,
+                               len(_OUTPUT_TERMS))
+    result, _ = centroid(strengths, _OUTPUT_TERMS, EXTENSION_UNIVERSE)
+    return result
+
+# --- BAGIAN 3: JEMBATAN KE SIMULATION.PY ---
+def get_green_durations(queues, arrival_rates) -> np.ndarray:
+    """
+    Versi batch dari get_green_duration untuk banyak persimpangan sekaligus.
+    Biaya per keputusan tidak bergantung pada resolusi universe.
+    """
+    queues = np.atleast_1d(np.asarray(queues, dtype=float))
+    arrival_rates = np.broadcast_to(np.asarray(arrival_rates, dtype=float), queues.shape)
+    safe_queue = np.minimum(queues, QUEUE_UNIVERSE[1])
+    safe_arrival = np.minimum(arrival_rates * 10, ARRIVAL_UNIVERSE[1])
+    duration = fuzzy_extension(safe_queue, safe_arrival)
+    return np.where(np.isnan(duration), FALLBACK_DURATION, duration).astype(int)
 
 def get_green_duration(current_queue: int, arrival_rate: float) -> int:
-    global _FUZZY_SYSTEM
-    if _FUZZY_SYSTEM is None:
-        _FUZZY_SYSTEM = create_fuzzy_system()
-    
-    safe_queue = min(current_queue, 80)
-    safe_arrival = min(arrival_rate * 10, 10) 
-    
-    _FUZZY_SYSTEM.input['queue'] = safe_queue
-    _FUZZY_SYSTEM.input['arrival'] = safe_arrival
-    
-    try:
-        _FUZZY_SYSTEM.compute()
-        duration = _FUZZY_SYSTEM.output['extension']
-    except:
-        duration = 15
-        
-    return int(duration)
\ No newline at end of file
+    return int(get_green_durations(current_queue, arrival_rate)[0])
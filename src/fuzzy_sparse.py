@@ -0,0 +1,194 @@
+"""
+Controller Mamdani multi-input dengan aktivasi rule yang sparse.
+
+Dengan k input dan t term per input, grid rule penuh berisi t^k rule dan
+rule_strengths (fuzzy_analytic) mengevaluasi semuanya. Jika term setiap
+input hanya bertumpang tindih berpasangan (term ke-j dan ke-j+2 tidak
+pernah aktif bersamaan, seperti partisi trimf di fuzzy_module), satu nilai
+crisp mengaktifkan paling banyak dua term per input. Rule yang antecedent-nya
+tidak nol cukup dicari di 2^k kombinasi term aktif itu, lewat lookup terurut
+(indeks linear sel antecedent -> term output, hanya untuk rule yang ada).
+Biaya inferensi per sampel O(2^k (k + log R)) untuk R rule ditambah centroid
+eksak, dan memori lookup sebanding R, bukan ukuran grid t^k.
+"""
+from itertools import product
+
+import numpy as np
+
+from src.fuzzy_analytic import centroid, trimf
+from src.fuzzy_module import (ARRIVAL_TERMS, ARRIVAL_UNIVERSE, EXTENSION_TERMS,
+                              EXTENSION_UNIVERSE, FALLBACK_DURATION, QUEUE_TERMS,
+                              QUEUE_UNIVERSE, RULES)
+
+
+class SparseRuleBase:
+    """
+    Basis rule Mamdani (AND = min, agregasi = max, centroid eksak).
+
+    Args:
+        input_terms: list (per input) dict nama term -> parameter trimf [a, b, c].
+        output_terms: dict nama term output -> parameter trimf.
+        universe: (lo, hi) universe output.
+        rules: list tuple (term input 1, ..., term input k, term output).
+            Kombinasi antecedent yang tidak punya rule tidak aktif.
+
+    Raises ValueError jika satu input punya tiga term yang bisa aktif
+    bersamaan, atau dua rule punya antecedent sama dengan output berbeda.
+    """
+
+    def __init__(self, input_terms, output_terms, universe, rules):
+        self.input_terms = [dict(terms) for terms in input_terms]
+        self.output_terms = dict(output_terms)
+        self.universe = tuple(universe)
+        self.rules = [tuple(rule) for rule in rules]
+
+        # Term diurutkan menurut puncak supaya pasangan aktif selalu (j, j + 1)
+        self._names = [sorted(terms, key=lambda name: terms[name][1]) for terms in self.input_terms]
+        self._params = [np.array([terms[name] for name in names], dtype=float)
+                        for terms, names in zip(self.input_terms, self._names)]
+        for params in self._params:
+            # Term ke-j tidak boleh mulai sebelum support term mana pun di indeks <= j-2 berakhir
+            reach = np.maximum.accumulate(params[:, 2])
+            if np.any(params[2:, 0] < reach[:-2]):
+                raise ValueError("More than two terms of an input overlap.")
+        outputs = list(self.output_terms)
+        self._output_params = [self.output_terms[name] for name in outputs]
+
+        # Lookup rule sparse: indeks linear sel antecedent terurut -> term output.
+        # Memori sebanding jumlah rule, bukan ukuran grid t^k.
+        strides = [1]
+        for names in reversed(self._names[1:]):
+            strides.insert(0, strides[0] * len(names))
+        if strides[0] * len(self._names[0]) > np.iinfo(np.int64).max:
+            raise ValueError("Rule grid too large to index.")
+        self._strides = np.array(strides, dtype=np.int64)
+        table = {}
+        for rule in self.rules:
+            *antecedent, consequent = rule
+            key = sum(names.index(term) * stride
+                      for names, term, stride in zip(self._names, antecedent, strides))
+            out = outputs.index(consequent)
+            if table.setdefault(key, out) != out:
+                raise ValueError(f"Conflicting rules for antecedent {tuple(antecedent)}.")
+        self._keys = np.array(sorted(table), dtype=np.int64)
+        self._outputs = np.array([table[key] for key in sorted(table)], dtype=np.int64)
+        # Sudut hypercube term aktif: 0 = term bawah, 1 = term atas per input
+        self._corners = np.array(list(product((0, 1), repeat=len(self._names))), dtype=np.int64)
+
+    def active_terms(self, inputs):
+        """
+        Dua term kandidat per input: indeks (n, k, 2) dan membership (n, k, 2).
+        Term di luar support mendapat membership 0.
+        """
+        index, member = [], []
+        for x, params in zip(inputs, self._params):
+            mu = np.stack([trimf(x, abc) for abc in params], axis=-1)  # (n, t)
+            lower = np.argmax(mu > 0, axis=-1)
+            pair = np.stack([lower, np.minimum(lower + 1, len(params) - 1)], axis=-1)
+            index.append(pair)
+            member.append(np.take_along_axis(mu, pair, axis=-1))
+        return np.stack(index, axis=1), np.stack(member, axis=1)
+
+    def strengths(self, inputs) -> np.ndarray:
+        """Derajat aktivasi tiap term output (n, n_outputs), sama dengan rule_strengths."""
+        inputs = [np.atleast_1d(np.asarray(x, dtype=float)) for x in inputs]
+        n = len(inputs[0])
+        index, member = self.active_terms(inputs)
+        k = len(inputs)
+        cells = index[:, np.arange(k), self._corners]    # (n, 2^k, k)
+        fire = member[:, np.arange(k), self._corners].min(axis=-1)
+        out = self._lookup(cells @ self._strides)            # (n, 2^k)
+        active = (out >= 0) & (fire > 0)
+        rows = np.broadcast_to(np.arange(n)[:, None], out.shape)
+        strengths = np.zeros((n, len(self._output_params)))
+        np.maximum.at(strengths, (rows[active], out[active]), fire[active])
+        return strengths
+
+    def _lookup(self, keys):
+        """Indeks term output per sel (indeks linear); -1 jika sel tidak punya rule."""
+        if len(self._keys) == 0:
+            return np.full(keys.shape, -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[pos] == keys, self._outputs[pos], -1)
+
+    def evaluate(self, inputs) -> np.ndarray:
+        """Output crisp (n,) untuk input dalam skala universe; NaN jika tidak ada rule aktif."""
+        result, _ = centroid(self.strengths(inputs), self._output_params, self.universe)
+        return result
+
+
+def _phase_queue(batch):
+    return batch.phase_values(batch.queues)
+
+
+def _phase_arrival(batch):
+    return batch.phase_values(batch.arrival_rates) * 10
+
+
+def _cross_queue(batch):
+    # Antrian terpanjang di arah yang tetap merah
+    queues = np.array(batch.queues, dtype=float)
+    queues[np.arange(len(batch.phase)), batch.phase] = -np.inf
+    return queues.max(axis=1)
+
+
+def _total_queue(batch):
+    return np.asarray(batch.queues).sum(axis=1)
+
+
+# Fitur input dari PhaseBatch (skala universe; arrival = laju x 10 seperti fuzzy_module)
+FEATURES = {
+    "queue": _phase_queue,
+    "arrival": _phase_arrival,
+    "cross_queue": _cross_queue,
+    "total_queue": _total_queue,
+}
+
+# Input default: (fitur, term, universe)
+MULTI_INPUTS = [
+    ("queue", QUEUE_TERMS, QUEUE_UNIVERSE),
+    ("arrival", ARRIVAL_TERMS, ARRIVAL_UNIVERSE),
+    ("cross_queue", QUEUE_TERMS, QUEUE_UNIVERSE),
+]
+
+_SHORTER = {"long": "medium", "medium": "short", "short": "short"}
+
+# Rule fuzzy_module, dipersingkat satu tingkat jika antrian arah lain panjang
+MULTI_RULES = [
+    (q, a, c, _SHORTER[e] if c == "long" else e)
+    for q, a, e in RULES for c in QUEUE_TERMS
+]
+
+
+class SparseFuzzyController:
+    """
+    Controller fuzzy multi-input dengan evaluasi rule sparse.
+
+    Args:
+        inputs: list (nama fitur di FEATURES, term, universe).
+        rules: list tuple term per input + term output.
+        output_terms, universe: term dan universe durasi hijau.
+        min_green: clamp durasi minimum.
+    """
+
+    def __init__(self, inputs=None, rules=None, output_terms=None, universe=EXTENSION_UNIVERSE,
+                 min_green: int = 5):
+        self.inputs = MULTI_INPUTS if inputs is None else inputs
+        self.rules = MULTI_RULES if rules is None else rules
+        self.output_terms = EXTENSION_TERMS if output_terms is None else output_terms
+        self.universe = universe
+        for feature, _, _ in self.inputs:
+            if feature not in FEATURES:
+                raise ValueError(f"Unknown feature: {feature}. Available: {sorted(FEATURES)}")
+        self.features = [feature for feature, _, _ in self.inputs]
+        self.limits = [input_universe for _, _, input_universe in self.inputs]
+        self.rule_base = SparseRuleBase([terms for _, terms, _ in self.inputs], self.output_terms,
+                                        universe, self.rules)
+        self.min_green = min_green
+
+    def decide(self, batch):
+        inputs = [np.clip(np.asarray(FEATURES[feature](batch), dtype=float), lo, hi)
+                  for feature, (lo, hi) in zip(self.features, self.limits)]
+        duration = self.rule_base.evaluate(inputs)
+        durations = np.where(np.isnan(duration), FALLBACK_DURATION, duration).astype(np.int64)
+        return np.maximum(durations, self.min_green)
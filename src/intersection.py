@@ -1,53 +1,131 @@
+from array import array
+
+DIRECTIONS = ['N', 'S', 'E', 'W']
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+
 class Intersection:
+    """
+    Compact 4-way intersection state.
+
+    Directions and phases are integer-coded (index into DIRECTIONS) and the
+    queue lengths live in a fixed array, so the hot-path methods (add_counts,
+    step_into, advance) allocate nothing per tick. The string-keyed API
+    (queues, current_phase, add_cars, step) is kept for existing callers.
+    """
+
+    __slots__ = ('counts', 'green_timer', 'phase')
+
     def __init__(self):
         """
         Initialize the Intersection with 4 queues (N, S, E, W) and default state.
         """
-        self.queues: dict[str, int] = {'N': 0, 'S': 0, 'E': 0, 'W': 0}
+        self.counts = array('q', [0, 0, 0, 0])  # Queue length per direction code
         self.green_timer: int = 0
-        self.current_phase: str = 'N'  # Default start phase
+        self.phase: int = 0  # Default start phase 'N'
+
+    # --- STRING-KEYED VIEW (compatibility) ---
+
+    @property
+    def queues(self) -> dict[str, int]:
+        """Snapshot of the queue lengths keyed by direction letter."""
+        c = self.counts
+        return {'N': c[0], 'S': c[1], 'E': c[2], 'W': c[3]}
+
+    @queues.setter
+    def queues(self, values: dict[str, int]):
+        for d, i in DIRECTION_INDEX.items():
+            self.counts[i] = values[d]
+
+    @property
+    def current_phase(self) -> str:
+        return DIRECTIONS[self.phase]
 
     def add_cars(self, direction: str, count: int):
         """Add cars to a specific queue."""
         if count < 0:
             raise ValueError("Cannot add negative cars.")
-        if direction not in self.queues:
+        if direction not in DIRECTION_INDEX:
             raise ValueError(f"Invalid direction: {direction}")
-            
-        self.queues[direction] += count
 
-    def set_green_light(self, duration: int, phase: str):
+        self.counts[DIRECTION_INDEX[direction]] += count
+
+    def add_counts(self, counts):
+        """Add one tick of arrivals for all directions (sequence in DIRECTIONS order)."""
+        c = self.counts
+        c[0] += counts[0]
+        c[1] += counts[1]
+        c[2] += counts[2]
+        c[3] += counts[3]
+
+    def set_green_light(self, duration: int, phase):
         """
         Set the traffic light to green for a specific phase.
-        Phase order typically: N -> S -> E -> W
+        Phase is a direction letter ('N', 'S', 'E', 'W') or its integer code.
         """
-        valid_phases = ['N', 'S', 'E', 'W']
-        if phase not in valid_phases:
-            raise ValueError(f"Invalid phase. Must be one of {valid_phases}")
-            
-        self.current_phase = phase
+        if isinstance(phase, str):
+            if phase not in DIRECTION_INDEX:
+                raise ValueError(f"Invalid phase. Must be one of {DIRECTIONS}")
+            phase = DIRECTION_INDEX[phase]
+        elif not 0 <= phase < 4:
+            raise ValueError(f"Invalid phase code: {phase}")
+
+        self.phase = phase
         self.green_timer = duration
 
+    def step_into(self, departures, departure_rate: int = 1) -> int:
+        """
+        Advance the simulation by one time step without allocating.
+        Writes departed cars per direction into the caller's `departures`
+        buffer (length 4) and returns the total number departed.
+        """
+        departures[0] = departures[1] = departures[2] = departures[3] = 0
+        if self.green_timer <= 0:
+            return 0
+
+        # Only the direction matching the current phase gets to go
+        active = self.phase
+        count = self.counts[active]
+        if count > departure_rate:
+            count = departure_rate
+        self.counts[active] -= count
+        departures[active] = count
+        self.green_timer -= 1
+        return count
+
+    def advance(self, k: int, departures, departure_rate: int = 1) -> int:
+        """
+        Advance up to k time steps at once, assuming no arrivals in between.
+
+        Green-phase discharge is computed in closed form: the active queue
+        drains at departure_rate per tick. The advance stops early at the
+        tick the green timer expires (after a single tick if it already
+        has), since the caller must switch phase there. Departed cars per
+        direction are written into `departures`; returns the number of
+        ticks advanced.
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative.")
+        departures[0] = departures[1] = departures[2] = departures[3] = 0
+        if k == 0:
+            return 0
+        if self.green_timer <= 0:
+            return 1  # Same as step_into: a red tick with no discharge
+
+        ticks = k if k < self.green_timer else self.green_timer
+        active = self.phase
+        count = min(self.counts[active], ticks * departure_rate)
+        self.counts[active] -= count
+        departures[active] = count
+        self.green_timer -= ticks
+        return ticks
+
     def step(self, departure_rate: int = 1) -> dict[str, int]:
         """
         Advance the simulation by one time step.
         Returns a dictionary of departed cars count per direction.
         e.g., {'N': 1, 'S': 0, ...}
         """
-        departed_counts = {'N': 0, 'S': 0, 'E': 0, 'W': 0}
-        
-        # Determine active queues based on 4-Phase System
-        # Only the direction matching the current_phase gets to go
-        if self.green_timer > 0:
-            active_dir = self.current_phase  # 'N', 'S', 'E', or 'W'
-            
-            # Logic: Departure
-            if self.queues[active_dir] > 0:
-                count = min(self.queues[active_dir], departure_rate)
-                self.queues[active_dir] -= count
-                departed_counts[active_dir] = count
-                
-            # Decrease Timer
-            self.green_timer -= 1
-            
-        return departed_counts
\ No newline at end of file
+        departures = [0, 0, 0, 0]
+        self.step_into(departures, departure_rate)
+        return dict(zip(DIRECTIONS, departures))
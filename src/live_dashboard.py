@@ -0,0 +1,154 @@
+import sys
+import time
+from collections import deque
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from src.simulation import DIRECTIONS, stream_simulation
+
+COLOR_MAP = {'N': 'blue', 'S': 'red', 'E': 'green', 'W': 'orange'}
+
+
+class LiveDashboard:
+    """
+    Dashboard matplotlib real-time untuk digest dari stream_simulation.
+
+    Menggunakan blitting (hanya artist yang berubah yang digambar ulang) dan
+    membatasi redraw ke max_fps, berapapun kecepatan simulasinya.
+    """
+
+    def __init__(self, max_fps: float = 20, history: int = 600):
+        self.min_interval = 1.0 / max_fps
+        self.last_draw = 0.0
+        self.closed = False
+        self.t_hist = deque(maxlen=history)
+        self.p50_hist = deque(maxlen=history)
+        self.p95_hist = deque(maxlen=history)
+
+        self.fig, (self.ax_q, self.ax_w) = plt.subplots(1, 2, figsize=(12, 5))
+        self.fig.suptitle('Live Simulation Dashboard')
+        self.fig.canvas.mpl_connect('close_event', self._on_close)
+
+        # --- Queue per arah (bar) ---
+        self.bars = self.ax_q.bar(DIRECTIONS, [0] * 4, color=[COLOR_MAP[d] for d in DIRECTIONS],
+                                  alpha=0.7, animated=True)
+        self.ax_q.set_ylim(0, 10)
+        self.ax_q.set_ylabel('Panjang Antrian')
+        self.ax_q.grid(axis='y', linestyle='--', alpha=0.5)
+        self.status_text = self.ax_q.text(0.02, 0.95, '', transform=self.ax_q.transAxes,
+                                          va='top', fontsize=11, animated=True)
+
+        # --- Persentil waktu tunggu (rolling) ---
+        self.line_p50, = self.ax_w.plot([], [], label='p50', color='green', animated=True)
+        self.line_p95, = self.ax_w.plot([], [], label='p95', color='red', animated=True)
+        self.ax_w.set_xlim(0, 60)
+        self.ax_w.set_ylim(0, 10)
+        self.ax_w.set_xlabel('Waktu Simulasi (detik)')
+        self.ax_w.set_ylabel('Waktu Tunggu (detik)')
+        self.ax_w.legend(loc='upper left')
+        self.ax_w.grid(True, linestyle='--', alpha=0.5)
+
+        self.animated = [*self.bars, self.status_text, self.line_p50, self.line_p95]
+        self._capture_background()
+
+    def _on_close(self, event):
+        self.closed = True
+
+    def _capture_background(self):
+        """Full draw sekali, lalu simpan background statis untuk blitting."""
+        self.fig.canvas.draw()
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    def _rescale_if_needed(self, queues, t, wait_max):
+        """Perbesar batas sumbu jika data keluar frame (butuh full redraw)."""
+        rescaled = False
+        if max(queues) > self.ax_q.get_ylim()[1]:
+            self.ax_q.set_ylim(0, max(queues) * 1.5)
+            rescaled = True
+        if t > self.ax_w.get_xlim()[1]:
+            self.ax_w.set_xlim(0, t * 1.5)
+            rescaled = True
+        if wait_max > self.ax_w.get_ylim()[1]:
+            self.ax_w.set_ylim(0, wait_max * 1.5)
+            rescaled = True
+        if rescaled:
+            self._capture_background()
+
+    def update(self, digest: dict, force: bool = False) -> bool:
+        """
+        Catat digest dan gambar ulang jika interval frame sudah lewat.
+        Returns True jika dashboard benar-benar digambar ulang.
+        """
+        self.t_hist.append(digest['t'])
+        self.p50_hist.append(digest['wait_p50'])
+        self.p95_hist.append(digest['wait_p95'])
+
+        now = time.monotonic()
+        if not force and now - self.last_draw < self.min_interval:
+            return False
+        self.last_draw = now
+
+        queues = [digest['queues'][d] for d in DIRECTIONS]
+        self._rescale_if_needed(queues, digest['t'], max(self.p95_hist))
+
+        for bar, d, q in zip(self.bars, DIRECTIONS, queues):
+            bar.set_height(q)
+            bar.set_alpha(1.0 if d == digest['current_phase'] else 0.4)
+        self.status_text.set_text(
+            f"t={digest['t']}  Fase: {digest['current_phase']}  Timer: {digest['green_timer']}\n"
+            f"Served: {digest['served']}  Spawned: {digest['spawned']}"
+        )
+        t_arr = np.fromiter(self.t_hist, dtype=float)
+        self.line_p50.set_data(t_arr, np.fromiter(self.p50_hist, dtype=float))
+        self.line_p95.set_data(t_arr, np.fromiter(self.p95_hist, dtype=float))
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        for artist in self.animated:
+            artist.axes.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        return True
+
+    def close(self):
+        plt.close(self.fig)
+
+
+def watch(stream, max_fps: float = 20, abort_if=None, dashboard=None):
+    """
+    Konsumsi stream digest ke dashboard live.
+
+    abort_if: callable(digest) -> bool; jika True (atau jendela ditutup),
+    stream dihentikan lebih awal dan run simulasi dibatalkan.
+    Returns digest terakhir yang diterima.
+    """
+    if dashboard is None:
+        dashboard = LiveDashboard(max_fps=max_fps)
+    last = None
+    try:
+        for digest in stream:
+            last = digest
+            dashboard.update(digest)
+            if dashboard.closed or (abort_if is not None and abort_if(digest)):
+                break
+        if last is not None and not dashboard.closed:
+            dashboard.update(last, force=True)
+    finally:
+        stream.close()
+    return last
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "FUZZY"
+    duration = int(sys.argv[2]) if len(sys.argv) > 2 else 3600
+
+    plt.ion()
+    # Batalkan run jika antrian total meledak (konfigurasi jelas buruk)
+    last = watch(
+        stream_simulation(mode=mode, duration=duration, digest_every=1),
+        abort_if=lambda d: sum(d['queues'].values()) > 500,
+    )
+    print(f"Selesai di t={last['t']}, served={last['served']}, p95 wait={last['wait_p95']:.1f}s")
+    plt.ioff()
+    plt.show()
@@ -1,22 +1,26 @@
-import json
 import matplotlib.pyplot as plt
 import numpy as np
+from array import array
+from src.downsample import downsample, minmax_indices
+from src.trace_io import TraceReader
 
-def load_data(filename):
-    """Membaca file JSON hasil simulasi"""
+def load_data(filename, start=None, stop=None):
+    """
+    Membuka file hasil simulasi (JSON atau JSONL) sebagai TraceReader.
+    Frame dibaca secara streaming saat diiterasi; start/stop membatasi
+    jendela waktu (pembacaan berhenti setelah stop).
+    """
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
-        return data
+        return TraceReader(filename, start=start, stop=stop)
     except FileNotFoundError:
         print(f"❌ Error: File '{filename}' tidak ditemukan.")
         print("   Pastikan Anda sudah menjalankan 'python -m src.simulation' dulu!")
         return None
 
 def calculate_total_queue(frames):
-    """Menghitung total antrian (N+S+E+W) di setiap detik"""
-    total_queues = []
-    timestamps = []
+    """Menghitung total antrian (N+S+E+W) di setiap detik, sebagai array NumPy"""
+    total_queues = array('q')
+    timestamps = array('q')
     
     for frame in frames:
         t = frame['t']
@@ -26,24 +30,36 @@ def calculate_total_queue(frames):
         timestamps.append(t)
         total_queues.append(total)
         
-    return timestamps, total_queues
+    return np.asarray(timestamps), np.asarray(total_queues)
+
+def average_wait(reader):
+    """Rata-rata waktu tunggu dari metadata (JSON) atau summary (JSONL)"""
+    if 'avg_wait_time' in reader.metadata:
+        return reader.metadata['avg_wait_time']
+    return (reader.summary or {}).get('avg_wait', 0)
 
 def plot_comparison(fixed_data, fuzzy_data):
     """Membuat grafik perbandingan"""
     
-    # 1. Siapkan Data Antrian
-    t_fixed, q_fixed = calculate_total_queue(fixed_data['frames'])
-    t_fuzzy, q_fuzzy = calculate_total_queue(fuzzy_data['frames'])
+    # 1. Siapkan Data Antrian (streaming, satu lintasan per file)
+    t_fixed, q_fixed = calculate_total_queue(fixed_data)
+    t_fuzzy, q_fuzzy = calculate_total_queue(fuzzy_data)
     
-    # 2. Siapkan Data Waktu Tunggu (dari Metadata)
-    wait_fixed = fixed_data['metadata']['avg_wait_time']
-    wait_fuzzy = fuzzy_data['metadata']['avg_wait_time']
+    # 2. Siapkan Data Waktu Tunggu (dari Metadata / Summary)
+    wait_fixed = average_wait(fixed_data)
+    wait_fuzzy = average_wait(fuzzy_data)
     
     # --- SETUP PLOT (2 Subplots) ---
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
     fig.suptitle('Perbandingan Kinerja: Fixed Timer vs Fuzzy Logic', fontsize=16)
     
     # --- GRAPH 1: QUEUE LENGTH VS TIME (Line Chart) ---
+    # Area efisiensi butuh kedua deret pada titik waktu yang sama
+    n = min(len(q_fixed), len(q_fuzzy))
+    t_fill, fill_fixed, fill_fuzzy = t_fixed[:n], q_fixed[:n], q_fuzzy[:n]
+    # Trace panjang: min/max per bucket ~ piksel, bentuk garis tetap utuh
+    t_fixed, q_fixed = downsample(t_fixed, q_fixed)
+    t_fuzzy, q_fuzzy = downsample(t_fuzzy, q_fuzzy)
     ax1.plot(t_fixed, q_fixed, label='Fixed Timer (30s)', color='blue', alpha=0.7, linewidth=2)
     ax1.plot(t_fuzzy, q_fuzzy, label='Fuzzy Adaptive', color='red', alpha=0.8, linewidth=2)
     
@@ -54,8 +70,12 @@ def plot_comparison(fixed_data, fuzzy_data):
     ax1.grid(True, linestyle='--', alpha=0.5)
     
     # Highlight area dimana Fuzzy lebih baik
-    ax1.fill_between(t_fixed, q_fixed, q_fuzzy, where=(np.array(q_fixed) > np.array(q_fuzzy)), 
-                     interpolate=True, color='green', alpha=0.1, label='Efisiensi Fuzzy')
+    # (titik min/max kedua deret dan selisihnya, supaya tepi dan puncak area tetap ada)
+    keep = np.union1d(minmax_indices(fill_fixed - fill_fuzzy),
+                      np.union1d(minmax_indices(fill_fixed), minmax_indices(fill_fuzzy)))
+    ax1.fill_between(t_fill[keep], fill_fixed[keep], fill_fuzzy[keep],
+                     where=(fill_fixed[keep] > fill_fuzzy[keep]), interpolate=True,
+                     color='green', alpha=0.1, label='Efisiensi Fuzzy')
 
     # --- GRAPH 2: AVERAGE WAIT TIME (Bar Chart) ---
     labels = ['Fixed Timer', 'Fuzzy Logic']
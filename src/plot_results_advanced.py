@@ -1,71 +1,101 @@
-import json
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
+from array import array
+from src.downsample import downsample
+from src.trace_io import TraceReader
 
 # --- 1. HELPER FUNCTIONS (LOAD & EXTRACT DATA) ---
 
-def load_data(filename):
-    try:
-        with open(filename, 'r') as f: return json.load(f)
-    except: return None
+def load_data(filename, start=None, stop=None):
+    """Buka trace (JSON/JSONL) untuk dibaca streaming; start/stop = jendela waktu."""
+    try: return TraceReader(filename, start=start, stop=stop)
+    except (OSError, ValueError): return None
 
-def extract_phase_history(data):
+def _frames(data):
+    """Frame dari dict hasil json.load atau dari TraceReader (streaming)."""
+    return data['frames'] if isinstance(data, dict) else data
+
+class PhaseHistory:
     """
     Mengekstrak urutan pergantian lampu untuk Timeline & Histogram.
-    Returns: list of dict {'start_time': t, 'phase': 'N', 'duration': 30}
+    history: list of dict {'start_time': t, 'phase': 'N', 'duration': 30}
     """
-    history = []
-    prev_phase = None
-    
-    for frame in data['frames']:
-        t = frame['t']
+    def __init__(self):
+        self.history = []
+        self.prev_phase = None
+
+    def feed(self, frame):
         state = frame['traffic_state']
         curr_phase = state['current_phase']
-        timer = state['green_timer']
-        
         # Deteksi perubahan fase
-        if curr_phase != prev_phase:
-            history.append({
-                'start_time': t,
+        if curr_phase != self.prev_phase:
+            self.history.append({
+                'start_time': frame['t'],
                 'phase': curr_phase,
-                'duration': timer
+                'duration': state['green_timer']
             })
-            prev_phase = curr_phase
-    return history
+            self.prev_phase = curr_phase
 
-def get_wait_times(data):
-    """Menghitung waktu tunggu individu setiap mobil untuk Boxplot"""
-    spawn_times = {}
-    wait_times = []
-    
-    for frame in data['frames']:
+class WaitTimes:
+    """Waktu tunggu individu setiap mobil untuk Boxplot"""
+    def __init__(self):
+        self.spawn_times = {}  # Hanya mobil yang masih antre
+        self.wait_times = array('q')
+
+    def feed(self, frame):
         t = frame['t']
         # Catat spawn time
         for event in frame['car_events']:
             if event['event'] == 'spawn':
-                spawn_times[event['car_id']] = t
+                self.spawn_times[event['car_id']] = t
         # Hitung wait time saat departure
         for dep in frame['departures']:
-            cid = dep['car_id']
-            if cid in spawn_times:
-                wait_times.append(t - spawn_times[cid])
-    return wait_times
+            spawn = self.spawn_times.pop(dep['car_id'], None)
+            if spawn is not None:
+                self.wait_times.append(t - spawn)
+
+class QueueSeries:
+    """Panjang antrian per arah per detik untuk grafik dinamika antrian"""
+    def __init__(self):
+        self.t = array('q')
+        self.queues = {d: array('q') for d in 'NSEW'}
+
+    def feed(self, frame):
+        self.t.append(frame['t'])
+        q = frame['traffic_state']['queues']
+        for d, series in self.queues.items():
+            series.append(q[d])
+
+def scan(data, *extractors):
+    """Satu lintasan frame, setiap frame diumpankan ke semua extractor."""
+    for frame in _frames(data):
+        for extractor in extractors:
+            extractor.feed(frame)
+    return extractors
+
+def extract_phase_history(data):
+    return scan(data, PhaseHistory())[0].history
+
+def get_wait_times(data):
+    return list(scan(data, WaitTimes())[0].wait_times)
 
 # --- 2. PLOTTING FUNCTIONS ---
 
 def plot_all_analysis(fixed_data, fuzzy_data):
     print("🚀 Sedang men-generate 4 Grafik Analisis...")
 
-    # Siapkan Data
-    hist_fixed = extract_phase_history(fixed_data)
-    hist_fuzzy = extract_phase_history(fuzzy_data)
+    # Siapkan Data (satu lintasan streaming per file)
+    phases_fixed, waits_fixed = scan(fixed_data, PhaseHistory(), WaitTimes())
+    phases_fuzzy, waits_fuzzy, queues_fuzzy = scan(fuzzy_data, PhaseHistory(), WaitTimes(),
+                                                   QueueSeries())
+    hist_fixed, hist_fuzzy = phases_fixed.history, phases_fuzzy.history
     
     durations_fixed = [h['duration'] for h in hist_fixed]
     durations_fuzzy = [h['duration'] for h in hist_fuzzy]
     
-    waits_fixed = get_wait_times(fixed_data)
-    waits_fuzzy = get_wait_times(fuzzy_data)
+    waits_fixed = np.asarray(waits_fixed.wait_times)
+    waits_fuzzy = np.asarray(waits_fuzzy.wait_times)
     
     # Warna Konsisten untuk Arah
     color_map = {'N': 'blue', 'S': 'red', 'E': 'green', 'W': 'orange'}
@@ -136,18 +166,13 @@ def plot_all_analysis(fixed_data, fuzzy_data):
     # ==========================================
     # GRAFIK 4: QUEUE DYNAMICS (Load Balancing)
     # ==========================================
-    frames = fuzzy_data['frames']
-    t = [f['t'] for f in frames]
-    q_n = [f['traffic_state']['queues']['N'] for f in frames]
-    q_s = [f['traffic_state']['queues']['S'] for f in frames]
-    q_e = [f['traffic_state']['queues']['E'] for f in frames]
-    q_w = [f['traffic_state']['queues']['W'] for f in frames]
+    t = np.asarray(queues_fuzzy.t)
 
     plt.figure(figsize=(12, 6))
-    plt.plot(t, q_n, label='North', color='blue', alpha=0.7)
-    plt.plot(t, q_s, label='South', color='red', alpha=0.7)
-    plt.plot(t, q_e, label='East', color='green', alpha=0.7)
-    plt.plot(t, q_w, label='West', color='orange', alpha=0.7)
+    for d, label in zip('NSEW', ['North', 'South', 'East', 'West']):
+        # Min/max per bucket: trace panjang tetap ringan tanpa kehilangan puncak
+        t_d, q_d = downsample(t, np.asarray(queues_fuzzy.queues[d]))
+        plt.plot(t_d, q_d, label=label, color=color_map[d], alpha=0.7)
     plt.title('Dinamika Antrian per Arah (Mode Fuzzy)')
     plt.xlabel('Waktu (detik)')
     plt.ylabel('Panjang Antrian')
@@ -156,6 +181,39 @@ def plot_all_analysis(fixed_data, fuzzy_data):
     plt.savefig('docs/analysis_4_queues.png', dpi=300)
     print("✅ [4/4] Saved: analysis_4_queues.png")
 
+def plot_store_comparison(store, kpi="avg_wait", x=None, output='docs/analysis_store.png', **filters):
+    """
+    Grafik KPI dari ResultsStore (query agregat ber-index, tanpa membaca trace).
+    Tanpa x: bar per mode (mean ± CI95). Dengan x (mis. "arrival_rate" atau
+    "fixed_duration"): satu garis per mode sepanjang x.
+    filters: filter kolom skenario untuk ResultsStore.aggregate.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    if x is None:
+        rows = store.aggregate(kpi, by=("mode",), **filters)
+        ax.bar([r["mode"] for r in rows], [r["mean"] for r in rows],
+               yerr=[r["ci95"] for r in rows], capsize=6, color='#4C72B0', alpha=0.8)
+        for i, r in enumerate(rows):
+            ax.text(i, r["mean"], f"n={r['n']}", ha='center', va='bottom')
+    else:
+        rows = store.aggregate(kpi, by=("mode", x), **filters)
+        for mode in dict.fromkeys(r["mode"] for r in rows):
+            group = [r for r in rows if r["mode"] == mode]
+            xs = np.array([r[x] for r in group], dtype=float)
+            mean = np.array([r["mean"] for r in group])
+            ci = np.array([r["ci95"] for r in group])
+            ax.plot(xs, mean, marker='o', label=mode)
+            ax.fill_between(xs, mean - ci, mean + ci, alpha=0.2)
+        ax.set_xlabel(x)
+        ax.legend()
+    ax.set_ylabel(kpi)
+    ax.set_title(f'{kpi} per Mode (Results Store)')
+    ax.grid(True, alpha=0.3)
+    plt.savefig(output, dpi=300)
+    plt.close(fig)
+    print(f"✅ Saved: {output}")
+    return rows
+
 if __name__ == "__main__":
     d_fixed = load_data('docs/simulation_data_fixed.json')
     d_fuzzy = load_data('docs/simulation_data_fuzzy.json')
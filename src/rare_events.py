@@ -0,0 +1,189 @@
+"""
+Estimasi peluang waktu tunggu ekstrem dengan importance sampling.
+
+Kejadian langka untuk satu run sepanjang `duration` detik:
+
+    A   = {ada mobil yang menunggu > threshold detik}
+    N_w = jumlah mobil tersebut
+
+Mobil yang masih antre di akhir run dihitung dengan wait tersensor
+(duration - spawn), yaitu wait minimum yang pasti dialaminya.
+
+Wait ekstrem muncul dari lonjakan lokal: satu arah menerima terlalu banyak
+mobil selama beberapa siklus. Menaikkan laju seluruh run hampir tidak
+membantu, jadi distribusi proposal adalah campuran tilt lokal: pilih arah
+d dan awal jendela tau secara seragam, lalu laju arah d selama `window`
+detik dikalikan `factor`. Likelihood ratio terhadap Poisson nominal dihitung
+persis atas seluruh campuran (jumlah jendela geser kedatangan):
+
+    1/L = mean_{tau,d} exp(S_{tau,d} log(factor) - window lambda_d (factor - 1))
+
+dengan S_{tau,d} jumlah kedatangan arah d di jendela tau. E_q[L X] = E[X]
+untuk X apa pun yang merupakan fungsi kedatangan, jadi estimator tidak
+bias. Controller menerima laju nominal (seperti rate_estimate=None), dan
+semua sampel dijalankan bersama sebagai BatchState dengan wait FIFO
+dihitung dari kumulatif kedatangan/keberangkatan.
+
+(window, factor) dipilih dari grid kecil dengan sampel pilot: kandidat
+dengan varians relatif estimator terkecil.
+"""
+import numpy as np
+from scipy.special import logsumexp
+
+from src.batch_sim import BatchState
+from src.controllers import make_controller
+from src.simulation import ARRIVAL_RATE, INITIAL_GREEN, SIMULATION_DURATION, _fifo_event_ticks
+from src.stats import mean_confidence_interval
+from src.surrogate import surrogate
+
+# Grid pilot: panjang jendela (x threshold) dan laju tilted (x kapasitas arah)
+WINDOW_MULTIPLIERS = (1.0, 1.5, 2.0)
+LOAD_MULTIPLIERS = (1.2, 1.4, 1.6)
+
+
+def simulate_departures(arrivals, controller, nominal) -> np.ndarray:
+    """Keberangkatan (T, n, 4) untuk batch kedatangan (T, n, 4) dari state awal Simulation."""
+    n_ticks, n = arrivals.shape[:2]
+    state = BatchState(np.zeros((n, 4)), INITIAL_GREEN, 0, nominal)
+    departures = np.zeros(arrivals.shape, dtype=np.int64)
+    rows = np.arange(n)
+    for t in range(n_ticks):
+        codes = state.phase_codes
+        departures[t, rows, codes] = state.step(arrivals[t], controller)
+    return departures
+
+
+def count_exceedances(arrivals, departures, threshold) -> np.ndarray:
+    """N_w per sampel (n,): mobil dengan wait (atau wait tersensor) > threshold."""
+    n_ticks, n = arrivals.shape[:2]
+    cum_arrivals = np.cumsum(arrivals, axis=0)
+    cum_departures = np.cumsum(departures, axis=0)
+    counts = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        for d in range(4):
+            arrived, served = int(cum_arrivals[-1, i, d]), int(cum_departures[-1, i, d])
+            spawn = _fifo_event_ticks(cum_arrivals[:, i, d], arrived)
+            waits = _fifo_event_ticks(cum_departures[:, i, d], served) - spawn[:served]
+            censored = n_ticks - spawn[served:]
+            counts[i] += np.count_nonzero(waits > threshold) + np.count_nonzero(censored > threshold)
+    return counts
+
+
+def tilted_arrivals(nominal, duration, n, window, factor, rng) -> np.ndarray:
+    """Sampel (T, n, 4) dari proposal campuran tilt lokal."""
+    nominal = np.asarray(nominal, dtype=float)
+    factor = np.asarray(factor, dtype=float)
+    start = rng.integers(0, duration - window + 1, size=n)
+    direction = rng.integers(0, 4, size=n)
+    ticks = np.arange(duration)[:, None]
+    inside = (ticks >= start) & (ticks < start + window)  # (T, n)
+    mask = inside[:, :, None] & (np.arange(4) == direction[:, None])[None]
+    return rng.poisson(np.where(mask, nominal * factor, nominal))
+
+
+def log_likelihood_ratio(arrivals, nominal, window, factor) -> np.ndarray:
+    """log L (n,) sampel (T, n, 4) terhadap Poisson nominal (lihat docstring modul)."""
+    nominal = np.asarray(nominal, dtype=float)
+    factor = np.broadcast_to(np.asarray(factor, dtype=float), (4,))
+    n = arrivals.shape[1]
+    cum = np.concatenate([np.zeros((1,) + arrivals.shape[1:]), np.cumsum(arrivals, axis=0)])
+    sums = cum[window:] - cum[:-window]  # (P, n, 4): jumlah per jendela geser
+    log_ratio = sums * np.log(factor) - window * nominal * (factor - 1)
+    log_ratio = log_ratio.transpose(1, 0, 2).reshape(n, -1)
+    return np.log(log_ratio.shape[1]) - logsumexp(log_ratio, axis=1)
+
+
+def importance_sample(controller, nominal, duration, threshold, window, factor, n_samples,
+                      rng, batch_size=256):
+    """Returns (bobot L (n,), N_w (n,)) dari n_samples run di bawah proposal."""
+    weights, exceed = [], []
+    for start in range(0, n_samples, batch_size):
+        n = min(batch_size, n_samples - start)
+        arrivals = tilted_arrivals(nominal, duration, n, window, factor, rng)
+        departures = simulate_departures(arrivals, controller, nominal)
+        weights.append(np.exp(log_likelihood_ratio(arrivals, nominal, window, factor)))
+        exceed.append(count_exceedances(arrivals, departures, threshold))
+    return np.concatenate(weights), np.concatenate(exceed)
+
+
+def tune_proposal(controller, nominal, duration, threshold, capacity, pilot_samples=200,
+                  rng=None, batch_size=256):
+    """
+    Pilih (window, factor) dari grid WINDOW_MULTIPLIERS x LOAD_MULTIPLIERS
+    dengan varians relatif terkecil pada sampel pilot. Jika tidak ada
+    kandidat yang mengenai kejadian, dipakai kandidat paling agresif.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    nominal = np.asarray(nominal, dtype=float)
+    best, best_score = None, np.inf
+    for w in WINDOW_MULTIPLIERS:
+        window = int(min(max(round(w * threshold), 1), duration))
+        for m in LOAD_MULTIPLIERS:
+            factor = np.maximum(m * np.asarray(capacity) / nominal, 1.0)
+            weights, exceed = importance_sample(controller, nominal, duration, threshold, window,
+                                                factor, pilot_samples, rng, batch_size)
+            hits = weights * (exceed > 0)
+            score = hits.var() / hits.mean() ** 2 if hits.any() else np.inf
+            if score < best_score:
+                best, best_score = (window, factor), score
+    return best if best is not None else (window, factor)
+
+
+def estimate_tail(mode="FIXED", threshold=None, fixed_duration=30, duration=SIMULATION_DURATION,
+                  arrival_rate=ARRIVAL_RATE, n_samples=1000, pilot_samples=200, window=None,
+                  factor=None, confidence=0.95, seed=None, batch_size=256) -> dict:
+    """
+    Peluang ekor waktu tunggu dengan importance sampling.
+
+    Args:
+        threshold: batas wait (detik); default 3 x siklus dari surrogate.
+        arrival_rate: laju Poisson nominal (skalar atau 4 nilai).
+        window, factor: proposal; default dipilih oleh tune_proposal.
+            factor=1 memberi Monte Carlo biasa.
+
+    Returns dict: probability (P(A)) dan probability_ci, exceed_per_car
+    (E[N_w] / E[jumlah kedatangan]) dan exceed_per_car_ci, window, factor,
+    hits (jumlah sampel yang mengenai kejadian; jika 0 estimasi dan CI
+    tidak informatif), relative_error, effective_samples (ESS bobot pada
+    kejadian) dan speedup (jumlah run Monte Carlo biasa untuk varians yang
+    sama / jumlah run yang dipakai termasuk pilot).
+    """
+    rng = np.random.default_rng(seed)
+    nominal = np.array(np.broadcast_to(np.asarray(arrival_rate, dtype=float), (4,)))
+    estimate = surrogate(nominal, mode, fixed_duration, duration)
+    if threshold is None:
+        threshold = 3 * estimate["cycle"]
+    options = {"duration": fixed_duration} if mode.upper() == "FIXED" else {}
+    controller = make_controller(mode, **options)
+
+    runs = n_samples
+    if window is None or factor is None:
+        capacity = estimate["greens"] / estimate["cycle"]
+        window, factor = tune_proposal(controller, nominal, duration, threshold, capacity,
+                                       pilot_samples, rng, batch_size)
+        runs += pilot_samples * len(WINDOW_MULTIPLIERS) * len(LOAD_MULTIPLIERS)
+    window = int(min(window, duration))
+    factor = np.array(np.broadcast_to(np.asarray(factor, dtype=float), (4,)))
+
+    weights, exceed = importance_sample(controller, nominal, duration, threshold, window, factor,
+                                        n_samples, rng, batch_size)
+    hits = weights * (exceed > 0)
+    p, p_half = mean_confidence_interval(hits, confidence)
+    per_car = weights * exceed / (nominal.sum() * duration)
+    e, e_half = mean_confidence_interval(per_car, confidence)
+    variance = hits.var(ddof=1)
+    hit_weights = weights[exceed > 0]
+    return {
+        "threshold": threshold,
+        "probability": p,
+        "probability_ci": (max(p - p_half, 0.0), p + p_half),
+        "exceed_per_car": e,
+        "exceed_per_car_ci": (max(e - e_half, 0.0), e + e_half),
+        "window": window,
+        "factor": factor,
+        "hits": len(hit_weights),
+        "relative_error": float(np.sqrt(variance / n_samples) / p) if p > 0 else np.inf,
+        "effective_samples": float(hit_weights.sum() ** 2 / (hit_weights ** 2).sum())
+        if len(hit_weights) else 0.0,
+        "speedup": float(p * (1 - p) / variance * n_samples / runs) if variance > 0 else np.inf,
+    }
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class ArrivalRateEstimator:
+    """
+    Estimasi online laju kedatangan per arah (mobil/detik).
+
+    Menyimpan hitungan kedatangan `window` detik terakhir di ring buffer
+    berukuran tetap beserta jumlah berjalannya, plus EWMA. update() dan
+    query berbiaya O(1) per detik dan memori tidak bertambah sepanjang run.
+
+    Args:
+        window: panjang jendela geser (detik).
+        alpha: faktor pemulusan EWMA (default 2 / (window + 1)).
+        initial_rate: laju awal sebelum ada observasi (prior).
+        n_directions: jumlah arah (kolom) yang diestimasi.
+    """
+
+    def __init__(self, window: int = 60, alpha: float | None = None,
+                 initial_rate: float = 0.0, n_directions: int = 4):
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        if alpha is None:
+            alpha = 2.0 / (window + 1)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1].")
+        self.window = window
+        self.alpha = alpha
+        self.initial_rate = initial_rate
+        self.counts = np.zeros((window, n_directions), dtype=np.int64)
+        self.window_sum = np.zeros(n_directions, dtype=np.int64)
+        self.ewma = np.full(n_directions, float(initial_rate))
+        self.pos = 0
+        self.filled = 0
+
+    def update(self, counts):
+        """Catat hitungan kedatangan satu detik (satu nilai per arah)."""
+        slot = self.counts[self.pos]
+        self.window_sum -= slot
+        slot[:] = counts
+        self.window_sum += slot
+        self.ewma += self.alpha * (slot - self.ewma)
+        self.pos = (self.pos + 1) % self.window
+        if self.filled < self.window:
+            self.filled += 1
+
+    def update_idle(self, n_ticks: int):
+        """Sama dengan n_ticks kali update() dengan hitungan nol, tanpa loop per slot."""
+        if n_ticks <= 0:
+            return
+        slots = (self.pos + np.arange(min(n_ticks, self.window))) % self.window
+        self.window_sum -= self.counts[slots].sum(axis=0)
+        self.counts[slots] = 0
+        # Bentuk tertutup: n kali update() dengan hitungan nol (berbeda dari loop hanya di pembulatan)
+        self.ewma *= (1 - self.alpha) ** n_ticks
+        self.pos = (self.pos + n_ticks) % self.window
+        self.filled = min(self.filled + n_ticks, self.window)
+
+    def window_rates(self) -> np.ndarray:
+        """Rata-rata kedatangan per detik dalam jendela (prior jika belum ada data)."""
+        if self.filled == 0:
+            return np.full(len(self.window_sum), float(self.initial_rate))
+        return self.window_sum / self.filled
+
+    def ewma_rates(self) -> np.ndarray:
+        return self.ewma.copy()
+
+    def rate(self, direction: int, kind: str = "window") -> float:
+        """Laju satu arah; kind "window" atau "ewma"."""
+        if kind == "ewma":
+            return float(self.ewma[direction])
+        if kind != "window":
+            raise ValueError("kind must be 'window' or 'ewma'.")
+        if self.filled == 0:
+            return float(self.initial_rate)
+        return float(self.window_sum[direction]) / self.filled
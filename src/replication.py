@@ -0,0 +1,111 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from src.comparison import replication_seeds
+from src.simulation import simulate_stats
+from src.stats import mean_confidence_interval
+
+DEFAULT_KPIS = ("avg_wait", "p95_wait", "leftover")
+
+
+def _replicate(mode, fixed_duration, duration, seed, sim_kwargs):
+    """Satu replikasi (fungsi top-level supaya bisa di-pickle ke worker)."""
+    return simulate_stats(mode, fixed_duration, duration, seed=seed, **sim_kwargs)
+
+
+def _precision(runs, kpis, confidence):
+    summary = {}
+    for kpi in kpis:
+        mean, half_width = mean_confidence_interval([float(r[kpi]) for r in runs], confidence)
+        if half_width == 0:
+            rel = 0.0
+        else:
+            rel = half_width / abs(mean) if mean != 0 else float("inf")
+        summary[kpi] = {"mean": mean, "half_width": half_width, "rel_half_width": rel}
+    return summary
+
+
+class _InlineExecutor:
+    """Executor sinkron untuk workers=1 (tanpa proses tambahan)."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def run_until_precision(mode="FUZZY", fixed_duration=30, duration=None, kpis=DEFAULT_KPIS,
+                        rel_precision: float = 0.05, confidence: float = 0.95,
+                        batch_size: int = 4, min_replications: int = 5,
+                        max_replications: int = 200, max_seconds: float | None = None,
+                        workers: int | None = None, base_seed: int = 0, **sim_kwargs) -> dict:
+    """
+    Jalankan replikasi secara paralel sampai interval kepercayaan semua KPI
+    cukup sempit (half-width <= rel_precision * |mean|) atau budget habis.
+
+    Replikasi diluncurkan per batch (batch_size in-flight); setiap hasil yang
+    masuk langsung dievaluasi, dan run yang masih berjalan dibatalkan begitu
+    target presisi tercapai. Skenario yang variansinya kecil selesai cepat.
+
+    Hasil disimpan menurut indeks seed dan aturan berhenti dievaluasi pada
+    prefiks indeks yang sudah lengkap (0, 1, 2, ...), jadi n, runs dan KPI
+    sama untuk berapa pun workers (kecuali berhenti karena max_seconds).
+
+    Returns dict: n (replikasi terpakai), stopped_by ("precision" / "budget"),
+    kpis (mean, half_width, rel_half_width per KPI), runs (stats per replikasi).
+    """
+    if rel_precision <= 0:
+        raise ValueError("rel_precision must be positive.")
+    if min_replications < 2 or max_replications < min_replications:
+        raise ValueError("Need 2 <= min_replications <= max_replications.")
+
+    seeds = iter(replication_seeds(max_replications, base_seed))
+    executor = _InlineExecutor() if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    started = time.perf_counter()
+    results, pending, submitted = {}, {}, 0
+    runs = []  # Prefiks hasil berurutan indeks seed
+    stopped_by = "budget"
+
+    def launch():
+        nonlocal submitted
+        while len(pending) < batch_size and submitted < max_replications:
+            future = executor.submit(_replicate, mode, fixed_duration, duration,
+                                     next(seeds), sim_kwargs)
+            pending[future] = submitted
+            submitted += 1
+
+    try:
+        launch()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            # Evaluasi berurutan seperti run sekuensial, hanya atas indeks yang lengkap
+            while len(runs) in results:
+                runs.append(results.pop(len(runs)))
+                if len(runs) >= min_replications:
+                    summary = _precision(runs, kpis, confidence)
+                    if all(s["rel_half_width"] <= rel_precision for s in summary.values()):
+                        stopped_by = "precision"
+                        break
+            if stopped_by == "precision":
+                break
+            if max_seconds is not None and time.perf_counter() - started > max_seconds:
+                break
+            launch()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    summary = _precision(runs, kpis, confidence) if runs else {}
+    return {"n": len(runs), "stopped_by": stopped_by, "kpis": summary, "runs": runs}
+
+
+if __name__ == "__main__":
+    for mode in ("FIXED", "FUZZY"):
+        result = run_until_precision(mode=mode, rel_precision=0.05)
+        print(f"\n=== {mode}: {result['n']} replikasi (berhenti karena {result['stopped_by']}) ===")
+        for kpi, s in result["kpis"].items():
+            print(f"{kpi:<10}: {s['mean']:8.2f} ± {s['half_width']:.2f} ({s['rel_half_width']:.1%})")
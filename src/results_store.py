@@ -0,0 +1,211 @@
+"""
+Penyimpanan hasil run di SQLite, dengan index pada parameter skenario.
+
+Setiap run menyimpan config (mode, fixed_duration, duration, arrival_rate,
+seed, plus config lengkap sebagai JSON), hash controller, KPI ringkas
+(KPIS) dan opsional deret antrian per arah (array (T, 4) int32 sebagai
+BLOB di tabel terpisah supaya query KPI tidak ikut membaca deret).
+
+Query agregat (aggregate) dikerjakan SQLite lewat GROUP BY pada kolom
+ber-index, jadi grafik lintas ribuan run tidak perlu mem-parse file JSON.
+"""
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+from src import fuzzy_module
+from src.comparison import KPIS
+from src.controllers import FuzzyController
+
+SCENARIO_COLUMNS = ("mode", "fixed_duration", "duration", "arrival_rate", "seed", "controller_hash")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    mode TEXT NOT NULL,
+    fixed_duration INTEGER,
+    duration INTEGER,
+    arrival_rate REAL,
+    seed INTEGER,
+    controller_hash TEXT,
+    config TEXT NOT NULL,
+    {", ".join(f"{kpi} REAL" for kpi in KPIS)}
+);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (mode, fixed_duration, arrival_rate, duration);
+CREATE INDEX IF NOT EXISTS runs_controller ON runs (controller_hash);
+CREATE TABLE IF NOT EXISTS series (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE,
+    length INTEGER NOT NULL,
+    queues BLOB NOT NULL
+);
+"""
+
+
+def _stable(value):
+    """Nilai parameter sebagai data JSON yang deterministik (tanpa repr/alamat memori)."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _stable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_stable(item) for item in value]
+    if hasattr(value, "decide"):
+        return controller_spec(value)
+    raise TypeError(f"Cannot hash controller parameter of type {type(value).__name__}")
+
+
+def controller_spec(controller) -> dict:
+    """
+    Kelas + parameter konstruktor controller (nama argumen __init__, dibaca
+    dari atribut bernama sama). Controller di dalam parameter (mis. policy
+    LOOKAHEAD) ikut diuraikan; nilai yang tidak bisa diserialisasi -> TypeError.
+    """
+    params = {}
+    for name in inspect.signature(type(controller).__init__).parameters:
+        if name == "self":
+            continue
+        if not hasattr(controller, name):
+            raise TypeError(f"{type(controller).__name__} does not store parameter {name!r}")
+        params[name] = _stable(getattr(controller, name))
+    spec = {"class": type(controller).__qualname__, "params": params}
+    if isinstance(controller, FuzzyController):
+        spec["rules"] = _stable(fuzzy_module.RULES)
+        spec["terms"] = _stable([fuzzy_module.QUEUE_TERMS, fuzzy_module.ARRIVAL_TERMS,
+                                 fuzzy_module.EXTENSION_TERMS])
+    return spec
+
+
+def controller_hash(controller) -> str:
+    """
+    Hash pendek kelas + parameter controller. Untuk controller fuzzy, basis
+    aturan dan fungsi keanggotaan ikut di-hash, jadi perubahan aturan
+    menghasilkan hash berbeda walau parameternya sama.
+    """
+    text = json.dumps(controller_spec(controller), sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def _where(filters: dict):
+    """Klausa WHERE dari filter kolom: nilai skalar (=), list/tuple (IN) atau None (IS NULL)."""
+    clauses, params = [], []
+    for column, value in filters.items():
+        if column not in SCENARIO_COLUMNS:
+            raise ValueError(f"Unknown filter column: {column}")
+        if value is None:
+            clauses.append(f"{column} IS NULL")
+        elif isinstance(value, (list, tuple)):
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ResultsStore:
+    """
+    Handle ke database hasil.
+
+    Args:
+        path: file SQLite (dibuat jika belum ada), atau ":memory:".
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, config: dict, stats: dict, controller=None, series=None) -> int:
+        """
+        Simpan satu run. config berisi kwargs run (mode, fixed_duration,
+        duration, arrival_rate, seed, ...); series opsional array (T, 4)
+        antrian per arah. Returns id run.
+        """
+        config = {key: _scalar(value) for key, value in config.items()}
+        row = {
+            "created": time.time(),
+            "mode": config.get("mode", stats.get("mode")),
+            "fixed_duration": config.get("fixed_duration"),
+            "duration": config.get("duration"),
+            "arrival_rate": config.get("arrival_rate"),
+            "seed": config.get("seed"),
+            "controller_hash": controller_hash(controller) if controller is not None else None,
+            "config": json.dumps(config, sort_keys=True, default=repr),
+        }
+        row.update({kpi: float(stats[kpi]) for kpi in KPIS})
+        with self.conn:
+            cur = self.conn.execute(
+                f"INSERT INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                list(row.values()))
+            run_id = cur.lastrowid
+            if series is not None:
+                queues = np.ascontiguousarray(series, dtype=np.int32).reshape(-1, 4)
+                self.conn.execute("INSERT INTO series (run_id, length, queues) VALUES (?, ?, ?)",
+                                  (run_id, len(queues), queues.tobytes()))
+        return run_id
+
+    def runs(self, **filters) -> list[dict]:
+        """Baris run (tanpa deret) yang cocok dengan filter kolom skenario, urut id."""
+        where, params = _where(filters)
+        cur = self.conn.execute(f"SELECT * FROM runs{where} ORDER BY id", params)
+        columns = [c[0] for c in cur.description]
+        return [dict(zip(columns, row)) for row in cur]
+
+    def series(self, run_id: int):
+        """Deret antrian (T, 4) run, atau None jika tidak disimpan."""
+        row = self.conn.execute("SELECT length, queues FROM series WHERE run_id = ?",
+                                (run_id,)).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[1], dtype=np.int32).reshape(row[0], 4)
+
+    def aggregate(self, kpi: str = "avg_wait", by=("mode",), **filters) -> list[dict]:
+        """
+        Statistik KPI per grup: list dict berisi kolom `by`, n, mean, std
+        (simpangan baku sampel) dan ci95 (half-width normal 1.96 std / sqrt n).
+        """
+        if kpi not in KPIS:
+            raise ValueError(f"Unknown KPI: {kpi}")
+        by = (by,) if isinstance(by, str) else tuple(by)
+        for column in by:
+            if column not in SCENARIO_COLUMNS:
+                raise ValueError(f"Unknown group column: {column}")
+        where, params = _where(filters)
+        group = ", ".join(by)
+        select = f"{group}, " if by else ""
+        cur = self.conn.execute(
+            f"SELECT {select}COUNT(*), AVG({kpi}), AVG({kpi} * {kpi}) FROM runs{where}"
+            + (f" GROUP BY {group} ORDER BY {group}" if by else ""), params)
+        result = []
+        for row in cur:
+            n, mean, mean_sq = row[len(by):]
+            if not n:
+                continue
+            var = max(mean_sq - mean * mean, 0.0) * n / (n - 1) if n > 1 else 0.0
+            std = var ** 0.5
+            result.append({**dict(zip(by, row[:len(by)])), "n": n, "mean": mean, "std": std,
+                           "ci95": 1.96 * std / n ** 0.5})
+        return result
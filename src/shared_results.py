@@ -0,0 +1,174 @@
+"""
+Hasil run paralel lewat multiprocessing.shared_memory.
+
+Worker menulis output per run langsung ke blok shared memory sebagai array
+(antrian per detik, fase, timer hijau, waktu tunggu per mobil) dan hanya
+mengirim deskriptor kecil (nama blok, dtype, shape, stats) ke parent.
+Parent meng-attach blok sebagai view NumPy tanpa menyalin/unpickle data
+frame, lalu unlink setelah selesai.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from src.arrival_sources import ArrayArrivals
+from src.simulation import SIMULATION_DURATION, Simulation, _ticks
+
+
+def _create_array(shape, dtype, blocks):
+    """Alokasikan array baru di blok shared memory (dicatat di `blocks`)."""
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    blocks.append(shm)
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def simulate_to_shared(mode="FUZZY", fixed_duration=30, duration=None, seed=None,
+                       arrivals=None, **sim_kwargs) -> dict:
+    """
+    Jalankan satu simulasi dan tulis outputnya ke shared memory.
+
+    Returns deskriptor: {"arrays": {nama: (nama_blok, dtype, shape)}, "stats": {...}}.
+    Blok tetap ada setelah fungsi selesai; pemiliknya (parent) wajib unlink,
+    biasanya lewat SharedRunResult.
+    """
+    sim = Simulation(mode, fixed_duration, arrivals=arrivals, seed=seed, **sim_kwargs)
+    capacity = duration or SIMULATION_DURATION
+    if duration is None and arrivals is not None:
+        if not isinstance(arrivals, ArrayArrivals):
+            raise ValueError("duration is required for arrival sources of unknown length.")
+        capacity = len(arrivals.counts)
+
+    blocks = []
+    try:
+        queues = _create_array((capacity, 4), np.int32, blocks)
+        phase = _create_array((capacity,), np.int8, blocks)
+        green_timer = _create_array((capacity,), np.int32, blocks)
+        inter = sim.intersection
+        for _ in _ticks(duration, arrivals):
+            t = sim.t
+            if t >= capacity:
+                break
+            # Sama dengan traffic_state frame detik t (sebelum step)
+            queues[t] = inter.counts
+            phase[t] = inter.phase
+            green_timer[t] = inter.green_timer
+            if sim.step() is None:
+                break
+        waits = _create_array((len(sim.wait_times),), np.int32, blocks)
+        waits[:] = sim.wait_times
+
+        length = sim.t
+        shapes = {"queues": (length, 4), "phase": (length,), "green_timer": (length,),
+                  "waits": waits.shape}
+        arrays = {"queues": queues, "phase": phase, "green_timer": green_timer, "waits": waits}
+        descriptor = {
+            "arrays": {key: (shm.name, arrays[key].dtype.str, shapes[key])
+                       for key, shm in zip(arrays, blocks)},
+            "stats": {k: (v.item() if isinstance(v, np.generic) else v)
+                      for k, v in sim.stats().items()},
+        }
+        del queues, phase, green_timer, waits, arrays
+        for shm in blocks:
+            shm.close()
+            # Kepemilikan pindah ke parent: tanpa ini resource tracker worker
+            # akan meng-unlink blok saat worker berhenti
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return descriptor
+    except BaseException:
+        # View harus dilepas sebelum blok bisa ditutup
+        queues = phase = green_timer = waits = arrays = None
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+        raise
+
+
+class SharedRunResult:
+    """
+    Hasil satu run sebagai view NumPy di atas blok shared memory.
+
+    Atribut: stats (dict) dan satu array per output (queues, phase,
+    green_timer, waits). Panggil release() (atau pakai `with`) setelah
+    selesai: view dilepas, blok ditutup dan di-unlink. Jangan simpan
+    referensi ke array ini setelah release (salin dulu jika perlu).
+    """
+
+    def __init__(self, descriptor: dict):
+        self.stats = descriptor["stats"]
+        self._blocks = []
+        self.arrays = {}
+        for key, (name, dtype, shape) in descriptor["arrays"].items():
+            shm = shared_memory.SharedMemory(name=name)
+            self._blocks.append(shm)
+            self.arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    def __getattr__(self, key):
+        arrays = self.__dict__.get("arrays", {})
+        if key in arrays:
+            return arrays[key]
+        raise AttributeError(key)
+
+    def release(self):
+        self.arrays = {}
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _run(config):
+    return simulate_to_shared(**config)
+
+
+def run_parallel(configs, workers: int | None = None) -> list[SharedRunResult]:
+    """
+    Jalankan banyak konfigurasi simulate_to_shared (list of dict kwargs)
+    secara paralel. Worker hanya mengembalikan deskriptor; hasil di-attach
+    di parent tanpa menyalin array. Urutan hasil = urutan configs.
+
+    Jika ada run yang gagal, semua run lain tetap ditunggu dan blok hasilnya
+    di-unlink sebelum exception pertama dilempar ulang (blok worker sudah
+    lepas dari resource tracker, jadi tanpa ini akan bocor di /dev/shm).
+    """
+    configs = list(configs)
+    descriptors = [None] * len(configs)
+    error = None
+    if workers == 1:
+        for i, config in enumerate(configs):
+            try:
+                descriptors[i] = _run(config)
+            except Exception as exc:
+                error = exc
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_run, config): i for i, config in enumerate(configs)}
+            for future in as_completed(futures):
+                try:
+                    descriptors[futures[future]] = future.result()
+                except Exception as exc:
+                    error = error or exc
+    if error is not None:
+        for descriptor in descriptors:
+            if descriptor is not None:
+                SharedRunResult(descriptor).release()
+        raise error
+    return [SharedRunResult(d) for d in descriptors]
+
+
+def mean_queue_series(results) -> np.ndarray:
+    """Rata-rata total antrian per detik lintas run (panjang = run terpendek)."""
+    length = min(len(r.queues) for r in results)
+    total = np.zeros(length)
+    for r in results:
+        total += r.queues[:length].sum(axis=1)
+    return total / len(results)
@@ -1,20 +1,30 @@
+import copy
+import itertools
 import json
 import numpy as np
+from array import array
 from collections import deque
 from src.traffic_gen import generate_arrivals
-from src.intersection import Intersection
-from src.fuzzy_module import get_green_duration
+from src.intersection import Intersection, DIRECTIONS, DIRECTION_INDEX
+from src.controllers import PhaseBatch, make_controller
+from src.rate_estimator import ArrivalRateEstimator
+from src.trace_io import DeltaEncoder
+from src.arrival_sources import ArrivalSource
+from src.stats import mser
 
 # --- KONFIGURASI GLOBAL ---
 SIMULATION_DURATION = 300  # Durasi diperpanjang (5 menit) untuk data lebih valid
 ARRIVAL_RATE = 0.4         # Lambda (Tingkat kepadatan traffic)
 DEPARTURE_RATE = 1         # Mu
 PHASE_ORDER = ['N', 'E', 'S', 'W']
+INITIAL_GREEN = 10         # Hijau pertama (fase N) setiap run
 
-def get_destination_and_intent(origin):
+def get_destination_and_intent(origin, rng=None):
     opts = ['straight', 'left', 'right']
     probs = [0.6, 0.2, 0.2] 
-    intent = np.random.choice(opts, p=probs)
+    if rng is None:
+        rng = np.random  # RNG global (perilaku lama)
+    intent = rng.choice(opts, p=probs)
     compass = ['N', 'E', 'S', 'W']
     current_idx = compass.index(origin)
     
@@ -23,53 +33,108 @@ def get_destination_and_intent(origin):
     else:                    dest_idx = (current_idx - 1) % 4
     return compass[dest_idx], intent
 
-def run_simulation(mode="FUZZY", fixed_duration=30):
+class Simulation:
     """
-    Menjalankan simulasi dengan mode tertentu.
-    mode: "FUZZY" atau "FIXED"
-    fixed_duration: Detik lampu hijau jika mode FIXED (default 30s)
+    Seluruh state satu run simulasi (intersection, antrian mobil, metrik).
+    Setiap panggilan step() memajukan simulasi 1 detik dan mengembalikan frame-nya.
     """
-    print(f"\n🚀 Memulai Simulasi Mode: {mode}...")
-    
-    intersection = Intersection()
-    intersection.set_green_light(10, 'N') 
-    
-    frames = []
-    queue_ids = {k: deque() for k in ['N', 'S', 'E', 'W']} 
-    car_counters = {k: 0 for k in ['N', 'S', 'E', 'W']} 
-    
-    # --- STATISTIK METRICS ---
-    wait_times = []      # Menyimpan waktu tunggu setiap mobil yang berhasil keluar
-    total_cars_spawned = 0
-    total_cars_departed = 0
-    
-    current_phase_idx = 0
 
-    for t in range(SIMULATION_DURATION):
-        
+    def __init__(self, mode="FUZZY", fixed_duration=30, wait_window=200, arrivals=None, seed=None,
+                 rate_estimate="window", rate_window=60, controller=None):
+        self.mode = mode
+        self.fixed_duration = fixed_duration
+        # Controller dari registry (src.controllers) kecuali diberikan langsung
+        if controller is None:
+            options = {"duration": fixed_duration} if mode.upper() == "FIXED" else {}
+            controller = make_controller(mode, **options)
+        self.controller = controller
+        # Laju kedatangan yang diterima controller: estimasi live per arah
+        # ("window" / "ewma") atau None = konstanta ARRIVAL_RATE (perilaku lama)
+        if rate_estimate not in ("window", "ewma", None):
+            raise ValueError("rate_estimate must be 'window', 'ewma' or None.")
+        self.rate_estimate = rate_estimate
+        self.estimator = ArrivalRateEstimator(window=rate_window, initial_rate=ARRIVAL_RATE)
+        # Buffer per-tick yang dipakai ulang (tanpa alokasi di loop)
+        self._tick_counts = array('q', [0, 0, 0, 0])
+        self._departures = array('q', [0, 0, 0, 0])
+        # seed=None memakai RNG global NumPy (np.random.seed tetap berlaku).
+        # Dengan seed, tiap tujuan (kedatangan, intent belok) punya substream
+        # sendiri: dua controller dengan seed sama melihat lalu lintas identik
+        # (common random numbers), apa pun yang dilakukan controller-nya.
+        self.seed = seed
+        if seed is not None:
+            arrival_seq, intent_seq = np.random.SeedSequence(seed).spawn(2)
+            self.arrival_rng = np.random.default_rng(arrival_seq)
+            self.intent_rng = np.random.default_rng(intent_seq)
+        else:
+            self.arrival_rng = self.intent_rng = None
+        # None = Poisson ARRIVAL_RATE per arah; selain itu ArrivalSource (mis. trace)
+        self.arrivals = arrivals
+        self._arrival_rows = iter(arrivals) if arrivals is not None else None
+        self._pending_row = None  # Kedatangan detik berikutnya yang sudah dibaca run()
+
+        self.intersection = Intersection()
+        self.intersection.set_green_light(INITIAL_GREEN, PHASE_ORDER[0])
+
+        self.queue_ids = {k: deque() for k in DIRECTIONS} 
+        self.car_counters = {k: 0 for k in DIRECTIONS} 
+
+        # --- STATISTIK METRICS ---
+        self.wait_times = []      # Menyimpan waktu tunggu setiap mobil yang berhasil keluar
+        self.wait_ticks = array('q')    # Detik keberangkatan setiap wait_times (untuk warm-up)
+        self.queue_totals = array('q')  # Total antrian di awal setiap detik
+        self.series_start = 0  # Detik awal wait_ticks/queue_totals (> 0 setelah resume ringkas)
+        self.recent_waits = deque(maxlen=wait_window)  # Jendela bergulir untuk digest
+        self.total_cars_spawned = 0
+        self.total_cars_departed = 0
+
+        self.current_phase_idx = 0
+        self.t = 0
+
+    def step(self):
+        """
+        Jalankan satu detik simulasi dan kembalikan frame untuk detik tersebut.
+        Returns None (tanpa memajukan waktu) jika arrival source sudah habis.
+        """
+        t = self.t
+        intersection = self.intersection
+
+        if self._pending_row is not None:
+            arrival_row, self._pending_row = self._pending_row, None
+        elif self._arrival_rows is not None:
+            arrival_row = next(self._arrival_rows, None)
+            if arrival_row is None:
+                return None
+        else:
+            arrival_row = None
+
+        self.queue_totals.append(sum(intersection.counts))
         frame = {
             "t": t,
             "traffic_state": {
                 "current_phase": intersection.current_phase,
                 "green_timer": intersection.green_timer,
-                "queues": intersection.queues.copy()
+                "queues": intersection.queues
             },
             "car_events": [],
             "departures": []
         }
         
         # --- 1. GENERATE ARRIVALS ---
-        for direction in ['N', 'S', 'E', 'W']:
-            count = generate_arrivals(ARRIVAL_RATE)
-            intersection.add_cars(direction, count)
+        for d_idx, direction in enumerate(DIRECTIONS):
+            if arrival_row is None:
+                count = generate_arrivals(ARRIVAL_RATE, self.arrival_rng)
+            else:
+                count = int(arrival_row[d_idx])
+            self._tick_counts[d_idx] = count
             
-            total_cars_spawned += count
-            current_q_len = len(queue_ids[direction])
+            self.total_cars_spawned += count
+            current_q_len = len(self.queue_ids[direction])
             
             for i in range(count):
-                car_counters[direction] += 1
-                car_id = f"{direction}_{car_counters[direction]}"
-                dest, intent = get_destination_and_intent(direction)
+                self.car_counters[direction] += 1
+                car_id = f"{direction}_{self.car_counters[direction]}"
+                dest, intent = get_destination_and_intent(direction, self.intent_rng)
                 
                 # SIMPAN WAKTU KEDATANGAN (t) UNTUK HITUNG WAIT TIME
                 car_info = {
@@ -77,7 +142,7 @@ def run_simulation(mode="FUZZY", fixed_duration=30):
                     "dest": dest,
                     "spawn_time": t  # <--- METRIC PENTING
                 }
-                queue_ids[direction].append(car_info)
+                self.queue_ids[direction].append(car_info)
                 
                 frame["car_events"].append({
                     "car_id": car_id,
@@ -88,18 +153,24 @@ def run_simulation(mode="FUZZY", fixed_duration=30):
                     "queue_position": current_q_len + i
                 })
 
+        intersection.add_counts(self._tick_counts)
+        self.estimator.update(self._tick_counts)
+
         # --- 2. DEPARTURES & METRIC CALCULATION ---
-        departed_counts = intersection.step(departure_rate=DEPARTURE_RATE)
+        departed = intersection.step_into(self._departures, DEPARTURE_RATE)
         
-        for direction, count in departed_counts.items():
-            for _ in range(count):
-                if queue_ids[direction]:
-                    car_data = queue_ids[direction].popleft()
+        for d_idx in range(4) if departed else ():
+            direction = DIRECTIONS[d_idx]
+            for _ in range(self._departures[d_idx]):
+                if self.queue_ids[direction]:
+                    car_data = self.queue_ids[direction].popleft()
                     
                     # HITUNG WAITING TIME
                     wait_time = t - car_data["spawn_time"]
-                    wait_times.append(wait_time)
-                    total_cars_departed += 1
+                    self.wait_times.append(wait_time)
+                    self.wait_ticks.append(t)
+                    self.recent_waits.append(wait_time)
+                    self.total_cars_departed += 1
                     
                     frame["departures"].append({
                         "car_id": car_data["id"],
@@ -108,56 +179,586 @@ def run_simulation(mode="FUZZY", fixed_duration=30):
                     })
 
         # --- 3. PHASE SWITCHING (DUAL MODE) ---
+        self._switch_if_expired()
+
+        self.t += 1
+        return frame
+
+    def _switch_if_expired(self):
+        """Ganti ke fase berikutnya (durasi dari controller) jika timer hijau habis."""
+        intersection = self.intersection
         if intersection.green_timer <= 0:
-            current_phase_idx = (current_phase_idx + 1) % 4
-            next_phase = PHASE_ORDER[current_phase_idx]
+            self.current_phase_idx = (self.current_phase_idx + 1) % 4
+            next_phase = PHASE_ORDER[self.current_phase_idx]
             
-            # --- LOGIKA MODE ---
-            if mode == "FUZZY":
-                queue_next = intersection.queues[next_phase]
-                # Panggil Fuzzy Module
-                duration = get_green_duration(queue_next, ARRIVAL_RATE)
-                duration = max(5, duration) # Safety clamp
-            else:
-                # Mode FIXED (Timer konvensional)
-                duration = fixed_duration
+            # --- LOGIKA MODE (controller dari registry) ---
+            batch = PhaseBatch.single(intersection.counts, self.arrival_rates(),
+                                      DIRECTION_INDEX[next_phase])
+            duration = int(self.controller.decide(batch)[0])
             
             intersection.set_green_light(duration, next_phase)
-            
-        frames.append(frame)
 
-    # --- 4. EXPORT JSON (Beda nama file per mode) ---
-    filename = f"docs/simulation_data_{mode.lower()}.json"
-    output_data = {
-        "metadata": {
-            "mode": mode,
-            "duration": SIMULATION_DURATION,
-            "avg_wait_time": np.mean(wait_times) if wait_times else 0
-        },
-        "frames": frames
-    }
-    with open(filename, "w") as f:
-        json.dump(output_data, f, indent=2)
+    def _read_row(self):
+        """Kedatangan detik berikutnya (4 nilai) dari source / RNG run ini; None jika habis."""
+        if self._arrival_rows is not None:
+            return next(self._arrival_rows, None)
+        return [generate_arrivals(ARRIVAL_RATE, self.arrival_rng) for _ in DIRECTIONS]
 
-    # --- 5. RETURN STATS ---
-    avg_wait = np.mean(wait_times) if wait_times else 0
-    max_wait = np.max(wait_times) if wait_times else 0
+    def run(self, n_ticks=None):
+        """
+        Majukan simulasi n_ticks detik tanpa membuat frame (None = sampai
+        arrival source habis). Rentang detik tanpa kedatangan di semua arah
+        dilompati sekaligus lewat Intersection.advance, berhenti saat timer
+        hijau habis untuk ganti fase; hasilnya identik dengan step() berulang.
+        Dengan RNG global (seed=None tanpa arrival source) kedatangan tidak
+        bisa dibaca di muka tanpa mengubah urutan draw, jadi dipakai step().
+        Returns jumlah detik yang dijalankan.
+        """
+        if n_ticks is None and self._arrival_rows is None:
+            raise ValueError("n_ticks is required without an arrival source.")
+        start = self.t
+        end = None if n_ticks is None else start + n_ticks
+        lookahead = self._arrival_rows is not None or self.arrival_rng is not None
+        while end is None or self.t < end:
+            if not lookahead or self._pending_row is not None:
+                if self.step() is None:
+                    break
+                continue
+            limit = max(self.intersection.green_timer, 1)
+            if end is not None:
+                limit = min(limit, end - self.t)
+            idle = 0
+            while idle < limit:
+                row = self._read_row()
+                if row is None:
+                    break
+                if any(row):
+                    self._pending_row = row
+                    break
+                idle += 1
+            if idle:
+                self._advance_idle(idle)
+            elif self._pending_row is None:
+                break  # Arrival source habis
+        return self.t - start
+
+    def _advance_idle(self, n_ticks):
+        """n_ticks detik tanpa kedatangan (tidak melewati habisnya timer hijau)."""
+        intersection = self.intersection
+        active = intersection.phase
+        total = sum(intersection.counts)
+        ticks = intersection.advance(n_ticks, self._departures, DEPARTURE_RATE)
+        departed = self._departures[active]
+
+        # Antrian di awal setiap detik: total dikurangi yang sudah berangkat
+        served_before = np.minimum(np.arange(ticks) * DEPARTURE_RATE, departed)
+        self.queue_totals.frombytes((total - served_before).astype(np.int64).tobytes())
+        self.estimator.update_idle(ticks)
+
+        cars = self.queue_ids[DIRECTIONS[active]]
+        for j in range(departed):
+            car_data = cars.popleft()
+            t = self.t + j // DEPARTURE_RATE
+            wait_time = t - car_data["spawn_time"]
+            self.wait_times.append(wait_time)
+            self.wait_ticks.append(t)
+            self.recent_waits.append(wait_time)
+        self.total_cars_departed += departed
+
+        self._switch_if_expired()
+        self.t += ticks
+
+    def arrival_rates(self):
+        """Laju kedatangan semua arah (urutan DIRECTIONS) yang dipakai controller."""
+        if self.rate_estimate is None:
+            return np.full(len(DIRECTIONS), ARRIVAL_RATE)
+        if self.rate_estimate == "ewma":
+            return self.estimator.ewma_rates()
+        return self.estimator.window_rates()
+
+    def state_dict(self, series=True):
+        """
+        Snapshot ringkas seluruh state run untuk checkpoint/resume.
+        Antrian mobil disimpan sebagai array (spawn_time, tujuan); ID mobil
+        tidak perlu disimpan karena berurutan per arah.
+
+        series=False: waktu tunggu disimpan sebagai histogram (ukurannya
+        mengikuti wait maksimum, bukan lamanya run) dan deret warm-up
+        (wait_ticks, queue_totals) tidak disimpan, jadi ukuran snapshot
+        hanya bergantung pada state saat ini. avg/max/p95 tetap eksak;
+        stats(warmup=...) pada Simulation hasil resume tidak tersedia.
+        """
+        queued = {}
+        for d in DIRECTIONS:
+            cars = self.queue_ids[d]
+            queued[d] = (np.array([c["spawn_time"] for c in cars], dtype=np.int64),
+                         "".join(c["dest"] for c in cars))
+        state = {
+            "mode": self.mode,
+            "fixed_duration": self.fixed_duration,
+            "controller": self.controller,
+            "seed": self.seed,
+            "rate_estimate": self.rate_estimate,
+            "estimator": copy.deepcopy(self.estimator),
+            "t": self.t,
+            "current_phase_idx": self.current_phase_idx,
+            "intersection": {
+                "queues": self.intersection.queues,
+                "green_timer": self.intersection.green_timer,
+                "current_phase": self.intersection.current_phase,
+            },
+            "queued": queued,
+            "car_counters": self.car_counters.copy(),
+            "recent_waits": np.array(self.recent_waits, dtype=np.int64),
+            "wait_window": self.recent_waits.maxlen,
+            "total_cars_spawned": self.total_cars_spawned,
+            "total_cars_departed": self.total_cars_departed,
+            # Salinan Generator; RNG global disimpan lewat get_state()
+            "arrival_rng": copy.deepcopy(self.arrival_rng),
+            "intent_rng": copy.deepcopy(self.intent_rng),
+            "global_rng_state": np.random.get_state() if self.seed is None else None,
+            "arrivals": self.arrivals,
+        }
+        waits = np.array(self.wait_times, dtype=np.int64)
+        if series:
+            state.update(wait_times=waits, series_start=self.series_start,
+                         wait_ticks=np.array(self.wait_ticks, dtype=np.int64),
+                         queue_totals=np.array(self.queue_totals, dtype=np.int64))
+        else:
+            state["wait_hist"] = np.bincount(waits)
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Bangun kembali Simulation dari hasil state_dict()."""
+        sim = cls(state["mode"], state["fixed_duration"], wait_window=state["wait_window"],
+                  controller=state.get("controller"))
+        sim.seed = state["seed"]
+        sim.rate_estimate = state["rate_estimate"]
+        sim.estimator = copy.deepcopy(state["estimator"])
+        sim.t = state["t"]
+        sim.current_phase_idx = state["current_phase_idx"]
+
+        inter = state["intersection"]
+        sim.intersection.queues = dict(inter["queues"])
+        sim.intersection.set_green_light(inter["green_timer"], inter["current_phase"])
+
+        sim.car_counters = dict(state["car_counters"])
+        for d in DIRECTIONS:
+            spawn_times, dests = state["queued"][d]
+            first_id = sim.car_counters[d] - len(spawn_times) + 1
+            sim.queue_ids[d] = deque(
+                {"id": f"{d}_{first_id + i}", "dest": dest, "spawn_time": int(spawn)}
+                for i, (spawn, dest) in enumerate(zip(spawn_times, dests))
+            )
+
+        if "wait_hist" in state:
+            # Snapshot ringkas: urutan wait hilang (statistik akhir tidak bergantung urutan)
+            hist = state["wait_hist"]
+            sim.wait_times = np.repeat(np.arange(len(hist)), hist).tolist()
+        else:
+            sim.wait_times = state["wait_times"].tolist()
+        if "wait_ticks" in state:
+            sim.wait_ticks = array('q', state["wait_ticks"].tolist())
+            sim.queue_totals = array('q', state["queue_totals"].tolist())
+            sim.series_start = state.get("series_start", 0)
+        else:
+            # Tanpa deret warm-up (snapshot ringkas / checkpoint lama): mulai dari sini
+            sim.series_start = sim.t
+        sim.recent_waits.extend(state["recent_waits"].tolist())
+        sim.total_cars_spawned = state["total_cars_spawned"]
+        sim.total_cars_departed = state["total_cars_departed"]
+
+        sim.arrival_rng = copy.deepcopy(state["arrival_rng"])
+        sim.intent_rng = copy.deepcopy(state["intent_rng"])
+        if sim.seed is None:
+            np.random.set_state(state["global_rng_state"])
+        sim.arrivals = state["arrivals"]
+        if sim.arrivals is not None:
+            sim._arrival_rows = sim.arrivals.iter_from(sim.t)
+        return sim
+
+    def digest(self):
+        """
+        Ringkasan kondisi saat ini (ringan, untuk monitoring live).
+        Persentil waktu tunggu dihitung dari jendela mobil yang terakhir keluar.
+        """
+        recent = np.array(self.recent_waits) if self.recent_waits else np.zeros(1)
+        p50, p95 = np.percentile(recent, [50, 95])
+        return {
+            "t": self.t - 1,
+            "current_phase": self.intersection.current_phase,
+            "green_timer": self.intersection.green_timer,
+            "queues": self.intersection.queues,
+            "spawned": self.total_cars_spawned,
+            "served": self.total_cars_departed,
+            "arrival_rates": self.estimator.window_rates().tolist(),
+            "ewma_rates": self.estimator.ewma_rates().tolist(),
+            "wait_p50": float(p50),
+            "wait_p95": float(p95),
+            "wait_max": float(recent.max()),
+        }
+
+    def stats(self, warmup=None, batch_size=5):
+        """
+        Statistik akhir run (format sama dengan return run_simulation).
+        warmup: None (semua mobil), "mser" (deteksi MSER) atau detik onset
+        steady state; lihat steady_state_stats.
+        """
+        if warmup is not None:
+            if self.series_start:
+                raise ValueError("Warm-up statistics need the series from t = 0; this run was "
+                                 "resumed from a snapshot without them.")
+            return steady_state_stats(self.mode, self.wait_times, self.wait_ticks,
+                                      self.queue_totals, sum(self.intersection.counts),
+                                      warmup, batch_size)
+        avg_wait = np.mean(self.wait_times) if self.wait_times else 0
+        max_wait = np.max(self.wait_times) if self.wait_times else 0
+        p95_wait = np.percentile(self.wait_times, 95) if self.wait_times else 0
+        return {
+            "mode": self.mode,
+            "avg_wait": avg_wait,
+            "max_wait": max_wait,
+            "p95_wait": p95_wait,
+            "served": self.total_cars_departed,
+            "leftover": sum(self.intersection.counts)
+        }
+
+def warmup_onset(waits, wait_ticks, queue_totals, batch_size=5):
+    """
+    Detik mulai steady state menurut MSER pada dua deret: total antrian
+    per detik dan waktu tunggu per mobil (urutan keberangkatan, dipetakan
+    ke detik keberangkatannya). Onset = yang paling akhir dari keduanya.
+    Returns (onset, converged).
+    """
+    queue_cut, queue_ok = mser(queue_totals, batch_size)
+    if len(waits) == 0:
+        return queue_cut, queue_ok
+    wait_cut, wait_ok = mser(waits, batch_size)
+    return max(queue_cut, int(wait_ticks[wait_cut])), queue_ok and wait_ok
+
+def steady_state_stats(mode, waits, wait_ticks, queue_totals, leftover, warmup="mser",
+                       batch_size=5):
+    """
+    Statistik run tanpa transien awal: hanya mobil yang berangkat pada
+    detik >= onset. warmup "mser" mendeteksi onset (warmup_onset), atau
+    berikan onset (detik) langsung. Dict stats ditambah warmup_onset dan
+    steady_state (False jika MSER tidak konvergen: run terlalu pendek atau
+    sistem tidak stasioner, mis. antrian terus tumbuh).
+    """
+    waits = np.asarray(waits, dtype=np.int64)
+    wait_ticks = np.asarray(wait_ticks, dtype=np.int64)
+    if warmup == "mser":
+        onset, steady = warmup_onset(waits, wait_ticks, queue_totals, batch_size)
+    else:
+        onset, steady = int(warmup), True
+    kept = waits[wait_ticks >= onset]
+    has_waits = len(kept) > 0
     return {
         "mode": mode,
-        "avg_wait": avg_wait,
-        "max_wait": max_wait,
-        "served": total_cars_departed,
-        "leftover": sum(intersection.queues.values())
+        "avg_wait": np.mean(kept) if has_waits else 0,
+        "max_wait": np.max(kept) if has_waits else 0,
+        "p95_wait": np.percentile(kept, 95) if has_waits else 0,
+        "served": len(kept),
+        "leftover": leftover,
+        "warmup_onset": onset,
+        "steady_state": steady,
+    }
+
+def stream_simulation(mode="FUZZY", fixed_duration=30, duration=None, digest_every=None,
+                      wait_window=200, arrivals=None, seed=None, rate_estimate="window"):
+    """
+    Versi generator dari run_simulation: frame di-yield begitu dihasilkan.
+
+    Jika digest_every diisi, yang di-yield adalah Simulation.digest() setiap
+    digest_every detik (lebih ringan untuk run panjang). Statistik akhir
+    menjadi nilai return generator (`stats = yield from stream_simulation(...)`).
+    Menghentikan iterasi lebih awal (break / close()) langsung membatalkan run.
+    """
+    if digest_every is not None and digest_every < 1:
+        raise ValueError("digest_every must be at least 1.")
+
+    sim = Simulation(mode, fixed_duration, wait_window=wait_window, arrivals=arrivals, seed=seed,
+                     rate_estimate=rate_estimate)
+    for _ in _ticks(duration, arrivals):
+        frame = sim.step()
+        if frame is None:
+            break
+        if digest_every is None:
+            yield frame
+        elif sim.t % digest_every == 0:
+            yield sim.digest()
+    # Digest terakhir untuk sisa detik yang belum dilaporkan
+    if digest_every is not None and sim.t % digest_every != 0:
+        yield sim.digest()
+    return sim.stats()
+
+def _ticks(duration, arrivals):
+    """Range detik simulasi; tanpa batas jika arrival source menentukan panjang run."""
+    if duration is None and arrivals is not None:
+        return itertools.count()
+    return range(SIMULATION_DURATION if duration is None else duration)
+
+# --- FAST PATH MODE FIXED (tanpa loop per detik) ---
+
+def fixed_schedule(n_ticks, fixed_duration, start=0):
+    """
+    Jadwal hijau mode FIXED: kode arah (indeks DIRECTIONS) yang hijau dan
+    apakah ada pelayanan di setiap detik start .. start+n_ticks-1. Fase awal
+    N selama INITIAL_GREEN, lalu setiap fase PHASE_ORDER berikutnya
+    fixed_duration detik (durasi <= 0 tetap memakan 1 detik tanpa
+    pelayanan, sama seperti loop).
+    """
+    t = np.arange(start, start + n_ticks)
+    length = max(fixed_duration, 1)
+    phase_pos = np.where(t < INITIAL_GREEN, 0, 1 + (t - INITIAL_GREEN) // length) % len(PHASE_ORDER)
+    codes = np.array([DIRECTION_INDEX[p] for p in PHASE_ORDER])[phase_pos]
+    served = (t < INITIAL_GREEN) | (fixed_duration > 0)
+    return codes, served
+
+def _fifo_event_ticks(cumulative, n_events):
+    """Detik terjadinya event ke-1..n dari hitungan kumulatif per detik."""
+    return np.searchsorted(cumulative, np.arange(1, n_events + 1), side="left")
+
+# Detik per chunk kedatangan Poisson ber-seed di fast path
+FAST_CHUNK = 1 << 16
+
+
+class FixedLindley:
+    """
+    Rekursi Lindley mode FIXED yang dimajukan per chunk kedatangan.
+
+    Jadwal FIXED tidak bergantung pada antrian, jadi antrian tiap arah
+    mengikuti q_t = max(q_{t-1} + a_t - c s_t, 0) dengan s_t jadwal
+    pelayanan. Dalam satu chunk, dengan X = q_awal + cumsum(a - c s),
+    q = X - min(0, min_{k<=t} X_k). Antar chunk dibawa antrian akhir dan
+    detik spawn mobil yang masih antre (FIFO per arah), sehingga hasil
+    gabungan semua chunk sama dengan satu array utuh.
+    """
+
+    def __init__(self, fixed_duration=30, departure_rate=DEPARTURE_RATE):
+        self.fixed_duration = fixed_duration
+        self.departure_rate = departure_rate
+        self.t = 0
+        self.queue = np.zeros(len(DIRECTIONS), dtype=np.int64)
+        self.waiting = [np.zeros(0, dtype=np.int64) for _ in DIRECTIONS]  # Detik spawn, FIFO
+
+    def advance(self, arrival_counts):
+        """
+        Majukan satu chunk (k, 4). Returns (queues, departures, waits,
+        wait_ticks): antrian di awal tiap detik, keberangkatan per detik,
+        waktu tunggu urutan loop dan detik keberangkatannya.
+        """
+        arrivals = np.asarray(arrival_counts, dtype=np.int64).reshape(-1, len(DIRECTIONS))
+        n_ticks = len(arrivals)
+        if n_ticks == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return arrivals.copy(), arrivals.copy(), empty, empty
+        codes, served = fixed_schedule(n_ticks, self.fixed_duration, self.t)
+        service = np.zeros((n_ticks, len(DIRECTIONS)), dtype=np.int64)
+        service[np.arange(n_ticks), codes] = self.departure_rate * served
+
+        x = self.queue + np.cumsum(arrivals - service, axis=0)
+        after = x - np.minimum.accumulate(np.minimum(x, 0), axis=0)  # Antrian akhir tiap detik
+        before = np.vstack([self.queue[None], after[:-1]])
+        departures = before + arrivals - after
+
+        ticks = self.t + np.arange(n_ticks)
+        depart_ticks, waits = [], []
+        for d in range(len(DIRECTIONS)):
+            spawned = np.concatenate([self.waiting[d], np.repeat(ticks, arrivals[:, d])])
+            depart = np.repeat(ticks, departures[:, d])
+            depart_ticks.append(depart)
+            waits.append(depart - spawned[:len(depart)])
+            self.waiting[d] = spawned[len(depart):]
+        depart_ticks = np.concatenate(depart_ticks)
+        # Urutan loop: per detik keberangkatan, lalu FIFO dalam satu arah
+        order = np.argsort(depart_ticks, kind="stable")
+
+        self.queue = after[-1]
+        self.t += n_ticks
+        return before, departures, np.concatenate(waits)[order], depart_ticks[order]
+
+
+def _fixed_stats(waits, served, leftover):
+    has_waits = len(waits) > 0
+    return {
+        "mode": "FIXED",
+        "avg_wait": np.mean(waits) if has_waits else 0,
+        "max_wait": np.max(waits) if has_waits else 0,
+        "p95_wait": np.percentile(waits, 95) if has_waits else 0,
+        "served": int(served),
+        "leftover": int(leftover),
     }
 
+def simulate_fixed_fast(arrival_counts, fixed_duration=30, departure_rate=DEPARTURE_RATE):
+    """
+    Hasil mode FIXED untuk seluruh horizon dengan operasi array (satu
+    chunk FixedLindley).
+
+    Args:
+        arrival_counts: array (T, 4) kedatangan per detik (urutan DIRECTIONS).
+
+    Returns dict: queues (T, 4) antrian di awal tiap detik (= traffic_state
+    frame), departures (T, 4), waits (urutan sama dengan loop), wait_ticks
+    (detik keberangkatan tiap waits), stats.
+    """
+    run = FixedLindley(fixed_duration, departure_rate)
+    queues, departures, waits, wait_ticks = run.advance(arrival_counts)
+    stats = _fixed_stats(waits, departures.sum(), run.queue.sum())
+    return {"queues": queues, "departures": departures, "waits": waits,
+            "wait_ticks": wait_ticks, "stats": stats}
+
+def _limited_chunks(chunks, duration):
+    total = 0
+    for chunk in chunks:
+        if duration is not None and total + len(chunk) >= duration:
+            yield chunk[:duration - total]
+            return
+        yield chunk
+        total += len(chunk)
+
+def _poisson_chunks(rng, n_ticks):
+    # Draw berurutan per elemen, jadi per chunk sama dengan satu array (n_ticks, 4)
+    for start in range(0, n_ticks, FAST_CHUNK):
+        yield rng.poisson(ARRIVAL_RATE, size=(min(FAST_CHUNK, n_ticks - start), len(DIRECTIONS)))
+
+def _arrival_chunks(duration, arrivals, seed):
+    """
+    Chunk kedatangan (k, 4) yang akan dilihat Simulation dengan argumen yang
+    sama, atau None jika tidak bisa ditentukan di muka (RNG global).
+    """
+    if arrivals is None:
+        if seed is None:
+            return None  # RNG global juga dipakai untuk intent -> urutan draw berbeda
+        arrival_seq, _ = np.random.SeedSequence(seed).spawn(2)
+        n_ticks = SIMULATION_DURATION if duration is None else duration
+        return _poisson_chunks(np.random.default_rng(arrival_seq), n_ticks)
+    if not isinstance(arrivals, ArrivalSource):
+        return None
+    return _limited_chunks(arrivals.chunks(), duration)
+
+def simulate_stats(mode="FUZZY", fixed_duration=30, duration=None, arrivals=None, seed=None,
+                   rate_estimate="window", fast=True, warmup=None):
+    """
+    Jalankan simulasi tanpa menyimpan/mengekspor frame dan tanpa print;
+    hanya mengembalikan statistik akhir (untuk replikasi dan sweep).
+    Mode FIXED dengan seed atau ArrivalSource memakai simulate_fixed_fast
+    (hasil identik dengan loop); fast=False memaksa loop per detik.
+    warmup: lihat Simulation.stats (None, "mser" atau detik onset).
+    """
+    if fast and mode.upper() == "FIXED":
+        chunks = _arrival_chunks(duration, arrivals, seed)
+        if chunks is not None:
+            # Chunk demi chunk: source tidak pernah digabung menjadi satu array (T, 4)
+            run = FixedLindley(fixed_duration)
+            empty = np.zeros(0, dtype=np.int64)
+            waits, wait_ticks, queue_totals, served = [empty], [empty], [empty], 0
+            for chunk in chunks:
+                queues, departures, chunk_waits, chunk_ticks = run.advance(chunk)
+                waits.append(chunk_waits)
+                served += int(departures.sum())
+                if warmup is not None:
+                    wait_ticks.append(chunk_ticks)
+                    queue_totals.append(queues.sum(axis=1))
+            waits = np.concatenate(waits)
+            stats = _fixed_stats(waits, served, run.queue.sum())
+            if warmup is not None:
+                stats = steady_state_stats(mode, waits, np.concatenate(wait_ticks),
+                                           np.concatenate(queue_totals), stats["leftover"], warmup)
+            stats["mode"] = mode
+            return stats
+    sim = Simulation(mode, fixed_duration, arrivals=arrivals, seed=seed, rate_estimate=rate_estimate)
+    if duration is None and arrivals is None:
+        duration = SIMULATION_DURATION
+    sim.run(duration)
+    return sim.stats(warmup)
+
+def run_simulation(mode="FUZZY", fixed_duration=30, duration=None, export=True, arrivals=None,
+                   seed=None, rate_estimate="window", encoding="full", keyframe_every=60,
+                   store=None, tags=None, warmup=None, store_series=False):
+    """
+    Menjalankan simulasi dengan mode tertentu.
+    mode: Nama controller di registry (FIXED, FUZZY, FUZZY_MULTI, SUGENO,
+          ACTUATED, WEBSTER, MAX_PRESSURE)
+    fixed_duration: Detik lampu hijau jika mode FIXED (default 30s)
+    duration: Panjang simulasi dalam detik (default SIMULATION_DURATION, atau
+              sampai arrival source habis jika arrivals diberikan)
+    export: Tulis frames ke docs/simulation_data_<mode>.json
+    arrivals: ArrivalSource opsional (mis. TraceArrivals) pengganti Poisson
+    seed: Seed RNG run ini (default None = RNG global NumPy)
+    rate_estimate: Input arrival untuk fuzzy: "window" / "ewma" (estimasi live
+                   per arah) atau None (konstanta ARRIVAL_RATE)
+    encoding: "full" (frame lengkap, format lama) atau "delta" (keyframe
+              tiap keyframe_every detik + delta field yang berubah, JSON
+              ringkas; baca dengan trace_io.TraceReader)
+    store: ResultsStore opsional; config, hash controller dan KPI run ini
+           disimpan ke sana
+    store_series: simpan juga deret antrian per arah ke store (default
+                  tidak, supaya sweep ribuan run tidak membengkakkan database)
+    tags: dict tambahan untuk config yang disimpan (mis. arrival_rate)
+    warmup: None, "mser" atau detik onset; KPI dihitung tanpa transien awal
+            dan stats berisi warmup_onset / steady_state (Simulation.stats)
+    """
+    if encoding not in ("full", "delta"):
+        raise ValueError("encoding must be 'full' or 'delta'.")
+    print(f"\n🚀 Memulai Simulasi Mode: {mode}...")
+
+    sim = Simulation(mode, fixed_duration, arrivals=arrivals, seed=seed, rate_estimate=rate_estimate)
+    encoder = DeltaEncoder(keyframe_every) if encoding == "delta" else None
+    frames = []
+    queues = [] if store is not None and store_series else None
+    for _ in _ticks(duration, arrivals):
+        frame = sim.step()
+        if frame is None:
+            break
+        if queues is not None:
+            q = frame["traffic_state"]["queues"]
+            queues.append([q[d] for d in DIRECTIONS])
+        frames.append(frame if encoder is None else encoder.encode(frame))
+    stats = sim.stats(warmup)
+
+    if store is not None:
+        config = {"mode": mode, "fixed_duration": fixed_duration, "duration": sim.t,
+                  "seed": seed, "rate_estimate": rate_estimate,
+                  "arrival_rate": ARRIVAL_RATE if arrivals is None else None}
+        config.update(tags or {})
+        store.record(config, stats, controller=sim.controller, series=queues)
+
+    # --- 4. EXPORT JSON (Beda nama file per mode) ---
+    if export:
+        filename = f"docs/simulation_data_{mode.lower()}.json"
+        output_data = {
+            "metadata": {
+                "mode": mode,
+                "duration": sim.t,
+                "avg_wait_time": stats["avg_wait"]
+            },
+            "frames": frames
+        }
+        if warmup is not None:
+            output_data["metadata"]["warmup_onset"] = stats["warmup_onset"]
+        with open(filename, "w") as f:
+            if encoder is None:
+                json.dump(output_data, f, indent=2)
+            else:
+                output_data["metadata"].update(encoder.metadata())
+                json.dump(output_data, f, separators=(",", ":"))
+
+    # --- 5. RETURN STATS ---
+    return stats
+
 if __name__ == "__main__":
     print("=== PERBANDINGAN PERFORMA  ===")
     
+    # Seed sama untuk kedua skenario: kedatangan & intent identik (common random numbers)
+    seed = int(np.random.SeedSequence().entropy % 2**32)
+
     # 1. Jalankan Skenario A: FIXED TIMER (misal 30 detik)
-    stats_fixed = run_simulation(mode="FIXED", fixed_duration=30)
+    stats_fixed = run_simulation(mode="FIXED", fixed_duration=30, seed=seed)
     
     # 2. Jalankan Skenario B: FUZZY LOGIC
-    stats_fuzzy = run_simulation(mode="FUZZY")
+    stats_fuzzy = run_simulation(mode="FUZZY", seed=seed)
     
     # 3. Print Hasil Head-to-Head
     print("\n" + "="*40)
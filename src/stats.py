@@ -0,0 +1,44 @@
+import numpy as np
+from scipy import stats as sps
+
+
+def mean_confidence_interval(samples, confidence: float = 0.95) -> tuple[float, float]:
+    """
+    Rata-rata sampel dan half-width interval kepercayaan Student-t.
+    Returns (mean, half_width); half_width = inf jika sampel < 2.
+    """
+    samples = np.asarray(samples, dtype=float)
+    n = len(samples)
+    if n == 0:
+        raise ValueError("Need at least one sample.")
+    mean = float(samples.mean())
+    if n < 2:
+        return mean, float("inf")
+    sem = samples.std(ddof=1) / np.sqrt(n)
+    return mean, float(sps.t.ppf(0.5 + confidence / 2, n - 1) * sem)
+
+
+def mser(series, batch_size: int = 5, max_fraction: float = 0.5) -> tuple[int, bool]:
+    """
+    Titik potong warm-up MSER-m (default MSER-5).
+
+    Deret dirata-rata per batch batch_size sampel; untuk setiap potongan d
+    (batch) dihitung MSER(d) = sum_{i>=d} (Y_i - mean(Y_d..))^2 / (n - d)^2,
+    lalu dipilih d minimum di antara d < max_fraction * n.
+
+    Returns (indeks sampel awal steady state, converged). converged False
+    jika minimum jatuh di batas pencarian (deret belum stasioner / run
+    terlalu pendek) atau deret terlalu pendek (< 2 batch).
+    """
+    x = np.asarray(series, dtype=float)
+    n_batches = len(x) // batch_size
+    if n_batches < 2:
+        return 0, False
+    means = x[:n_batches * batch_size].reshape(n_batches, batch_size).mean(axis=1)
+    tail_sum = np.cumsum(means[::-1])[::-1]
+    tail_sq = np.cumsum((means ** 2)[::-1])[::-1]
+    remaining = n_batches - np.arange(n_batches)
+    squared_dev = np.maximum(tail_sq - tail_sum ** 2 / remaining, 0.0)
+    limit = max(int(n_batches * max_fraction), 1)
+    d = int(np.argmin(squared_dev[:limit] / remaining[:limit] ** 2))
+    return d * batch_size, d < limit - 1
@@ -0,0 +1,102 @@
+"""
+Controller Takagi-Sugeno untuk perpanjangan lampu hijau.
+
+Antecedent (queue, arrival) dan grid 3x3 rule sama dengan controller Mamdani
+di fuzzy_module, tetapi tiap rule langsung menghasilkan konstanta (orde 0)
+atau fungsi linear p*queue + r*arrival + c (orde 1). Output = rata-rata
+konsekuen berbobot derajat aktivasi rule, sehingga tidak ada agregasi dan
+defuzzifikasi. Parameter konsekuen di-fit dengan least squares ke permukaan
+Mamdani saat ini.
+"""
+import numpy as np
+
+from src.fuzzy_analytic import trimf
+from src.fuzzy_module import (ARRIVAL_TERMS, ARRIVAL_UNIVERSE, FALLBACK_DURATION,
+                              QUEUE_TERMS, QUEUE_UNIVERSE, RULES, fuzzy_extension)
+
+_QUEUE_PARAMS = [QUEUE_TERMS[q] for q, _, _ in RULES]
+_ARRIVAL_PARAMS = [ARRIVAL_TERMS[a] for _, a, _ in RULES]
+
+
+def firing_strengths(queue_inputs, arrival_inputs) -> np.ndarray:
+    """Derajat aktivasi tiap rule (AND = min), bentuk (n, len(RULES))."""
+    queue_inputs = np.atleast_1d(np.asarray(queue_inputs, dtype=float))
+    arrival_inputs = np.broadcast_to(np.asarray(arrival_inputs, dtype=float), queue_inputs.shape)
+    mu_q = np.stack([trimf(queue_inputs, abc) for abc in _QUEUE_PARAMS], axis=-1)
+    mu_a = np.stack([trimf(arrival_inputs, abc) for abc in _ARRIVAL_PARAMS], axis=-1)
+    return np.minimum(mu_q, mu_a)
+
+
+def _regressors(queue_inputs, arrival_inputs, order):
+    """Fitur konsekuen per sampel: [1] (orde 0) atau [queue, arrival, 1] (orde 1)."""
+    ones = np.ones_like(queue_inputs)
+    if order == 0:
+        return ones[:, None]
+    return np.stack([queue_inputs, arrival_inputs, ones], axis=-1)
+
+
+class SugenoController:
+    """
+    Controller Sugeno orde 0 atau 1 dengan konsekuen hasil fit.
+
+    Args:
+        order: 0 (konsekuen konstanta) atau 1 (linear dalam queue & arrival).
+        resolution: jumlah titik grid per input untuk fitting.
+    """
+
+    def __init__(self, order: int = 1, resolution: int = 81):
+        if order not in (0, 1):
+            raise ValueError("order must be 0 or 1.")
+        self.order = order
+        self.coefficients = self._fit(resolution)  # (len(RULES), n_features)
+
+    def _fit(self, resolution):
+        q, a = np.meshgrid(np.linspace(*QUEUE_UNIVERSE, resolution),
+                           np.linspace(*ARRIVAL_UNIVERSE, resolution))
+        q, a = q.ravel(), a.ravel()
+        target = fuzzy_extension(q, a)
+        weights = firing_strengths(q, a)
+        total = weights.sum(axis=1)
+        keep = (total > 0) & ~np.isnan(target)
+        q, a, target = q[keep], a[keep], target[keep]
+        norm = weights[keep] / total[keep, None]
+
+        # y = sum_r norm_r * (theta_r . x) -> linear dalam semua theta
+        features = _regressors(q, a, self.order)
+        design = (norm[:, :, None] * features[:, None, :]).reshape(len(q), -1)
+        theta, *_ = np.linalg.lstsq(design, target, rcond=None)
+        return theta.reshape(len(RULES), -1)
+
+    def evaluate(self, queue_inputs, arrival_inputs) -> np.ndarray:
+        """Output crisp untuk input dalam skala universe; NaN jika tidak ada rule aktif."""
+        queue_inputs = np.atleast_1d(np.asarray(queue_inputs, dtype=float))
+        arrival_inputs = np.broadcast_to(np.asarray(arrival_inputs, dtype=float),
+                                         queue_inputs.shape)
+        weights = firing_strengths(queue_inputs, arrival_inputs)
+        outputs = _regressors(queue_inputs, arrival_inputs, self.order) @ self.coefficients.T
+        total = weights.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, (weights * outputs).sum(axis=1) / total, np.nan)
+
+    def green_durations(self, queues, arrival_rates) -> np.ndarray:
+        """Sama seperti fuzzy_module.get_green_durations (clamp input, int, fallback)."""
+        queues = np.atleast_1d(np.asarray(queues, dtype=float))
+        arrival_rates = np.broadcast_to(np.asarray(arrival_rates, dtype=float), queues.shape)
+        safe_queue = np.minimum(queues, QUEUE_UNIVERSE[1])
+        safe_arrival = np.minimum(arrival_rates * 10, ARRIVAL_UNIVERSE[1])
+        duration = self.evaluate(safe_queue, safe_arrival)
+        return np.where(np.isnan(duration), FALLBACK_DURATION, duration).astype(int)
+
+
+_SUGENO = {}  # Controller per orde, di-fit sekali saat pertama dipakai
+
+
+def get_controller(order: int = 1) -> SugenoController:
+    """Controller Sugeno ter-cache untuk orde tertentu."""
+    if order not in _SUGENO:
+        _SUGENO[order] = SugenoController(order)
+    return _SUGENO[order]
+
+
+def get_green_durations(queues, arrival_rates, order: int = 1) -> np.ndarray:
+    return get_controller(order).green_durations(queues, arrival_rates)
@@ -0,0 +1,88 @@
+"""
+Sweep skenario (laju kedatangan x mode x durasi FIXED) dengan penyaringan
+surrogate analitik.
+
+Setiap titik dinilai dulu oleh surrogate.surrogate (milidetik). Titik yang
+perkiraannya reliable (jelas tidak jenuh atau jelas jenuh) tidak perlu
+disimulasikan; titik sisanya disimulasikan dengan prioritas terdekat ke
+x = 1, tempat model analitik paling tidak bisa dipercaya. Dengan budget
+terbatas, titik di luar budget tetap punya perkiraan surrogate.
+"""
+from itertools import product
+
+import numpy as np
+
+from src.arrival_sources import ArrayArrivals
+from src.comparison import replication_seeds
+from src.simulation import simulate_stats
+from src.surrogate import surrogate
+
+
+def grid(arrival_rates, modes=("FIXED",), fixed_durations=(30,)) -> list[dict]:
+    """Titik sweep sebagai list dict; fixed_durations hanya divariasikan untuk FIXED."""
+    points = []
+    for mode, rate in product(modes, arrival_rates):
+        durations = fixed_durations if mode.upper() == "FIXED" else fixed_durations[:1]
+        for fixed_duration in durations:
+            points.append({"arrival_rate": rate, "mode": mode, "fixed_duration": fixed_duration})
+    return points
+
+
+def _priority(estimate: dict) -> tuple:
+    # Tidak reliable dulu, lalu yang paling dekat ke kejenuhan; demand nol paling jauh
+    saturation = estimate["max_saturation"]
+    distance = abs(np.log(saturation)) if saturation > 0 else np.inf
+    return (estimate["reliable"], distance)
+
+
+def screen(points, duration: int = 3600) -> list[dict]:
+    """
+    Tambahkan perkiraan surrogate ke setiap titik (key "surrogate") dan
+    urutkan menurut prioritas simulasi.
+    """
+    screened = []
+    for point in points:
+        estimate = surrogate(point["arrival_rate"], point["mode"], point["fixed_duration"], duration)
+        screened.append({**point, "surrogate": estimate})
+    return sorted(screened, key=lambda p: _priority(p["surrogate"]))
+
+
+def simulate_point(point: dict, duration: int = 3600, replications: int = 1,
+                   base_seed: int = 0) -> dict:
+    """Rata-rata stats simulate_stats atas beberapa replikasi Poisson pada arrival_rate titik."""
+    runs = []
+    for seed in replication_seeds(replications, base_seed):
+        counts = np.random.default_rng(seed).poisson(point["arrival_rate"], size=(duration, 4))
+        runs.append(simulate_stats(point["mode"], point["fixed_duration"],
+                                   arrivals=ArrayArrivals(counts)))
+    return {key: float(np.mean([r[key] for r in runs]))
+            for key in ("avg_wait", "p95_wait", "max_wait", "served", "leftover")}
+
+
+def run_sweep(points, duration: int = 3600, replications: int = 1, base_seed: int = 0,
+              budget: int | None = None, simulate_reliable: bool = False) -> list[dict]:
+    """
+    Saring titik dengan surrogate lalu simulasikan yang perlu.
+
+    Args:
+        budget: jumlah maksimum titik yang disimulasikan (default tanpa batas).
+        simulate_reliable: simulasikan juga titik yang perkiraannya reliable.
+
+    Returns titik terurut prioritas, masing-masing dengan "surrogate",
+    "source" ("simulation", "surrogate" atau "pending" jika di luar budget)
+    dan "avg_wait" (dari simulasi jika ada, selain itu dari surrogate).
+    """
+    results = []
+    simulated = 0
+    for point in screen(points, duration):
+        estimate = point["surrogate"]
+        needed = simulate_reliable or not estimate["reliable"]
+        if needed and (budget is None or simulated < budget):
+            stats = simulate_point(point, duration, replications, base_seed)
+            simulated += 1
+            results.append({**point, "source": "simulation", "stats": stats,
+                            "avg_wait": stats["avg_wait"]})
+        else:
+            source = "pending" if needed else "surrogate"
+            results.append({**point, "source": source, "avg_wait": estimate["avg_wait"]})
+    return results
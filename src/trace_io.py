@@ -0,0 +1,334 @@
+import json
+import re
+
+import numpy as np
+
+
+def _to_builtin(value):
+    """Konversi skalar NumPy (np.float64, np.int64) ke tipe Python agar bisa di-dump."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class TraceWriter:
+    """
+    Penulis trace simulasi line-delimited JSON (satu objek per baris):
+
+        {"metadata": {...}}          <- baris pertama
+        {"t": 0, "traffic_state": ...} <- satu baris per frame
+        {"summary": {...}}           <- baris terakhir (ditulis oleh close)
+
+    Frame ditulis begitu dihasilkan, jadi run panjang tidak perlu menyimpan
+    semua frame di memori. Posisi byte (tell) bisa dicatat di checkpoint;
+    membuka ulang dengan offset memotong file ke posisi itu lalu melanjutkan.
+    """
+
+    def __init__(self, path: str, metadata: dict | None = None, offset: int | None = None,
+                 encoding: str = "full", keyframe_every: int = 60):
+        self.path = path
+        # encoding="delta": keyframe tiap keyframe_every frame, sisanya delta
+        # (lihat DeltaEncoder). Saat resume, checkpoint.resume memulihkan state
+        # encoder dari checkpoint sehingga rantai delta berlanjut tanpa keyframe baru.
+        if encoding not in ("full", "delta"):
+            raise ValueError("encoding must be 'full' or 'delta'.")
+        self.encoder = DeltaEncoder(keyframe_every) if encoding == "delta" else None
+        if offset is None:
+            self.f = open(path, "w", encoding="utf-8")
+            metadata = dict(metadata or {})
+            if self.encoder is not None:
+                metadata.update(self.encoder.metadata())
+            self._write_line({"metadata": metadata})
+        else:
+            self.f = open(path, "r+", encoding="utf-8")
+            self.f.seek(offset)
+            self.f.truncate()
+
+    def _write_line(self, obj):
+        self.f.write(json.dumps(obj, separators=(",", ":")))
+        self.f.write("\n")
+
+    def write_frame(self, frame: dict):
+        self._write_line(frame if self.encoder is None else self.encoder.encode(frame))
+
+    def tell(self) -> int:
+        """Flush lalu kembalikan posisi byte saat ini (untuk checkpoint)."""
+        self.f.flush()
+        return self.f.tell()
+
+    def close(self, summary: dict | None = None):
+        if summary is not None:
+            self._write_line({"summary": {k: _to_builtin(v) for k, v in summary.items()}})
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self.f.closed:
+            self.f.close()
+
+
+SPAWN_FIELDS = ("car_id", "origin", "destination", "intent", "queue_position")
+DEPARTURE_FIELDS = ("car_id", "origin", "destination")
+_SPAWN = {"event": "spawn"}
+
+
+def _pack(event, fields, extra=None):
+    """Dict event -> list posisional jika key-nya persis sesuai fields."""
+    keys = set(fields) | (set(extra) if extra else set())
+    if event.keys() != keys or (extra and any(event[k] != v for k, v in extra.items())):
+        return event
+    return [event[k] for k in fields]
+
+
+def _unpack(event, fields, extra=None):
+    if isinstance(event, dict):
+        return event
+    unpacked = dict(zip(fields, event))
+    if extra:
+        unpacked.update(extra)
+    return unpacked
+
+
+class DeltaEncoder:
+    """
+    Encoding keyframe + delta untuk frame simulasi.
+
+    Keyframe adalah frame lengkap (punya "t"). Frame lain ditulis sebagai
+    delta terhadap frame sebelumnya (t = t sebelumnya + 1), hanya berisi
+    field yang berubah:
+
+        "phase": current_phase baru
+        "timer": green_timer, jika bukan green_timer sebelumnya - 1
+        "q":     {arah: panjang antrian} yang berubah
+        "ev":    car_events (jika tidak kosong)
+        "dep":   departures (jika tidak kosong)
+
+    Event spawn dan departure standar di dalam delta disimpan sebagai list
+    posisional (urutan SPAWN_FIELDS / DEPARTURE_FIELDS), bukan dict.
+
+    Keyframe ditulis setiap keyframe_every frame dan saat t tidak berurutan,
+    jadi pembaca bisa mulai dari keyframe mana pun.
+    """
+
+    def __init__(self, keyframe_every: int = 60):
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be at least 1.")
+        self.keyframe_every = keyframe_every
+        self.prev = None
+        self.count = 0
+
+    def metadata(self) -> dict:
+        return {"encoding": "delta", "keyframe_every": self.keyframe_every}
+
+    def encode(self, frame: dict) -> dict:
+        prev = self.prev
+        state = frame["traffic_state"]
+        self.prev = frame
+        keyframe = (prev is None or self.count % self.keyframe_every == 0
+                    or frame["t"] != prev["t"] + 1)
+        self.count += 1
+        if keyframe:
+            return frame
+
+        delta = {}
+        prev_state = prev["traffic_state"]
+        if state["current_phase"] != prev_state["current_phase"]:
+            delta["phase"] = state["current_phase"]
+        if state["green_timer"] != prev_state["green_timer"] - 1:
+            delta["timer"] = state["green_timer"]
+        prev_queues = prev_state["queues"]
+        changed = {d: n for d, n in state["queues"].items() if prev_queues.get(d) != n}
+        if changed:
+            delta["q"] = changed
+        if frame["car_events"]:
+            delta["ev"] = [_pack(e, SPAWN_FIELDS, _SPAWN) for e in frame["car_events"]]
+        if frame["departures"]:
+            delta["dep"] = [_pack(d, DEPARTURE_FIELDS) for d in frame["departures"]]
+        return delta
+
+
+def decode_frames(items):
+    """Rekonstruksi frame lengkap dari urutan keyframe/delta (lazy, generator)."""
+    prev = None
+    for item in items:
+        if "t" in item:
+            prev = item
+            yield item
+            continue
+        if prev is None:
+            raise ValueError("Delta frame without a preceding keyframe.")
+        prev_state = prev["traffic_state"]
+        queues = prev_state["queues"]
+        if "q" in item:
+            queues = {**queues, **item["q"]}
+        prev = {
+            "t": prev["t"] + 1,
+            "traffic_state": {
+                "current_phase": item.get("phase", prev_state["current_phase"]),
+                "green_timer": item.get("timer", prev_state["green_timer"] - 1),
+                "queues": queues,
+            },
+            "car_events": [_unpack(e, SPAWN_FIELDS, _SPAWN) for e in item.get("ev", ())],
+            "departures": [_unpack(d, DEPARTURE_FIELDS) for d in item.get("dep", ())],
+        }
+        yield prev
+
+
+class TraceReader:
+    """
+    Pembaca trace secara streaming, untuk dua format:
+
+    - dokumen JSON {"metadata": {...}, "frames": [...]} (run_simulation)
+    - line-delimited JSON dari TraceWriter
+
+    File dibaca per chunk dan frame di-decode satu per satu (raw_decode),
+    jadi memori tidak bergantung pada ukuran file. metadata dibaca saat
+    reader dibuka; summary (khusus JSONL) terisi setelah frame habis dibaca.
+    Trace dengan metadata encoding "delta" di-decode otomatis (decode_frames).
+    Setiap iterasi membuka file lagi, jadi reader bisa dipakai berkali-kali.
+
+    Args:
+        path: file trace.
+        start, stop: jendela waktu [start, stop) pada field "t". Frame
+            diasumsikan urut waktu; pembacaan berhenti di frame pertama
+            dengan t >= stop tanpa membaca sisa file.
+        chunk_size: jumlah karakter per pembacaan.
+        max_record: ukuran maksimum (karakter) satu nilai JSON; file rusak atau
+            terpotong memicu ValueError setelah paling banyak sebanyak ini dibaca
+            melewati record valid terakhir, bukan sampai akhir file.
+    """
+
+    def __init__(self, path: str, start: int | None = None, stop: int | None = None,
+                 chunk_size: int = 1 << 16, max_record: int = 8 << 20):
+        self.path = path
+        self.start = start
+        self.stop = stop
+        self.chunk_size = chunk_size
+        self.max_record = max_record
+        self.metadata = {}
+        self.summary = None
+        # Baca header saja (berhenti di frame pertama)
+        header = self._scan()
+        next(header, None)
+        header.close()
+
+    def __iter__(self):
+        frames = self._scan()
+        if self.metadata.get("encoding") == "delta":
+            frames = decode_frames(frames)
+        for frame in frames:
+            t = frame.get("t")
+            if t is not None:
+                if self.stop is not None and t >= self.stop:
+                    return
+                if self.start is not None and t < self.start:
+                    continue
+            yield frame
+
+    def _scan(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            scanner = _JsonScanner(f, self.chunk_size, self.max_record)
+            # Objek top-level pertama: dokumen {"metadata", "frames"} atau
+            # header JSONL {"metadata"}; isi "frames" di-stream per elemen
+            scanner.expect("{")
+            while scanner.peek() != "}":
+                key = scanner.decode_value()
+                scanner.expect(":")
+                if key == "frames":
+                    scanner.expect("[")
+                    while scanner.peek() != "]":
+                        yield scanner.decode_value()
+                        if scanner.peek() == ",":
+                            scanner.expect(",")
+                    scanner.expect("]")
+                else:
+                    value = scanner.decode_value()
+                    if key == "metadata":
+                        self.metadata = value
+                if scanner.peek() == ",":
+                    scanner.expect(",")
+            scanner.expect("}")
+
+            # JSONL: sisa file berisi satu objek per baris
+            while scanner.peek() is not None:
+                obj = scanner.decode_value()
+                if "summary" in obj and "t" not in obj:
+                    self.summary = obj["summary"]
+                else:
+                    yield obj
+
+
+def iter_frames(path: str, start: int | None = None, stop: int | None = None):
+    """Iterasi frame sebuah trace (dokumen JSON atau JSONL) secara streaming."""
+    return iter(TraceReader(path, start=start, stop=stop))
+
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+class _JsonScanner:
+    """Buffer teks bergeser di atas file dengan decode nilai JSON satu per satu."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, f, chunk_size, max_record):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.max_record = max_record
+        self.buf = ""
+        self.pos = 0
+        self.dropped = 0  # Karakter sebelum awal buf yang sudah dibuang
+        self.eof = False
+
+    @property
+    def offset(self) -> int:
+        """Posisi baca di file (trace ditulis json.dumps ASCII, jadi karakter = byte)."""
+        return self.dropped + self.pos
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.dropped += self.pos
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Karakter non-spasi berikutnya (None di akhir file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed trace at byte offset {self.offset}: "
+                             f"expected {char!r}, got {found!r}")
+        self.pos += 1
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Nilai terpotong di akhir buffer: baca chunk berikutnya, tetapi
+                # jangan menampung file rusak sampai habis
+                if len(self.buf) - self.pos > self.max_record:
+                    raise ValueError(f"Malformed trace at byte offset {self.offset}: record "
+                                     f"exceeds {self.max_record} characters") from None
+                if not self._fill():
+                    raise ValueError(f"Malformed trace at byte offset {self.offset}") from None
+                continue
+            # Angka di ujung buffer bisa saja belum lengkap
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
@@ -0,0 +1,251 @@
+"""
+Environment reset/step (gaya Gym) untuk melatih controller lampu.
+
+Observasi per environment adalah array float32 berukuran OBS_SIZE:
+
+    [0:4]  antrian per arah (urutan DIRECTIONS)
+    [4]    kode fase hijau saat ini (indeks DIRECTIONS)
+    [5]    detik sejak fase saat ini mulai hijau
+    [6:10] estimasi laju kedatangan per arah (EWMA)
+
+Dua jenis aksi (action_mode):
+
+    "phase":    kode arah yang hijau untuk 1 detik berikutnya; satu step = 1 detik.
+    "duration": durasi hijau (detik) untuk fase berikutnya di PHASE_ORDER;
+                satu step berjalan sampai hijau itu habis (satu keputusan).
+
+Reward = -(jumlah antrian setiap detik) selama step, yaitu minus total
+delay mobil-detik. Episode di-truncate setelah episode_ticks detik.
+
+TrafficEnv memakai Intersection dan generate_arrivals langsung;
+VectorTrafficEnv menjalankan n environment sebagai array dalam satu
+panggilan NumPy per detik (satu Generator untuk seluruh batch, sehingga
+dengan n=1 dan seed sama trajektorinya identik dengan TrafficEnv).
+"""
+import numpy as np
+
+from src.intersection import DIRECTION_INDEX, Intersection
+from src.simulation import ARRIVAL_RATE, DEPARTURE_RATE, PHASE_ORDER
+from src.traffic_gen import generate_arrivals
+
+OBS_SIZE = 10
+ACTION_MODES = ("phase", "duration")
+_PHASE_CODES = np.array([DIRECTION_INDEX[p] for p in PHASE_ORDER], dtype=np.int64)
+
+
+def _check_options(action_mode, episode_ticks, rate_alpha):
+    if action_mode not in ACTION_MODES:
+        raise ValueError(f"action_mode must be one of {ACTION_MODES}.")
+    if episode_ticks < 1:
+        raise ValueError("episode_ticks must be at least 1.")
+    if not 0 < rate_alpha <= 1:
+        raise ValueError("rate_alpha must be in (0, 1].")
+
+
+def _check_actions(actions, action_mode):
+    """
+    Validasi aksi terhadap action space: kode arah 0..3 ("phase") atau
+    durasi bilangan bulat >= 0 ("duration"; 0 dibulatkan ke 1 detik).
+    Returns aksi sebagai int64; ValueError menyebut aksi pertama yang salah.
+    """
+    raw = np.asarray(actions)
+    if raw.dtype.kind not in "biuf":
+        raise ValueError(f"Actions must be integers, got dtype {raw.dtype}.")
+    with np.errstate(invalid="ignore"):
+        actions = raw.astype(np.int64)
+    bad = actions != raw
+    if action_mode == "phase":
+        bad |= (actions < 0) | (actions >= len(DIRECTION_INDEX))
+        space = f"phase actions must be direction codes 0..{len(DIRECTION_INDEX) - 1}"
+    else:
+        bad |= actions < 0
+        space = "duration actions must be integers >= 0"
+    if bad.any():
+        if raw.ndim == 0:
+            raise ValueError(f"Invalid action {raw.item()}: {space}.")
+        index = np.flatnonzero(bad)[0]
+        raise ValueError(f"Invalid action {raw.flat[index].item()} at index {index}: {space}.")
+    return actions
+
+
+class TrafficEnv:
+    """
+    Satu persimpangan dengan antarmuka reset() / step(action).
+
+    Args:
+        arrival_rate: laju Poisson per arah (skalar atau 4 nilai).
+        action_mode: "phase" atau "duration" (lihat docstring modul).
+        episode_ticks: panjang episode (detik).
+        rate_alpha: faktor EWMA estimasi laju kedatangan.
+        seed: seed Generator environment.
+    """
+
+    def __init__(self, arrival_rate=ARRIVAL_RATE, action_mode: str = "phase",
+                 episode_ticks: int = 3600, rate_alpha: float = 0.05, seed=None):
+        _check_options(action_mode, episode_ticks, rate_alpha)
+        self.arrival_rate = np.broadcast_to(np.asarray(arrival_rate, dtype=float), (4,))
+        self.action_mode = action_mode
+        self.episode_ticks = episode_ticks
+        self.rate_alpha = rate_alpha
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Mulai episode baru. Returns (obs, info)."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.intersection = Intersection()
+        self.intersection.set_green_light(0, PHASE_ORDER[0])
+        self.phase_idx = 0
+        self.phase_time = 0
+        self.rate_estimate = self.arrival_rate.astype(float)
+        self.t = 0
+        return self._obs(), {"t": self.t}
+
+    def _obs(self):
+        obs = np.empty(OBS_SIZE, dtype=np.float32)
+        obs[0:4] = self.intersection.counts
+        obs[4] = self.intersection.phase
+        obs[5] = self.phase_time
+        obs[6:10] = self.rate_estimate
+        return obs
+
+    def _tick(self):
+        arrivals = [generate_arrivals(rate, self.rng) for rate in self.arrival_rate]
+        self.intersection.add_counts(arrivals)
+        self.intersection.step_into([0, 0, 0, 0], DEPARTURE_RATE)
+        self.rate_estimate += self.rate_alpha * (np.asarray(arrivals) - self.rate_estimate)
+        self.phase_time += 1
+        self.t += 1
+        return sum(self.intersection.counts)
+
+    def step(self, action):
+        """Returns (obs, reward, terminated, truncated, info)."""
+        action = int(_check_actions(action, self.action_mode))
+        delay = 0
+        if self.action_mode == "phase":
+            phase = action
+            if phase != self.intersection.phase:
+                self.phase_time = 0
+            self.intersection.set_green_light(1, phase)
+            delay += self._tick()
+        else:
+            self.intersection.set_green_light(max(action, 1), PHASE_ORDER[self.phase_idx])
+            while self.intersection.green_timer > 0:
+                delay += self._tick()
+            # Fase berikutnya menunggu keputusan durasi
+            self.phase_idx = (self.phase_idx + 1) % len(PHASE_ORDER)
+            self.intersection.set_green_light(0, PHASE_ORDER[self.phase_idx])
+            self.phase_time = 0
+        truncated = self.t >= self.episode_ticks
+        return self._obs(), -float(delay), False, truncated, {"t": self.t}
+
+
+class VectorTrafficEnv:
+    """
+    n environment TrafficEnv sebagai array, dimajukan bersama.
+
+    step(actions) menerima array (n,) dan mengembalikan obs (n, OBS_SIZE),
+    reward (n,), terminated (n,), truncated (n,), info. Environment yang
+    ter-truncate langsung di-reset; observasi terakhirnya ada di
+    info["final_obs"].
+
+    Args:
+        n_envs: jumlah environment.
+        arrival_rate: skalar, (4,) atau (n_envs, 4).
+        (lainnya sama dengan TrafficEnv)
+    """
+
+    def __init__(self, n_envs: int, arrival_rate=ARRIVAL_RATE, action_mode: str = "phase",
+                 episode_ticks: int = 3600, rate_alpha: float = 0.05, seed=None):
+        _check_options(action_mode, episode_ticks, rate_alpha)
+        if n_envs < 1:
+            raise ValueError("n_envs must be at least 1.")
+        self.n_envs = n_envs
+        self.arrival_rate = np.array(np.broadcast_to(np.asarray(arrival_rate, dtype=float),
+                                                     (n_envs, 4)))
+        self.action_mode = action_mode
+        self.episode_ticks = episode_ticks
+        self.rate_alpha = rate_alpha
+        self.rng = np.random.default_rng(seed)
+        self._rows = np.arange(n_envs)
+        self.counts = np.zeros((n_envs, 4), dtype=np.int64)
+        self.phase = np.zeros(n_envs, dtype=np.int64)  # Kode arah hijau
+        self.phase_idx = np.zeros(n_envs, dtype=np.int64)
+        self.phase_time = np.zeros(n_envs, dtype=np.int64)
+        self.rate_estimate = np.zeros((n_envs, 4))
+        self.t = np.zeros(n_envs, dtype=np.int64)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Reset semua environment. Returns (obs, info)."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_rows(self._rows)
+        return self._obs(), {"t": self.t.copy()}
+
+    def _reset_rows(self, rows):
+        self.counts[rows] = 0
+        self.phase_idx[rows] = 0
+        self.phase[rows] = _PHASE_CODES[0]
+        self.phase_time[rows] = 0
+        self.rate_estimate[rows] = self.arrival_rate[rows]
+        self.t[rows] = 0
+
+    def _obs(self):
+        obs = np.empty((self.n_envs, OBS_SIZE), dtype=np.float32)
+        obs[:, 0:4] = self.counts
+        obs[:, 4] = self.phase
+        obs[:, 5] = self.phase_time
+        obs[:, 6:10] = self.rate_estimate
+        return obs
+
+    def _tick(self, active=None):
+        """Satu detik untuk semua environment (atau hanya baris dengan mask `active` = 1)."""
+        step = 1 if active is None else active
+        arrivals = self.rng.poisson(self.arrival_rate)
+        if active is not None:
+            arrivals *= active[:, None]
+        counts = self.counts
+        counts += arrivals
+        green = counts[self._rows, self.phase]
+        departed = np.minimum(green, DEPARTURE_RATE) * step
+        counts[self._rows, self.phase] = green - departed
+        alpha = self.rate_alpha if active is None else self.rate_alpha * active[:, None]
+        self.rate_estimate += alpha * (arrivals - self.rate_estimate)
+        self.phase_time += step
+        self.t += step
+        return counts.sum(axis=1) * step
+
+    def step(self, actions):
+        """Returns (obs, reward, terminated, truncated, info); actions berbentuk (n_envs,)."""
+        actions = _check_actions(actions, self.action_mode)
+        if actions.shape != (self.n_envs,):
+            raise ValueError(f"actions must have shape ({self.n_envs},), got {actions.shape}.")
+        if self.action_mode == "phase":
+            switched = actions != self.phase
+            self.phase_time[switched] = 0
+            self.phase[:] = actions
+            delay = self._tick()
+        else:
+            remaining = np.maximum(actions, 1)
+            delay = np.zeros(self.n_envs, dtype=np.int64)
+            while True:
+                active = remaining > 0
+                if not active.any():
+                    break
+                delay += self._tick(active.astype(np.int64))
+                remaining -= active
+            self.phase_idx = (self.phase_idx + 1) % len(PHASE_ORDER)
+            self.phase = _PHASE_CODES[self.phase_idx]
+            self.phase_time[:] = 0
+
+        obs = self._obs()
+        truncated = self.t >= self.episode_ticks
+        info = {"t": self.t.copy()}
+        if truncated.any():
+            info["final_obs"] = obs.copy()
+            done = np.flatnonzero(truncated)
+            self._reset_rows(done)
+            obs[done] = self._obs()[done]
+        return obs, -delay.astype(float), np.zeros(self.n_envs, dtype=bool), truncated, info
@@ -1,15 +1,19 @@
 import numpy as np
 
-def generate_arrivals(lambda_rate: float) -> int:
+def generate_arrivals(lambda_rate: float, rng=None) -> int:
     """
     Generate the number of car arrivals based on a Poisson distribution.
     
     Args:
         lambda_rate (float): The average number of arrivals per time step.
+        rng (np.random.Generator, optional): Random generator to draw from.
+            Defaults to the global NumPy RNG.
         
     Returns:
         int: The number of cars arriving.
     """
     if lambda_rate < 0:
         raise ValueError("Lambda rate must be non-negative.")
-    return int(np.random.poisson(lambda_rate))
+    if rng is None:
+        rng = np.random
+    return int(rng.poisson(lambda_rate))
@@ -173,17 +173,16 @@ class DataDrivenScene(Scene):
     """
     
     def construct(self):
-        import json
         import os
+        from trace_io import TraceReader
         
         # Get JSON path from environment variable or use default
         # json_path = os.environ.get("JSON_PATH", "../docs/simulation_data_schema.json")
         # json_path = os.environ.get("JSON_PATH", "../docs/simulation_data_fixed.json")
         json_path = os.environ.get("JSON_PATH", "../docs/simulation_data_fuzzy.json")
         
-        # Load simulation data
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        # Load simulation data (streaming; delta-encoded traces decoded lazily)
+        frames = TraceReader(json_path)
         
         # 1. Setup roads and lights
         road_v = Rectangle(width=2, height=16, color=WHITE, fill_opacity=0)
@@ -236,7 +235,7 @@ class DataDrivenScene(Scene):
         colors = {"N": BLUE, "S": RED, "E": GREEN, "W": ORANGE}
         
         # 3. Process each frame
-        for frame in data["frames"]:
+        for frame in frames:
             t = frame["t"]
             state = frame["traffic_state"]
             new_phase = state["current_phase"]
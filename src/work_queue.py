@@ -0,0 +1,229 @@
+"""
+Antrian job simulasi berbasis SQLite untuk sweep besar.
+
+Satu file database (lokal atau di filesystem bersama) berisi tabel jobs.
+Worker mana pun (proses lain, host lain yang me-mount storage yang sama)
+mengklaim job secara atomik lewat transaksi BEGIN IMMEDIATE, menjalankan
+run_simulation, lalu menulis hasil. Selama job berjalan, thread heartbeat
+memperbarui kolom heartbeat; job "running" yang heartbeat-nya lebih tua
+dari lease_seconds dianggap milik worker yang crash dan diklaim ulang.
+Setelah max_attempts klaim, job ditandai "failed".
+
+Database memakai journal rollback bawaan SQLite (bukan WAL), karena WAL
+butuh shared memory yang tidak tersedia lintas host di filesystem jaringan.
+
+Status job: pending -> running -> done / failed (atau kembali ke pending
+jika run gagal dan percobaan masih tersisa).
+"""
+import functools
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+from src.arrival_sources import ArrayArrivals
+from src.results_store import ResultsStore
+from src.simulation import SIMULATION_DURATION, run_simulation
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    config TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    heartbeat REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, heartbeat);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _jsonable(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def run_job(config: dict, store=None) -> dict:
+    """
+    Jalankan satu job: kwargs run_simulation (export dimatikan), plus
+    opsional arrival_rate (kedatangan Poisson per arah dengan seed job).
+    Jika store (ResultsStore) diberikan, run juga dicatat di sana.
+    """
+    config = dict(config)
+    rate = config.pop("arrival_rate", None)
+    if rate is not None:
+        duration = config.get("duration") or SIMULATION_DURATION
+        counts = np.random.default_rng(config.get("seed")).poisson(rate, size=(duration, 4))
+        config["arrivals"] = ArrayArrivals(counts)
+        config["tags"] = {"arrival_rate": rate}
+    config.setdefault("export", False)
+    stats = run_simulation(store=store, **config)
+    return {key: _jsonable(value) for key, value in stats.items()}
+
+
+class WorkQueue:
+    """
+    Handle ke database antrian job. Aman dipakai banyak proses sekaligus;
+    satu instance per thread (koneksi sqlite3 tidak dibagi antar thread).
+
+    Args:
+        path: file database SQLite (dibuat jika belum ada).
+        lease_seconds: umur heartbeat maksimum sebelum job diklaim ulang.
+        max_attempts: jumlah klaim maksimum per job.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, configs) -> list[int]:
+        """Tambahkan job (list of dict kwargs run_job). Returns id job."""
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        ids = []
+        for config in configs:
+            cur.execute("INSERT INTO jobs (config) VALUES (?)", (json.dumps(config),))
+            ids.append(cur.lastrowid)
+        cur.execute("COMMIT")
+        return ids
+
+    def claim(self, worker: str):
+        """
+        Klaim satu job pending (atau running dengan lease kedaluwarsa).
+        Returns (job_id, config) atau None jika tidak ada yang bisa diklaim.
+        """
+        now = time.time()
+        expired = now - self.lease_seconds
+        cur = self.conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            # Lease habis dan percobaan sudah habis: menyerah
+            cur.execute("UPDATE jobs SET status = 'failed', error = 'lease expired' "
+                        "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+                        (expired, self.max_attempts))
+            row = cur.execute("SELECT id, config FROM jobs WHERE status = 'pending' "
+                              "OR (status = 'running' AND heartbeat < ?) ORDER BY id LIMIT 1",
+                              (expired,)).fetchone()
+            if row is not None:
+                cur.execute("UPDATE jobs SET status = 'running', worker = ?, heartbeat = ?, "
+                            "attempts = attempts + 1 WHERE id = ?", (worker, now, row[0]))
+            cur.execute("COMMIT")
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Perpanjang lease. False jika job sudah bukan milik worker ini."""
+        cur = self.conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? "
+                                "AND status = 'running'", (time.time(), job_id, worker))
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: dict) -> bool:
+        """Simpan hasil. False (hasil dibuang) jika lease sudah diambil worker lain."""
+        cur = self.conn.execute("UPDATE jobs SET status = 'done', result = ?, error = NULL "
+                                "WHERE id = ? AND worker = ? AND status = 'running'",
+                                (json.dumps(result), job_id, worker))
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str):
+        """Catat kegagalan; job kembali pending jika percobaan masih tersisa."""
+        self.conn.execute("UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' "
+                          "ELSE 'pending' END, error = ?, worker = NULL "
+                          "WHERE id = ? AND worker = ? AND status = 'running'",
+                          (self.max_attempts, error, job_id, worker))
+
+    def counts(self) -> dict:
+        """Jumlah job per status."""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return dict(rows.fetchall())
+
+    def results(self) -> list[dict]:
+        """Job selesai: list dict {id, config, result, attempts}, urut id."""
+        rows = self.conn.execute("SELECT id, config, result, attempts FROM jobs "
+                                 "WHERE status = 'done' ORDER BY id")
+        return [{"id": i, "config": json.loads(c), "result": json.loads(r), "attempts": a}
+                for i, c, r, a in rows]
+
+
+def _heartbeat_loop(path, job_id, worker, interval, stop):
+    with WorkQueue(path) as queue:
+        while not stop.wait(interval):
+            if not queue.heartbeat(job_id, worker):
+                return
+
+
+def run_worker(path: str, worker: str | None = None, lease_seconds: float = 60.0,
+               max_attempts: int = 3, poll: float = 1.0, runner=run_job,
+               max_jobs: int | None = None, store: str | None = None) -> int:
+    """
+    Loop worker: klaim, jalankan (dengan heartbeat tiap lease_seconds / 3),
+    tulis hasil. Berhenti jika tidak ada job pending/running tersisa atau
+    setelah max_jobs job. Returns jumlah job yang diselesaikan worker ini.
+
+    store: path ResultsStore; jika diisi, runner dipanggil dengan
+    store=ResultsStore(store) sehingga setiap run ikut tercatat (job yang
+    diklaim ulang setelah crash bisa tercatat dua kali; kolom seed/config
+    bisa dipakai untuk dedup).
+    """
+    worker = worker or default_worker_id()
+    finished = 0
+    results = ResultsStore(store) if store is not None else None
+    if results is not None:
+        runner = functools.partial(runner, store=results)
+    with WorkQueue(path, lease_seconds, max_attempts) as queue:
+        while max_jobs is None or finished < max_jobs:
+            claimed = queue.claim(worker)
+            if claimed is None:
+                counts = queue.counts()
+                if not counts.get("pending") and not counts.get("running"):
+                    break
+                # Job running milik worker lain mungkin nanti perlu diklaim ulang
+                time.sleep(poll)
+                continue
+            job_id, config = claimed
+            stop = threading.Event()
+            beat = threading.Thread(target=_heartbeat_loop, daemon=True,
+                                    args=(path, job_id, worker, lease_seconds / 3, stop))
+            beat.start()
+            try:
+                result = runner(config)
+            except Exception as exc:
+                queue.fail(job_id, worker, f"{type(exc).__name__}: {exc}")
+                continue
+            finally:
+                stop.set()
+                beat.join()
+            if queue.complete(job_id, worker, result):
+                finished += 1
+    if results is not None:
+        results.close()
+    return finished
+
+
+if __name__ == "__main__":
+    # python -m src.work_queue <database> [results.db] : jalankan satu worker sampai antrian habis
+    done = run_worker(sys.argv[1], store=sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Worker selesai: {done} job")
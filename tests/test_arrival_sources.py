@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from src.arrival_sources import ArrayArrivals, ArrivalSource, TraceArrivals
+from src.simulation import run_simulation
+
+def write_csv(path, rows):
+    with open(path, "w") as f:
+        f.write("timestamp,N,S,E,W\n")
+        for i, r in enumerate(rows):
+            f.write(f"{i},{r[0]},{r[1]},{r[2]},{r[3]}\n")
+
+def test_csv_trace_streams_in_chunks(tmp_path):
+    rows = np.arange(40).reshape(10, 4)
+    path = tmp_path / "counts.csv"
+    write_csv(path, rows)
+    source = TraceArrivals(str(path), chunk_rows=3)
+    chunks = list(source.chunks())
+    assert max(len(c) for c in chunks) == 3
+    assert np.array_equal(np.concatenate(chunks), rows)
+
+def test_npy_trace_matches_csv(tmp_path):
+    rows = np.random.default_rng(0).poisson(2, size=(25, 4))
+    write_csv(tmp_path / "c.csv", rows)
+    np.save(tmp_path / "c.npy", rows)
+    a = np.array(list(TraceArrivals(str(tmp_path / "c.csv"), chunk_rows=7)))
+    b = np.array(list(TraceArrivals(str(tmp_path / "c.npy"), chunk_rows=7)))
+    assert np.array_equal(a, b)
+
+@pytest.mark.parametrize("resample", ["even", "random"])
+def test_coarse_interval_spread_preserves_totals(tmp_path, resample):
+    rows = np.array([[60, 0, 7, 1], [5, 5, 5, 5]])
+    np.save(tmp_path / "m.npy", rows)
+    source = TraceArrivals(str(tmp_path / "m.npy"), interval=60, resample=resample,
+                           rng=np.random.default_rng(1))
+    ticks = np.array(list(source))
+    assert ticks.shape == (120, 4)
+    assert np.array_equal(ticks[:60].sum(axis=0), rows[0])
+    assert np.array_equal(ticks[60:].sum(axis=0), rows[1])
+
+def test_fine_interval_aggregates_across_chunks(tmp_path):
+    rows = np.ones((9, 4), dtype=int)
+    np.save(tmp_path / "f.npy", rows)
+    source = TraceArrivals(str(tmp_path / "f.npy"), interval=0.5, chunk_rows=4)
+    ticks = np.array(list(source))
+    assert ticks.tolist() == [[2] * 4] * 4 + [[1] * 4]
+
+def test_invalid_trace_arguments(tmp_path):
+    np.save(tmp_path / "x.npy", np.zeros((2, 4), dtype=int))
+    with pytest.raises(ValueError):
+        TraceArrivals(str(tmp_path / "x.npy"), interval=0.3)
+    with pytest.raises(FileNotFoundError):
+        TraceArrivals(str(tmp_path / "missing.csv"))
+
+def test_run_simulation_replays_trace_until_exhausted():
+    counts = np.zeros((50, 4), dtype=int)
+    counts[0] = [3, 0, 0, 0]
+    stats = run_simulation(mode="FIXED", export=False, arrivals=ArrayArrivals(counts))
+    # Semua 3 mobil N keluar pada detik 0, 1, 2 (fase awal N)
+    assert stats["served"] == 3
+    assert stats["avg_wait"] == 1
+
+def test_arrival_source_requires_chunks():
+    class Incomplete(ArrivalSource):
+        pass
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from src.checkpoint import run_checkpointed, resume, load_checkpoint
+from src.demand_profiles import PiecewiseProfile, ProfileArrivals
+from src.simulation import Simulation
+
+def crash_at(monkeypatch, t_crash):
+    original_step = Simulation.step
+
+    def step(self):
+        if self.t == t_crash:
+            raise KeyboardInterrupt("pre-empted")
+        return original_step(self)
+
+    monkeypatch.setattr(Simulation, "step", step)
+    return original_step
+
+@pytest.mark.parametrize("mode", ["FIXED", "FUZZY"])
+def test_resume_is_byte_identical(tmp_path, monkeypatch, mode):
+    ref = tmp_path / "ref.jsonl"
+    out = tmp_path / "run.jsonl"
+    ckpt = tmp_path / "run.ckpt"
+    stats_ref = run_checkpointed(mode, duration=400, trace_path=str(ref),
+                                 checkpoint_path=str(tmp_path / "ref.ckpt"),
+                                 checkpoint_every=100, seed=7)
+
+    original_step = crash_at(monkeypatch, 257)
+    with pytest.raises(KeyboardInterrupt):
+        run_checkpointed(mode, duration=400, trace_path=str(out), checkpoint_path=str(ckpt),
+                         checkpoint_every=100, seed=7)
+    assert load_checkpoint(str(ckpt))["simulation"]["t"] == 200
+
+    monkeypatch.setattr(Simulation, "step", original_step)
+    stats = resume(str(ckpt))
+    assert out.read_bytes() == ref.read_bytes()
+    assert stats["avg_wait"] == stats_ref["avg_wait"]
+
+def test_resume_with_arrival_source(tmp_path, monkeypatch):
+    def source():
+        profile = PiecewiseProfile([0], [0.3], period=None)
+        return ProfileArrivals(profile, duration=300, chunk_rows=64,
+                               rng=np.random.default_rng(11))
+
+    ref = tmp_path / "ref.jsonl"
+    run_checkpointed("FIXED", trace_path=str(ref), checkpoint_path=str(tmp_path / "r.ckpt"),
+                     checkpoint_every=50, arrivals=source(), seed=1)
+
+    out = tmp_path / "run.jsonl"
+    original_step = crash_at(monkeypatch, 130)
+    with pytest.raises(KeyboardInterrupt):
+        run_checkpointed("FIXED", trace_path=str(out), checkpoint_path=str(tmp_path / "c.ckpt"),
+                         checkpoint_every=50, arrivals=source(), seed=1)
+    monkeypatch.setattr(Simulation, "step", original_step)
+    resume(str(tmp_path / "c.ckpt"))
+    assert out.read_bytes() == ref.read_bytes()
+
+def test_state_roundtrip_preserves_queues():
+    sim = Simulation(mode="FIXED", fixed_duration=40, seed=3)
+    for _ in range(150):
+        sim.step()
+    clone = Simulation.from_state(sim.state_dict())
+    assert {d: list(q) for d, q in clone.queue_ids.items()} == \
+        {d: list(q) for d, q in sim.queue_ids.items()}
+    assert [clone.step() for _ in range(50)] == [sim.step() for _ in range(50)]
+
+def test_snapshot_size_does_not_grow_with_time(tmp_path):
+    from src.checkpoint import save_checkpoint
+    from src.demand_profiles import DAY
+    profile = PiecewiseProfile([0, DAY / 2], [0.05, 0.1])
+    arrivals = ProfileArrivals(profile, duration=2 * DAY, rng=np.random.default_rng(0))
+    sim = Simulation("FIXED", arrivals=arrivals, seed=0)
+    sizes = []
+    for t in (2000, 20000):
+        sim.run(t - sim.t)
+        path = tmp_path / f"{t}.ckpt"
+        save_checkpoint(str(path), sim, {}, 0)
+        sizes.append(path.stat().st_size)
+    assert arrivals._period_rates is not None  # Cache dipakai selama run...
+    restored = load_checkpoint(str(path))["simulation"]
+    assert restored["arrivals"]._period_rates is None  # ...tetapi tidak ikut disimpan
+    assert sizes[1] < 1.5 * sizes[0]
+    resumed = Simulation.from_state(restored)
+    assert resumed.stats() == sim.stats()
+    assert resumed.step() == sim.step()
+
+def test_delta_trace_and_rate_estimate_survive_resume(tmp_path, monkeypatch):
+    options = dict(duration=300, checkpoint_every=70, seed=2, rate_estimate="ewma",
+                   encoding="delta", keyframe_every=50)
+    ref = tmp_path / "ref.jsonl"
+    run_checkpointed("FUZZY", trace_path=str(ref), checkpoint_path=str(tmp_path / "r.ckpt"),
+                     **options)
+    out = tmp_path / "run.jsonl"
+    ckpt = tmp_path / "c.ckpt"
+    original_step = crash_at(monkeypatch, 180)
+    with pytest.raises(KeyboardInterrupt):
+        run_checkpointed("FUZZY", trace_path=str(out), checkpoint_path=str(ckpt), **options)
+    assert load_checkpoint(str(ckpt))["simulation"]["rate_estimate"] == "ewma"
+    monkeypatch.setattr(Simulation, "step", original_step)
+    resume(str(ckpt))
+    assert out.read_bytes() == ref.read_bytes()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from src.comparison import paired_comparison, replication_seeds
+from src.simulation import stream_simulation
+from src.stats import mean_confidence_interval
+
+def test_same_seed_gives_identical_traffic_across_controllers():
+    spawns = {}
+    for mode in ("FIXED", "FUZZY"):
+        frames = stream_simulation(mode=mode, duration=200, seed=42)
+        spawns[mode] = [(f["t"], e["car_id"], e["destination"]) for f in frames
+                        for e in f["car_events"]]
+    assert spawns["FIXED"] == spawns["FUZZY"]
+
+def test_replication_seeds_are_distinct_and_reproducible():
+    seeds = replication_seeds(20, base_seed=3)
+    assert len(set(seeds)) == 20
+    assert seeds == replication_seeds(20, base_seed=3)
+
+def test_confidence_interval():
+    mean, hw = mean_confidence_interval([1.0, 2.0, 3.0])
+    assert mean == 2.0
+    assert hw == pytest.approx(2.4841, rel=1e-3)
+    assert mean_confidence_interval([5.0])[1] == float("inf")
+
+def test_paired_comparison_identical_modes_have_zero_difference():
+    report = paired_comparison(n_replications=3, mode_a="FIXED", mode_b="FIXED", duration=150)
+    for kpi in ("avg_wait", "served", "leftover"):
+        assert report[kpi]["mean_diff"] == 0
+        assert report[kpi]["half_width"] == 0
+
+def test_paired_comparison_reports_ci():
+    report = paired_comparison(n_replications=4, duration=200)
+    low, high = report["avg_wait"]["ci"]
+    assert low <= report["avg_wait"]["mean_diff"] <= high
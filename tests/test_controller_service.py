@@ -0,0 +1,97 @@
+import asyncio
+import json
+import numpy as np
+import pytest
+from src.controller_service import ControllerService, ControllerClient, simulate_intersections
+from src.fuzzy_module import get_green_duration, get_green_durations
+
+def test_batched_durations_match_scalar():
+    queues = [0, 12, 30, 50, 12]
+    arrivals = [0.4, 0.4, 0.5, 0.8, 0.4]
+    batch = get_green_durations(queues, arrivals)
+    assert list(batch) == [get_green_duration(q, a) for q, a in zip(queues, arrivals)]
+
+def test_service_coalesces_requests():
+    async def scenario():
+        async with ControllerService(batch_window=60, max_batch=250) as service:
+            # Semua request sudah antre sebelum batcher sempat berjalan,
+            # jadi ukuran batch hanya ditentukan max_batch
+            answers = await asyncio.gather(*(service.request(q % 60, 0.4) for q in range(1000)))
+            return answers, service.metrics()
+
+    answers, metrics = asyncio.run(scenario())
+    assert metrics["requests"] == 1000
+    assert metrics["batches"] == 4
+    assert answers == [get_green_duration(q % 60, 0.4) for q in range(1000)]
+
+def test_simulated_intersections_get_scalar_answers():
+    async def scenario():
+        async with ControllerService(batch_window=0.01) as service:
+            return await simulate_intersections(service.request, n_intersections=100,
+                                                switches_each=2)
+
+    decisions = asyncio.run(scenario())
+    assert len(decisions) == 200
+    for queue, arrival, duration in decisions[:50]:
+        assert duration == get_green_duration(queue, arrival)
+
+def test_service_over_tcp():
+    async def scenario():
+        async with ControllerService() as service:
+            server = await service.serve_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            client = await ControllerClient.connect_tcp("127.0.0.1", port)
+            answers = await asyncio.gather(*(client.request(q, 0.4) for q in range(20)))
+            await client.close()
+            return answers
+
+    answers = asyncio.run(scenario())
+    assert answers == [get_green_duration(q, 0.4) for q in range(20)]
+
+def test_malformed_request_does_not_stop_service():
+    async def scenario():
+        async with ControllerService() as service:
+            with pytest.raises(ValueError):
+                await service.request("abc", 0.1)
+            server = await service.serve_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = []
+            for line in ('{"id": 1, "queue": "abc", "arrival": 0.1}',
+                         '{"id": 2, "queue": null, "arrival": 0.1}',
+                         '{"id": 3, "queue": 12, "arrival": 0.4}'):
+                writer.write((line + "\n").encode())
+                await writer.drain()
+                replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+            writer.close()
+            await writer.wait_closed()
+            return replies
+
+    bad1, bad2, good = asyncio.run(scenario())
+    assert bad1["id"] == 1 and "error" in bad1
+    assert bad2["id"] == 2 and "error" in bad2
+    assert good == {"id": 3, "duration": get_green_duration(12, 0.4)}
+
+@pytest.mark.parametrize("reply", [b"", b"not json\n"])
+def test_client_fails_pending_requests_when_reply_stream_breaks(reply):
+    async def scenario():
+        async def handler(reader, writer):
+            await reader.readline()
+            writer.write(reply)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = await ControllerClient.connect_tcp("127.0.0.1", port)
+        try:
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(client.request(12, 0.4), 5)
+            with pytest.raises(ConnectionError):
+                await client.request(12, 0.4)
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
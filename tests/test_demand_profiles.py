@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from src.demand_profiles import (
+    DAY, HOUR, WEEK, DemandProfile, PiecewiseProfile, SmoothProfile, ProfileArrivals, rush_hour_profile
+)
+from src.simulation import run_simulation
+
+def test_piecewise_linear_interpolates_and_wraps():
+    profile = PiecewiseProfile([0, 12 * HOUR], [0.1, 0.5])
+    rates = profile.rates(np.array([6 * HOUR, 12 * HOUR, 18 * HOUR, DAY + 6 * HOUR]))
+    assert np.allclose(rates[:, 0], [0.3, 0.5, 0.3, 0.3])
+
+def test_piecewise_step_per_direction():
+    profile = PiecewiseProfile([0, 100], [[0.1, 0.2, 0.3, 0.4], [1, 1, 1, 1]],
+                               period=200, kind="step")
+    assert np.allclose(profile.tick_rates(99, 2), [[0.1, 0.2, 0.3, 0.4], [1, 1, 1, 1]])
+
+def test_piecewise_step_before_first_breakpoint():
+    periodic = PiecewiseProfile([6 * HOUR, 18 * HOUR], [0.4, 0.1], kind="step")
+    rates = periodic.rates(np.array([3 * HOUR, 12 * HOUR, 20 * HOUR, DAY + 3 * HOUR]))
+    assert np.allclose(rates[:, 0], [0.1, 0.4, 0.1, 0.1])
+    # Tanpa period: nilai breakpoint pertama berlaku juga sebelum breakpoint itu
+    once = PiecewiseProfile([6 * HOUR, 18 * HOUR], [0.4, 0.1], period=None, kind="step")
+    assert np.allclose(once.rates(np.array([3 * HOUR]))[:, 0], [0.4])
+
+def test_invalid_profiles():
+    with pytest.raises(ValueError):
+        PiecewiseProfile([0, 0], [0.1, 0.2])
+    with pytest.raises(ValueError):
+        SmoothProfile(base=-0.1)
+    with pytest.raises(TypeError):
+        DemandProfile()
+
+def test_rush_hour_peaks():
+    rates = rush_hour_profile().rates(np.array([3 * HOUR, 7.5 * HOUR, 17.5 * HOUR]))[:, 0]
+    assert rates[1] > 3 * rates[0] and rates[2] > rates[1]
+
+def test_week_long_arrivals_match_expected_volume():
+    profile = rush_hour_profile()
+    source = ProfileArrivals(profile, duration=WEEK, rng=np.random.default_rng(0))
+    chunks = list(source.chunks())
+    counts = np.concatenate(chunks)
+    assert counts.shape == (WEEK, 4)
+    expected = profile.tick_rates(0, DAY).sum(axis=0) * 7
+    assert np.allclose(counts.sum(axis=0), expected, rtol=0.02)
+
+def test_simulation_runs_whole_profile():
+    profile = PiecewiseProfile([0], [0.2], period=None)
+    source = ProfileArrivals(profile, duration=500, rng=np.random.default_rng(3))
+    stats = run_simulation(mode="FIXED", export=False, arrivals=source)
+    assert stats["served"] + stats["leftover"] > 0
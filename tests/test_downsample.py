@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from src.downsample import downsample, lttb_indices, minmax_indices
+
+def _series(n=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n), np.cumsum(rng.integers(-3, 4, size=n))
+
+def test_short_series_unchanged():
+    x, y = _series(500)
+    for method in ("minmax", "lttb"):
+        xs, ys = downsample(x, y, 1000, method)
+        assert np.array_equal(xs, x) and np.array_equal(ys, y)
+    with pytest.raises(ValueError):
+        downsample(x, y, 100, "mean")
+
+def test_minmax_keeps_bucket_extremes():
+    x, y = _series()
+    index = minmax_indices(y, 1000)
+    assert len(index) <= 1000 and np.all(np.diff(index) > 0)
+    assert index[0] == 0 and index[-1] == len(y) - 1
+    assert y[index].max() == y.max() and y[index].min() == y.min()
+    # Setiap bucket: min dan max-nya ada di hasil
+    edges = np.linspace(1, len(y) - 1, 1000 // 2).astype(int)
+    kept = set(y[index])
+    for a, b in zip(edges[:-1], edges[1:]):
+        assert y[a:b].min() in kept and y[a:b].max() in kept
+
+def _lttb_reference(x, y, m):
+    edges = np.linspace(1, len(y) - 1, m - 1).astype(int)
+    selected, prev = [0], 0
+    for b in range(m - 2):
+        nxt = (x[edges[b + 1]:edges[b + 2]].mean(), y[edges[b + 1]:edges[b + 2]].mean()) \
+            if b < m - 3 else (x[-1], y[-1])
+        best = max(range(edges[b], edges[b + 1]),
+                   key=lambda i: abs((x[prev] - nxt[0]) * (y[i] - y[prev])
+                                     - (x[prev] - x[i]) * (nxt[1] - y[prev])))
+        selected.append(best)
+        prev = best
+    return selected + [len(y) - 1]
+
+def test_lttb_matches_reference():
+    x, y = _series(5000, seed=1)
+    x = x.astype(float)
+    y = y.astype(float)
+    index = lttb_indices(x, y, 200)
+    assert len(index) == 200 and np.all(np.diff(index) > 0)
+    assert list(index) == _lttb_reference(x, y, 200)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from src.arrival_sources import ArrayArrivals
+from src.demand_profiles import ProfileArrivals, rush_hour_profile
+from src.simulation import (FixedLindley, Simulation, fixed_schedule, simulate_fixed_fast,
+                            simulate_stats)
+
+def _loop(arrivals, fixed_duration):
+    sim = Simulation("FIXED", fixed_duration, arrivals=ArrayArrivals(arrivals))
+    queues = []
+    while (frame := sim.step()) is not None:
+        queues.append([frame["traffic_state"]["queues"][d] for d in "NSEW"])
+    return sim, np.array(queues)
+
+@pytest.mark.parametrize("fixed_duration", [30, 12, 1, 0])
+def test_matches_loop_tick_for_tick(fixed_duration):
+    rng = np.random.default_rng(fixed_duration)
+    arrivals = rng.poisson(0.3, size=(1500, 4))
+    sim, queues = _loop(arrivals, fixed_duration)
+    fast = simulate_fixed_fast(arrivals, fixed_duration)
+    assert np.array_equal(fast["queues"], queues)
+    assert fast["waits"].tolist() == sim.wait_times
+    assert fast["stats"] == sim.stats()
+
+def test_schedule_starts_with_initial_green():
+    codes, served = fixed_schedule(60, 20)
+    # N (kode 0) 10 detik, lalu E (kode 2) 20 detik, lalu S (kode 1)
+    assert codes[:10].tolist() == [0] * 10
+    assert codes[10:30].tolist() == [2] * 20
+    assert codes[30] == 1 and served.all()
+
+@pytest.mark.parametrize("seed, chunk", [(0, 1 << 16), (7, 256)])
+def test_simulate_stats_fast_path_is_exact(monkeypatch, seed, chunk):
+    monkeypatch.setattr("src.simulation.FAST_CHUNK", chunk)
+    fast = simulate_stats("FIXED", 30, duration=2000, seed=seed)
+    slow = simulate_stats("FIXED", 30, duration=2000, seed=seed, fast=False)
+    assert fast == slow
+
+def test_fast_path_with_arrival_source():
+    source = ProfileArrivals(rush_hour_profile(), duration=1200, rng=np.random.default_rng(3))
+    fast = simulate_stats("FIXED", 25, arrivals=source)
+    slow = simulate_stats("FIXED", 25, arrivals=source, fast=False)
+    assert fast == slow
+
+def test_lindley_chunks_match_single_array():
+    # Laju tinggi: antrian dan mobil menunggu terbawa melewati batas chunk
+    arrivals = np.random.default_rng(4).poisson(0.35, size=(3000, 4))
+    whole = simulate_fixed_fast(arrivals, 20)
+    run = FixedLindley(20)
+    parts = [run.advance(chunk) for chunk in np.split(arrivals, [7, 400, 401, 1800])]
+    for key, i in (("queues", 0), ("departures", 1), ("waits", 2), ("wait_ticks", 3)):
+        assert np.array_equal(np.concatenate([p[i] for p in parts]), whole[key])
+    assert run.queue.sum() == whole["stats"]["leftover"]
+
+@pytest.mark.parametrize("warmup", [None, "mser"])
+def test_fast_path_consumes_source_chunk_by_chunk(monkeypatch, warmup):
+    arrivals = np.random.default_rng(6).poisson(0.2, size=(2500, 4))
+    sizes = []
+    advance = FixedLindley.advance
+    monkeypatch.setattr(FixedLindley, "advance",
+                        lambda self, chunk: sizes.append(len(chunk)) or advance(self, chunk))
+    fast = simulate_stats("FIXED", 30, arrivals=ArrayArrivals(arrivals, chunk_rows=300),
+                          warmup=warmup)
+    assert max(sizes) == 300 and sum(sizes) == 2500
+    slow = simulate_stats("FIXED", 30, arrivals=ArrayArrivals(arrivals), fast=False, warmup=warmup)
+    assert fast == slow
@@ -0,0 +1,68 @@
+from itertools import product
+
+import numpy as np
+import pytest
+from src.controllers import PhaseBatch, make_controller
+from src.fuzzy_analytic import rule_strengths
+from src.fuzzy_module import (ARRIVAL_TERMS, EXTENSION_TERMS, QUEUE_TERMS, RULES,
+                              fuzzy_extension)
+from src.fuzzy_sparse import MULTI_RULES, SparseRuleBase
+
+def test_two_inputs_match_mamdani_module():
+    rule_base = SparseRuleBase([QUEUE_TERMS, ARRIVAL_TERMS], EXTENSION_TERMS, (0, 60), RULES)
+    rng = np.random.default_rng(0)
+    q, a = rng.uniform(0, 80, 500), rng.uniform(0, 10, 500)
+    q[:3], a[:3] = [0, 20, 80], [0, 4, 10]  # batas term
+    assert np.allclose(rule_base.evaluate([q, a]), fuzzy_extension(q, a), equal_nan=True)
+
+def test_sparse_strengths_match_full_grid():
+    # 5 input x 4 term, basis rule acak yang tidak lengkap
+    terms = {"t0": [0, 0, 3], "t1": [1, 4, 6], "t2": [5, 7, 9], "t3": [8, 10, 10]}
+    outputs = list(EXTENSION_TERMS)
+    rng = np.random.default_rng(1)
+    rules = [(*combo, outputs[rng.integers(3)])
+             for combo in product(terms, repeat=5) if rng.uniform() < 0.7]
+    rule_base = SparseRuleBase([terms] * 5, EXTENSION_TERMS, (0, 60), rules)
+    inputs = list(rng.uniform(0, 10, size=(5, 300)))
+    names = list(terms)
+    index = [(tuple(names.index(t) for t in rule[:-1]), outputs.index(rule[-1])) for rule in rules]
+    expected = rule_strengths(inputs, [list(terms.values())] * 5, index, 3)
+    assert np.allclose(rule_base.strengths(inputs), expected)
+
+def test_rejects_invalid_rule_bases():
+    overlapping = {"a": [0, 0, 6], "b": [2, 5, 8], "c": [4, 10, 10]}
+    with pytest.raises(ValueError):
+        SparseRuleBase([overlapping], EXTENSION_TERMS, (0, 60), [("a", "short")])
+    # Term "d" mulai di dalam support "a", dua posisi setelahnya
+    far_overlap = {"a": [0, 1, 10], "b": [1, 2, 3], "c": [10, 11, 12], "d": [3, 12, 13]}
+    with pytest.raises(ValueError):
+        SparseRuleBase([far_overlap], EXTENSION_TERMS, (0, 60), [("a", "short")])
+    with pytest.raises(ValueError):
+        SparseRuleBase([QUEUE_TERMS], EXTENSION_TERMS, (0, 60),
+                       [("short", "short"), ("short", "long")])
+
+def test_multi_controller_shortens_green_when_cross_queue_is_long():
+    ctrl = make_controller("FUZZY_MULTI")
+    assert len(ctrl.rule_base.rules) == len(MULTI_RULES) == 27
+    quiet = PhaseBatch.single([50, 0, 5, 5], [0.6, 0.1, 0.1, 0.1], 0)
+    busy = PhaseBatch.single([50, 0, 80, 5], [0.6, 0.1, 0.1, 0.1], 0)
+    fuzzy = make_controller("FUZZY")
+    assert ctrl.decide(quiet)[0] == fuzzy.decide(quiet)[0]
+    assert ctrl.decide(busy)[0] < ctrl.decide(quiet)[0]
+
+def test_lookup_grows_with_rules_not_grid():
+    # 12 input x 5 term = 244 juta sel antecedent, hanya 4 rule yang didefinisikan
+    terms = {"t0": [0, 0, 3], "t1": [1, 3, 5], "t2": [3, 5, 7], "t3": [5, 7, 9], "t4": [7, 10, 10]}
+    names, outputs = list(terms), list(EXTENSION_TERMS)
+    rng = np.random.default_rng(2)
+    rules = [(*rng.choice(names, 12), outputs[i % 3]) for i in range(4)]
+    rule_base = SparseRuleBase([terms] * 12, EXTENSION_TERMS, (0, 60), rules)
+    assert rule_base._keys.nbytes + rule_base._outputs.nbytes <= 64
+    # Sampel di puncak term rule pertama mengaktifkan rule itu penuh
+    peaks = [[terms[t][1] for t in rules[0][:-1]]]
+    inputs = [np.array(x) for x in np.array(peaks + list(rng.uniform(0, 10, size=(199, 12)))).T]
+    index = [(tuple(names.index(t) for t in rule[:-1]), outputs.index(rule[-1])) for rule in rules]
+    expected = rule_strengths(inputs, [list(terms.values())] * 12, index, 3)
+    strengths = rule_base.strengths(inputs)
+    assert strengths[0, outputs.index(rules[0][-1])] == 1.0
+    assert np.allclose(strengths, expected)
@@ -89,4 +89,44 @@ def test_step_timer_exhaustion():
     # Detik 3 (Lampu sudah merah/habis) -> Mobil tidak boleh keluar
     departed = intersection.step(departure_rate=1)
     assert intersection.queues['N'] == 3 # Tetap 3
-    assert departed['N'] == 0
\ No newline at end of file
+    assert departed['N'] == 0
+
+def test_integer_coded_state():
+    intersection = Intersection()
+    intersection.set_green_light(7, 2)
+    assert intersection.current_phase == 'E'
+    intersection.add_counts([1, 2, 3, 4])
+    assert list(intersection.counts) == [1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        intersection.set_green_light(5, 4)
+    # __slots__: tidak ada atribut dinamis
+    with pytest.raises(AttributeError):
+        intersection.extra = 1
+
+def test_step_into_reuses_buffer():
+    intersection = Intersection()
+    intersection.add_cars('W', 3)
+    intersection.set_green_light(5, 'W')
+    buf = [9, 9, 9, 9]
+    assert intersection.step_into(buf, departure_rate=2) == 2
+    assert buf == [0, 0, 0, 2]
+    assert intersection.queues['W'] == 1
+
+def test_advance_stops_when_green_expires():
+    for k in (0, 3, 8, 12, 20):
+        bulk, single = Intersection(), Intersection()
+        for inter in (bulk, single):
+            inter.add_cars('S', 10)
+            inter.add_cars('N', 4)
+            inter.set_green_light(12, 'S')
+        buf = [0, 0, 0, 0]
+        ticks = bulk.advance(k, buf)
+        assert ticks == min(k, 12)
+        total = sum(single.step()['S'] for _ in range(ticks))
+        assert total == buf[1]
+        assert bulk.queues == single.queues
+        assert bulk.green_timer == single.green_timer
+    # Timer sudah habis: satu detik merah tanpa keberangkatan
+    expired = Intersection()
+    expired.add_cars('N', 3)
+    assert expired.advance(5, buf) == 1 and buf == [0, 0, 0, 0]
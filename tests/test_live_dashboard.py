@@ -0,0 +1,20 @@
+import matplotlib
+matplotlib.use("Agg")
+
+from src.live_dashboard import LiveDashboard, watch
+from src.simulation import stream_simulation
+
+def test_dashboard_bounded_frame_rate():
+    dash = LiveDashboard(max_fps=1)
+    stream = stream_simulation(mode="FIXED", duration=200, digest_every=1)
+    redraws = sum(dash.update(d) for d in stream)
+    # 200 digest diproses jauh di bawah 1 detik -> hanya redraw pertama
+    assert redraws <= 2
+    dash.close()
+
+def test_watch_aborts_early():
+    last = watch(
+        stream_simulation(mode="FIXED", duration=1000, digest_every=1),
+        abort_if=lambda d: d["t"] >= 50,
+    )
+    assert last["t"] == 50
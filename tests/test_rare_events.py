@@ -0,0 +1,42 @@
+import numpy as np
+from src.arrival_sources import ArrayArrivals
+from src.controllers import make_controller
+from src.rare_events import (count_exceedances, estimate_tail, log_likelihood_ratio,
+                             simulate_departures, tilted_arrivals)
+from src.simulation import Simulation
+
+def test_exceedances_match_simulation():
+    arrivals = np.random.default_rng(0).poisson(0.25, size=(500, 3, 4))
+    for mode in ("FIXED", "FUZZY"):
+        controller = make_controller(mode)
+        departures = simulate_departures(arrivals, controller, np.full(4, 0.4))
+        counts = count_exceedances(arrivals, departures, 60)
+        for i in range(3):
+            sim = Simulation(mode, arrivals=ArrayArrivals(arrivals[:, i]), rate_estimate=None)
+            while sim.step() is not None:
+                pass
+            queued = [c["spawn_time"] for d in "NSEW" for c in sim.queue_ids[d]]
+            expected = sum(w > 60 for w in sim.wait_times) + sum(500 - s > 60 for s in queued)
+            assert counts[i] == expected
+
+def test_likelihood_ratio_has_unit_mean():
+    rng = np.random.default_rng(1)
+    nominal = np.array([0.2, 0.1, 0.2, 0.3])
+    arrivals = tilted_arrivals(nominal, 60, 40000, 20, 2.0, rng)
+    weights = np.exp(log_likelihood_ratio(arrivals, nominal, 20, 2.0))
+    assert abs(weights.mean() - 1) < 0.03
+    plain = rng.poisson(nominal, size=(60, 10, 4))
+    assert np.allclose(log_likelihood_ratio(plain, nominal, 20, 1.0), 0)
+
+def test_estimate_agrees_with_crude_monte_carlo():
+    # Monte Carlo biasa (10000 run, seed 3): 0.0121 +- 0.0022
+    result = estimate_tail("FIXED", 100, 30, duration=600, arrival_rate=0.15, seed=0)
+    low, high = result["probability_ci"]
+    assert low < 0.0121 < high
+    assert result["hits"] > 50 and result["speedup"] > 1
+
+def test_rare_threshold_gets_nonzero_estimate():
+    result = estimate_tail("FIXED", 250, 30, duration=600, arrival_rate=0.2, n_samples=500,
+                           pilot_samples=50, seed=0)
+    assert 0 < result["probability"] < 1e-6
+    assert result["relative_error"] < 1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from src.rate_estimator import ArrivalRateEstimator
+from src.simulation import Simulation
+
+def test_window_rate_slides():
+    est = ArrivalRateEstimator(window=3, initial_rate=0.5)
+    assert est.rate(0) == 0.5
+    for counts in ([1, 0, 0, 0], [2, 0, 0, 0], [3, 0, 0, 0], [6, 0, 0, 0]):
+        est.update(counts)
+    # Jendela berisi 2, 3, 6
+    assert est.rate(0) == pytest.approx(11 / 3)
+    assert est.counts.shape == (3, 4)
+
+def test_ewma_tracks_level_shift():
+    est = ArrivalRateEstimator(window=10, alpha=0.2, initial_rate=0.0)
+    for _ in range(100):
+        est.update([1, 0, 2, 0])
+    assert np.allclose(est.ewma_rates(), [1, 0, 2, 0], atol=1e-6)
+
+def test_window_matches_bruteforce():
+    rng = np.random.default_rng(0)
+    counts = rng.poisson(0.4, size=(500, 4))
+    est = ArrivalRateEstimator(window=60)
+    for row in counts:
+        est.update(row)
+    assert np.allclose(est.window_rates(), counts[-60:].mean(axis=0))
+
+def test_invalid_estimator_args():
+    with pytest.raises(ValueError):
+        ArrivalRateEstimator(window=0)
+    with pytest.raises(ValueError):
+        Simulation(rate_estimate="median")
+
+def test_controller_receives_live_estimate():
+    sim = Simulation(mode="FUZZY", seed=5)
+    for _ in range(120):
+        sim.step()
+    assert np.allclose(sim.arrival_rates(), sim.estimator.window_rates())
+    assert np.all(Simulation(rate_estimate=None).arrival_rates() == 0.4)
+
+def test_digest_reports_estimator_summary():
+    sim = Simulation(mode="FIXED", seed=2, rate_window=30)
+    for _ in range(75):
+        sim.step()
+    digest = sim.digest()
+    assert np.allclose(digest["arrival_rates"], sim.estimator.window_rates())
+    assert digest["ewma_rates"] == sim.estimator.ewma.tolist()
+
+def test_update_idle_matches_zero_updates():
+    stepped, idle = ArrivalRateEstimator(window=10), ArrivalRateEstimator(window=10)
+    for est in (stepped, idle):
+        est.update([3, 1, 0, 2])
+    for _ in range(25):
+        stepped.update([0, 0, 0, 0])
+    idle.update_idle(25)
+    assert np.allclose(idle.ewma, stepped.ewma, rtol=1e-12, atol=0)
+    assert np.array_equal(idle.window_rates(), stepped.window_rates())
+    assert (idle.pos, idle.filled) == (stepped.pos, stepped.filled)
@@ -0,0 +1,36 @@
+import pytest
+from src.replication import run_until_precision
+
+def test_stops_when_precision_reached():
+    result = run_until_precision(mode="FIXED", duration=300, kpis=("served",),
+                                 rel_precision=0.1, workers=1, max_replications=50)
+    assert result["stopped_by"] == "precision"
+    assert result["n"] < 50
+    assert result["kpis"]["served"]["rel_half_width"] <= 0.1
+
+def test_budget_exhausted():
+    result = run_until_precision(mode="FIXED", duration=100, rel_precision=1e-6,
+                                 workers=1, min_replications=2, max_replications=4)
+    assert result["stopped_by"] == "budget"
+    assert result["n"] == 4
+
+def test_parallel_workers():
+    result = run_until_precision(mode="FIXED", duration=200, kpis=("served",),
+                                 rel_precision=0.2, workers=2, batch_size=2,
+                                 max_replications=12)
+    assert 5 <= result["n"] <= 12
+    assert len(result["runs"]) == result["n"]
+
+def test_result_independent_of_workers():
+    options = dict(mode="FUZZY", duration=200, kpis=("avg_wait",), rel_precision=0.05,
+                   batch_size=4, max_replications=40, base_seed=3)
+    sequential = run_until_precision(workers=1, **options)
+    parallel = run_until_precision(workers=4, **options)
+    assert sequential["stopped_by"] == "precision" and sequential["n"] > 5
+    assert parallel == sequential
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        run_until_precision(rel_precision=0)
+    with pytest.raises(ValueError):
+        run_until_precision(min_replications=10, max_replications=5)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from src.controllers import CONTROLLERS, make_controller
+from src.results_store import ResultsStore, controller_hash
+from src.simulation import run_simulation
+from src.work_queue import WorkQueue, run_worker
+
+def test_run_simulation_records_run_and_series():
+    with ResultsStore(":memory:") as store:
+        stats = run_simulation("FIXED", 20, duration=120, export=False, seed=3, store=store,
+                               store_series=True)
+        run_simulation("FIXED", 20, duration=120, export=False, seed=4, store=store)
+        run, summary_only = store.runs()
+        assert store.series(summary_only["id"]) is None
+        assert run["mode"] == "FIXED" and run["seed"] == 3 and run["duration"] == 120
+        assert run["avg_wait"] == pytest.approx(stats["avg_wait"])
+        series = store.series(run["id"])
+        assert series.shape == (120, 4)
+        assert series[0].sum() == 0 and series.sum() > 0
+
+def test_aggregate_groups_and_filters():
+    with ResultsStore(":memory:") as store:
+        for mode, waits in (("FIXED", [10, 20, 30]), ("FUZZY", [5, 7])):
+            for seed, w in enumerate(waits):
+                stats = {"avg_wait": w, "p95_wait": 0, "max_wait": 0, "served": 1, "leftover": 0}
+                store.record({"mode": mode, "seed": seed, "arrival_rate": 0.2}, stats)
+        rows = store.aggregate("avg_wait", by="mode")
+        assert [(r["mode"], r["n"], r["mean"]) for r in rows] == [("FIXED", 3, 20), ("FUZZY", 2, 6)]
+        assert rows[0]["std"] == pytest.approx(np.std([10, 20, 30], ddof=1))
+        assert store.aggregate("avg_wait", by=(), mode="FUZZY", seed=[1])[0]["mean"] == 7
+        with pytest.raises(ValueError):
+            store.aggregate("avg_wait; DROP TABLE runs")
+        plan = " ".join(str(r) for r in store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE mode = 'FIXED' AND fixed_duration = 30"))
+        assert "runs_scenario" in plan
+
+def test_controller_hash_tracks_parameters():
+    assert controller_hash(make_controller("FIXED", duration=30)) == \
+        controller_hash(make_controller("FIXED", duration=30))
+    assert controller_hash(make_controller("FIXED", duration=30)) != \
+        controller_hash(make_controller("FIXED", duration=20))
+
+@pytest.mark.parametrize("name", sorted(CONTROLLERS))
+def test_controller_hash_stable_for_equal_instances(name):
+    assert controller_hash(make_controller(name)) == controller_hash(make_controller(name))
+
+def test_controller_hash_rejects_unserializable_parameters():
+    ctrl = make_controller("FIXED")
+    ctrl.duration = object()
+    with pytest.raises(TypeError):
+        controller_hash(ctrl)
+
+def test_worker_writes_to_store(tmp_path):
+    db, results = str(tmp_path / "jobs.db"), str(tmp_path / "results.db")
+    with WorkQueue(db) as queue:
+        queue.submit([{"mode": "FIXED", "duration": 100, "seed": s, "arrival_rate": 0.1}
+                      for s in range(3)])
+    run_worker(db, "w", store=results)
+    with ResultsStore(results) as store:
+        (row,) = store.aggregate("served", by=("mode", "arrival_rate"))
+        assert row["n"] == 3 and row["arrival_rate"] == 0.1
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from multiprocessing import shared_memory
+from src.shared_results import SharedRunResult, mean_queue_series, run_parallel, simulate_to_shared
+from src.simulation import Simulation, simulate_stats
+
+def test_arrays_match_frames():
+    descriptor = simulate_to_shared("FUZZY", duration=300, seed=2)
+    sim = Simulation("FUZZY", seed=2)
+    frames = [sim.step() for _ in range(300)]
+    with SharedRunResult(descriptor) as result:
+        expected = [[f["traffic_state"]["queues"][d] for d in "NSEW"] for f in frames]
+        assert np.array_equal(result.queues, expected)
+        assert np.array_equal(result.green_timer, [f["traffic_state"]["green_timer"] for f in frames])
+        assert np.array_equal(result.waits, sim.wait_times)
+        assert result.stats["served"] == sim.stats()["served"]
+
+def test_parallel_results_and_cleanup():
+    configs = [dict(mode="FIXED", duration=200, seed=s) for s in range(3)]
+    results = run_parallel(configs, workers=2)
+    names = [shm.name for r in results for shm in r._blocks]
+    for config, result in zip(configs, results):
+        assert result.stats["served"] == simulate_stats(**config)["served"]
+    assert mean_queue_series(results).shape == (200,)
+    for result in results:
+        result.release()
+    # Blok sudah di-unlink oleh parent
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=names[0])
+
+def test_failed_run_leaves_no_blocks():
+    import os
+    before = set(os.listdir("/dev/shm"))
+    configs = [dict(mode="FIXED", duration=200, seed=s) for s in range(3)]
+    configs.insert(1, dict(mode="NO_SUCH_MODE", duration=200))
+    for workers in (1, 2):
+        with pytest.raises(ValueError):
+            run_parallel(configs, workers=workers)
+    assert set(os.listdir("/dev/shm")) <= before
+
+def test_descriptor_is_small():
+    import pickle
+    descriptor = simulate_to_shared("FUZZY", duration=2000, seed=0)
+    try:
+        assert len(pickle.dumps(descriptor)) < 1000
+    finally:
+        SharedRunResult(descriptor).release()
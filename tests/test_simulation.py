@@ -0,0 +1,64 @@
+import pytest
+from src.simulation import Simulation, stream_simulation, run_simulation
+
+def test_stream_yields_every_frame():
+    frames = list(stream_simulation(mode="FIXED", duration=50))
+    assert len(frames) == 50
+    assert [f["t"] for f in frames] == list(range(50))
+    assert set(frames[0]["traffic_state"]["queues"]) == {'N', 'S', 'E', 'W'}
+
+def test_stream_returns_final_stats():
+    gen = stream_simulation(mode="FIXED", duration=30)
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            next(gen)
+    stats = stop.value.value
+    assert stats["mode"] == "FIXED"
+    assert stats["served"] >= 0
+
+def test_stream_digest_every():
+    digests = list(stream_simulation(mode="FIXED", duration=25, digest_every=10))
+    # t=9, t=19 dan digest terakhir di t=24
+    assert [d["t"] for d in digests] == [9, 19, 24]
+    assert digests[-1]["wait_p95"] >= digests[-1]["wait_p50"]
+
+def test_stream_invalid_digest_every():
+    with pytest.raises(ValueError):
+        next(stream_simulation(duration=5, digest_every=0))
+
+def test_simulation_conserves_cars():
+    sim = Simulation(mode="FIXED", fixed_duration=10)
+    for _ in range(200):
+        sim.step()
+    stats = sim.stats()
+    assert sim.total_cars_spawned == stats["served"] + stats["leftover"]
+
+def test_run_simulation_without_export():
+    stats = run_simulation(mode="FIXED", duration=40, export=False)
+    assert set(stats) == {"mode", "avg_wait", "max_wait", "p95_wait", "served", "leftover"}
+
+def _state(sim):
+    return (sim.t, list(sim.wait_times), list(sim.wait_ticks), list(sim.queue_totals),
+            sim.intersection.queues, sim.intersection.green_timer, sim.current_phase_idx,
+            sim.total_cars_departed, sim.estimator.counts.tolist())
+
+@pytest.mark.parametrize("mode", ["FIXED", "FUZZY", "MAX_PRESSURE"])
+def test_run_skips_idle_ticks_like_step(mode):
+    import numpy as np
+    from src.arrival_sources import ArrayArrivals
+    counts = np.random.default_rng(5).poisson(0.05, size=(3000, 4))
+    for make in (lambda: dict(arrivals=ArrayArrivals(counts), rate_estimate="ewma"),
+                 lambda: dict(seed=7)):
+        stepped, skipped = Simulation(mode, **make()), Simulation(mode, **make())
+        while stepped.t < 2500 and stepped.step() is not None:
+            pass
+        assert skipped.run(2500) == 2500
+        assert _state(skipped) == _state(stepped)
+        assert np.allclose(skipped.estimator.ewma, stepped.estimator.ewma, rtol=1e-12, atol=0)
+        # Sisa run sampai source habis (atau 500 detik lagi)
+        skipped.run(None if skipped.arrivals is not None else 500)
+        for _ in range(500):
+            if stepped.step() is None:
+                break
+        assert _state(skipped) == _state(stepped)
+        assert np.allclose(skipped.estimator.ewma, stepped.estimator.ewma, rtol=1e-12, atol=0)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from src.controllers import PhaseBatch, make_controller
+from src.fuzzy_module import get_green_durations as mamdani_durations
+from src.simulation import simulate_stats
+from src.sugeno_module import SugenoController, firing_strengths, get_green_durations
+
+def test_firing_strengths_shape_and_partition():
+    w = firing_strengths([0, 30, 80], [0, 5, 10])
+    assert w.shape == (3, 9)
+    # Di titik pusat tiap term tepat satu rule aktif penuh
+    assert np.allclose(w.max(axis=1), 1.0)
+
+def test_tracks_mamdani_surface():
+    rng = np.random.default_rng(0)
+    queues = rng.integers(0, 80, size=2000)
+    rates = rng.uniform(0, 1, size=2000)
+    diff = get_green_durations(queues, rates) - mamdani_durations(queues, rates)
+    assert np.sqrt(np.mean(diff ** 2)) < 1.5
+    assert np.abs(diff).max() <= 6
+
+def test_zero_order_is_constant_per_rule():
+    ctrl = SugenoController(order=0)
+    assert ctrl.coefficients.shape == (9, 1)
+    # Di pusat rule (queue 30, arrival 5) output = konstanta rule medium-medium
+    assert ctrl.evaluate(30, 5)[0] == pytest.approx(ctrl.coefficients[4, 0])
+
+def test_invalid_order():
+    with pytest.raises(ValueError):
+        SugenoController(order=2)
+
+def test_sugeno_mode_runs():
+    stats = simulate_stats("SUGENO", duration=600, seed=3)
+    assert stats["mode"] == "SUGENO"
+    assert stats["served"] > 0
+
+def test_make_controller_selects_order():
+    batch = PhaseBatch(np.array([[0, 3, 7, 25], [40, 0, 5, 48]]),
+                       np.array([[0.4, 0.2, 0.3, 0.6]] * 2), np.array([0, 3]))
+    zero = make_controller("SUGENO", order=0)
+    assert zero.order == 0
+    expected = get_green_durations([0, 48], [0.4, 0.6], order=0)
+    assert np.array_equal(zero.decide(batch), np.maximum(expected, zero.min_green))
+    assert not np.array_equal(expected, get_green_durations([0, 48], [0.4, 0.6]))
+    with pytest.raises(ValueError):
+        make_controller("SUGENO", order=2)
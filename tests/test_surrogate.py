@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from src.arrival_sources import ArrayArrivals
+from src.simulation import simulate_stats
+from src.surrogate import surrogate, webster_delay
+from src.sweep import grid, run_sweep, screen
+
+def _simulated_wait(rate, mode, fixed_duration, duration=7200, seeds=3):
+    waits = []
+    for seed in range(seeds):
+        counts = np.random.default_rng(seed).poisson(rate, size=(duration, 4))
+        waits.append(simulate_stats(mode, fixed_duration, arrivals=ArrayArrivals(counts))["avg_wait"])
+    return np.mean(waits)
+
+@pytest.mark.parametrize("rate,mode", [(0.1, "FIXED"), (0.15, "FUZZY"), (0.1, "WEBSTER"),
+                                       (0.35, "FIXED")])
+def test_reliable_estimates_track_simulation(rate, mode):
+    estimate = surrogate(rate, mode, 30, duration=7200)
+    assert estimate["reliable"]
+    simulated = _simulated_wait(rate, mode, 30)
+    assert abs(estimate["avg_wait"] - simulated) <= 0.1 * simulated + 2
+
+def test_regimes_and_flags():
+    assert surrogate(0.1, "FIXED", 30)["regime"] == "under"
+    near = surrogate(0.25, "FIXED", 30, duration=7200)
+    assert near["regime"] == "near" and not near["reliable"]
+    assert surrogate(0.5, "FIXED", 30, duration=7200)["regime"] == "over"
+    # Horizon kurang dari 10 siklus tidak reliable
+    assert not surrogate(0.1, "FIXED", 30, duration=600)["reliable"]
+    assert not surrogate(0.1, "MAX_PRESSURE", duration=7200)["reliable"]
+
+def test_webster_delay_infinite_when_saturated():
+    delay = webster_delay([0.1, 0.3], 30, 120)
+    assert np.isfinite(delay[0]) and delay[1] == np.inf
+
+def test_screen_prioritises_near_saturation():
+    points = screen(grid([0.05, 0.25, 0.5], fixed_durations=(30,)), duration=7200)
+    assert points[0]["arrival_rate"] == 0.25
+
+@pytest.mark.filterwarnings("error")
+def test_screen_ranks_zero_demand_last():
+    points = screen(grid([0.0, 0.05, 0.25], fixed_durations=(30,)), duration=7200)
+    assert [p["arrival_rate"] for p in points] == [0.25, 0.05, 0.0]
+
+def test_run_sweep_simulates_only_unreliable_points():
+    points = grid([0.05, 0.24, 0.26], fixed_durations=(30,))
+    results = run_sweep(points, duration=3600, budget=1)
+    sources = {r["arrival_rate"]: r["source"] for r in results}
+    assert sources[0.05] == "surrogate"
+    assert sorted([sources[0.24], sources[0.26]]) == ["pending", "simulation"]
+    assert all(np.isfinite(r["avg_wait"]) for r in results)
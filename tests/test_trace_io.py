@@ -0,0 +1,89 @@
+import json
+import pytest
+from src.simulation import Simulation, run_simulation
+from src.trace_io import (DeltaEncoder, TraceReader, TraceWriter, decode_frames,
+                          iter_frames)
+
+def _frames(n=120):
+    sim = Simulation(mode="FUZZY", seed=4)
+    return [sim.step() for _ in range(n)]
+
+@pytest.mark.parametrize("indent", [2, None])
+def test_reads_json_document_in_small_chunks(tmp_path, indent):
+    frames = _frames()
+    path = tmp_path / "trace.json"
+    path.write_text(json.dumps({"metadata": {"mode": "FUZZY", "avg_wait_time": 1.5},
+                                "frames": frames}, indent=indent))
+    reader = TraceReader(str(path), chunk_size=64)
+    assert reader.metadata["avg_wait_time"] == 1.5
+    assert list(reader) == frames
+    # Reader bisa diiterasi ulang
+    assert sum(1 for _ in reader) == len(frames)
+
+def test_reads_jsonl_with_summary(tmp_path):
+    frames = _frames()
+    path = str(tmp_path / "trace.jsonl")
+    with TraceWriter(path, metadata={"mode": "FUZZY"}) as writer:
+        for frame in frames:
+            writer.write_frame(frame)
+        writer.close(summary={"avg_wait": 2.0})
+    reader = TraceReader(path, chunk_size=100)
+    assert reader.metadata == {"mode": "FUZZY"}
+    assert list(reader) == frames
+    assert reader.summary == {"avg_wait": 2.0}
+
+def test_time_window_stops_early(tmp_path):
+    path = tmp_path / "trace.json"
+    path.write_text(json.dumps({"metadata": {}, "frames": _frames()}))
+    window = list(iter_frames(str(path), start=10, stop=20))
+    assert [f["t"] for f in window] == list(range(10, 20))
+    # Sisa file rusak: tidak dibaca karena berhenti di t >= stop
+    text = path.read_text()
+    cut = text.index('{"t": 30,')
+    path.write_text(text[:cut] + "garbage")
+    assert len(list(iter_frames(str(path), stop=25))) == 25
+    with pytest.raises(ValueError):
+        list(iter_frames(str(path)))
+
+def test_delta_roundtrip_and_size(tmp_path):
+    frames = _frames(500)
+    encoder = DeltaEncoder(keyframe_every=50)
+    encoded = [encoder.encode(f) for f in frames]
+    assert sum("t" in e for e in encoded) == 10
+    assert list(decode_frames(encoded)) == frames
+    full = len(json.dumps(frames, separators=(",", ":")))
+    assert len(json.dumps(encoded, separators=(",", ":"))) < full / 2
+
+def test_delta_trace_read_lazily(tmp_path):
+    frames = _frames(300)
+    path = str(tmp_path / "trace.jsonl")
+    with TraceWriter(path, metadata={"mode": "FUZZY"}, encoding="delta", keyframe_every=100) as w:
+        for frame in frames:
+            w.write_frame(frame)
+        w.close()
+    reader = TraceReader(path)
+    assert reader.metadata["encoding"] == "delta"
+    assert list(reader) == frames
+    assert [f["t"] for f in iter_frames(path, start=150, stop=155)] == list(range(150, 155))
+
+def test_run_simulation_delta_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "docs").mkdir()
+    run_simulation("FIXED", duration=200, seed=1)
+    full = list(TraceReader("docs/simulation_data_fixed.json"))
+    run_simulation("FIXED", duration=200, seed=1, encoding="delta", keyframe_every=30)
+    assert list(TraceReader("docs/simulation_data_fixed.json")) == full
+
+def test_corrupt_trace_fails_without_reading_to_end(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    with TraceWriter(str(path), metadata={"mode": "FUZZY"}) as writer:
+        for frame in _frames(20):
+            writer.write_frame(frame)
+    good = path.stat().st_size
+    # Record yang tidak pernah ditutup, diikuti banyak data
+    with open(path, "a") as f:
+        f.write('{"t": 20, "traffic_state": [' + "1," * 200_000)
+    reader = TraceReader(str(path), chunk_size=1024, max_record=10_000)
+    with pytest.raises(ValueError, match=f"byte offset {good}") as err:
+        list(reader)
+    assert "exceeds" in str(err.value)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from src.traffic_env import OBS_SIZE, TrafficEnv, VectorTrafficEnv
+
+@pytest.mark.parametrize("mode, low, high", [("phase", 0, 4), ("duration", 5, 40)])
+def test_vector_env_matches_single(mode, low, high):
+    single = TrafficEnv(action_mode=mode, seed=3, episode_ticks=10_000)
+    vector = VectorTrafficEnv(1, action_mode=mode, seed=3, episode_ticks=10_000)
+    actions = np.random.default_rng(0).integers(low, high, size=100)
+    for action in actions:
+        obs1, r1, _, _, _ = single.step(action)
+        obs2, r2, _, _, _ = vector.step([action])
+        assert np.array_equal(obs1, obs2[0])
+        assert r1 == r2[0]
+
+def test_duration_step_runs_whole_green():
+    env = VectorTrafficEnv(3, action_mode="duration", seed=0)
+    obs, _ = env.reset()
+    assert obs.shape == (3, OBS_SIZE)
+    env.step([10, 20, 30])
+    assert env.t.tolist() == [10, 20, 30]
+    # Fase berikutnya (E) menunggu keputusan
+    assert (env.phase == 2).all() and (env.phase_time == 0).all()
+
+def test_phase_action_serves_chosen_direction():
+    env = TrafficEnv(arrival_rate=[0.0, 0.0, 0.0, 0.0], seed=0)
+    env.intersection.counts[1] = 5
+    obs, reward, _, _, _ = env.step(1)
+    assert obs[1] == 4 and obs[4] == 1
+    assert reward == -4.0
+
+def test_autoreset_on_truncation():
+    env = VectorTrafficEnv(4, episode_ticks=5, seed=1)
+    for _ in range(4):
+        _, _, _, truncated, _ = env.step(np.zeros(4, dtype=int))
+        assert not truncated.any()
+    obs, _, _, truncated, info = env.step(np.zeros(4, dtype=int))
+    assert truncated.all() and "final_obs" in info
+    assert (env.t == 0).all() and (obs[:, 0:4] == 0).all()
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        TrafficEnv(action_mode="speed")
+    with pytest.raises(ValueError):
+        VectorTrafficEnv(0)
+
+def test_invalid_actions_are_rejected():
+    env = VectorTrafficEnv(3, seed=0)
+    with pytest.raises(ValueError, match="Invalid action 4 at index 1"):
+        env.step([0, 4, 2])
+    with pytest.raises(ValueError, match="Invalid action -1"):
+        env.step([-1, 0, 0])
+    with pytest.raises(ValueError, match="Invalid action 1.5"):
+        env.step([0, 1.5, 2])
+    with pytest.raises(ValueError, match="shape"):
+        env.step([0, 1])
+    assert (env.t == 0).all()
+    with pytest.raises(ValueError, match="Invalid action -5 at index 2"):
+        VectorTrafficEnv(3, action_mode="duration").step([10, 0, -5])
+    with pytest.raises(ValueError, match="Invalid action 7"):
+        TrafficEnv().step(7)
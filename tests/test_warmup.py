@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from src.arrival_sources import ArrayArrivals
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.simulation import Simulation, simulate_stats
+from src.stats import mser
+
+def test_mser_finds_transient_end():
+    rng = np.random.default_rng(0)
+    series = np.concatenate([np.linspace(50, 10, 200), 10 + rng.normal(0, 1, 1800)])
+    cut, converged = mser(series)
+    assert converged and 150 <= cut <= 260 and cut % 5 == 0
+
+def test_mser_flags_nonstationary_series():
+    cut, converged = mser(np.arange(1000.0))
+    assert not converged
+    assert mser([1, 2, 3]) == (0, False)
+
+def test_steady_state_stats_exclude_warmup():
+    # Lonjakan awal 300 detik membangun antrian panjang yang lalu terurai
+    rng = np.random.default_rng(1)
+    counts = np.vstack([rng.poisson(0.4, size=(300, 4)), rng.poisson(0.1, size=(3300, 4))])
+    full = simulate_stats("FUZZY", arrivals=ArrayArrivals(counts))
+    steady = simulate_stats("FUZZY", arrivals=ArrayArrivals(counts), warmup="mser")
+    assert steady["steady_state"] and 300 < steady["warmup_onset"] < 1800
+    assert steady["served"] < full["served"] and steady["avg_wait"] < full["avg_wait"]
+    fixed_onset = simulate_stats("FUZZY", arrivals=ArrayArrivals(counts), warmup=600)
+    assert fixed_onset["warmup_onset"] == 600 and fixed_onset["steady_state"]
+
+def test_fast_path_matches_loop_with_warmup():
+    counts = np.random.default_rng(2).poisson(0.2, size=(2000, 4))
+    fast = simulate_stats("FIXED", 25, arrivals=ArrayArrivals(counts), warmup="mser")
+    loop = simulate_stats("FIXED", 25, arrivals=ArrayArrivals(counts), warmup="mser", fast=False)
+    assert fast == loop
+
+def test_overloaded_run_not_steady():
+    stats = simulate_stats("FIXED", duration=1800, seed=0, warmup="mser")
+    assert not stats["steady_state"]
+
+def test_warmup_series_survive_checkpoint(tmp_path):
+    sim = Simulation("FUZZY", seed=5)
+    for _ in range(400):
+        sim.step()
+    path = str(tmp_path / "ckpt.pkl")
+    save_checkpoint(path, sim, {}, 0, series=True)
+    restored = Simulation.from_state(load_checkpoint(path)["simulation"])
+    assert restored.stats("mser") == sim.stats("mser")
+    # Snapshot ringkas (default) tidak membawa deret warm-up
+    save_checkpoint(path, sim, {}, 0)
+    compact = Simulation.from_state(load_checkpoint(path)["simulation"])
+    assert compact.stats() == sim.stats()
+    with pytest.raises(ValueError):
+        compact.stats("mser")
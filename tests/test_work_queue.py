@@ -0,0 +1,60 @@
+import multiprocessing
+import time
+from src.work_queue import WorkQueue, run_worker
+
+def _configs(n):
+    return [{"mode": "FIXED", "fixed_duration": 20, "duration": 200, "seed": seed} for seed in range(n)]
+
+def test_local_workers_drain_queue(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    with WorkQueue(db) as queue:
+        queue.submit(_configs(12))
+    workers = [multiprocessing.Process(target=run_worker, args=(db, f"w{i}"), kwargs={"poll": 0.05})
+               for i in range(3)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(60)
+        assert p.exitcode == 0
+    with WorkQueue(db) as queue:
+        assert queue.counts() == {"done": 12}
+        results = queue.results()
+    assert [r["config"]["seed"] for r in results] == list(range(12))
+    assert all(r["attempts"] == 1 and r["result"]["served"] > 0 for r in results)
+
+def test_crashed_worker_job_is_reclaimed(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    with WorkQueue(db, lease_seconds=0.2) as queue:
+        queue.submit(_configs(2))
+        # Worker "crash" mengklaim job lalu tidak pernah heartbeat
+        job_id, _ = queue.claim("crashed")
+        time.sleep(0.3)
+        assert run_worker(db, "alive", lease_seconds=0.2, poll=0.05) == 2
+        assert queue.counts() == {"done": 2}
+        assert queue.results()[0]["attempts"] == 2
+        # Worker lama tidak bisa menimpa hasil setelah lease-nya diambil
+        assert not queue.complete(job_id, "crashed", {"stale": True})
+
+def test_heartbeat_keeps_long_job(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    with WorkQueue(db, lease_seconds=0.3) as queue:
+        queue.submit(_configs(1))
+
+    def slow(config):
+        # Jauh lebih lama dari lease: tanpa heartbeat job bisa diklaim ulang
+        time.sleep(1.0)
+        with WorkQueue(db, lease_seconds=0.3) as other:
+            assert other.claim("thief") is None
+        return {"ok": True}
+
+    assert run_worker(db, "slow", lease_seconds=0.3, runner=slow) == 1
+    with WorkQueue(db) as queue:
+        assert queue.results()[0]["attempts"] == 1
+
+def test_failing_job_retried_then_failed(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    with WorkQueue(db) as queue:
+        queue.submit([{"mode": "NOPE"}])
+    assert run_worker(db, "w", max_attempts=2) == 0
+    with WorkQueue(db) as queue:
+        assert queue.counts() == {"failed": 1}